@@ -141,8 +141,8 @@ if __name__ == "__main__":
         ble_cleaner = BLECleaner(directory=f"data/processed/ble")
         transaction_cleaner = TransactionCleaner(directory=f"data/intermediate/transactions")
         print("Loading ble data...")
-        ble_cleaner.load_data(pattern=fr"{date}.*\.csv")
-        transaction_cleaner.load_data(pattern=fr"{date}.*\.csv")
+        ble_cleaner.load_data(pattern=r"\.csv$", date_range=(date, date))
+        transaction_cleaner.load_data(pattern=r"\.csv$", date_range=(date, date))
 
         pass_by_indicator = PassByIndicator()
         pass_by_indicator.set_cleaner("ble_cleaner", ble_cleaner)
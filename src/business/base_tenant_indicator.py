@@ -1,9 +1,15 @@
-from typing import Dict, Union
+from typing import Callable, Dict, Mapping, Optional, Tuple, Union
+from types import MappingProxyType
+import os
 import json
+import threading
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
 from src.data_processing.cleaners.ble_cleaner import BLECleaner
 from src.data_processing.cleaners.transaction_cleaner import TransactionCleaner
+from src.data_processing.snapshot import EventSnapshot
+from src.data_processing.id_dictionary import IdDictionary
 
 class BaseTenantIndicator(ABC):
     """
@@ -11,6 +17,11 @@ class BaseTenantIndicator(ABC):
     Handles input from multiple cleaners and organizes data by terminal ID.
     """
 
+    # Process-wide cache of parsed config workbooks, shared by all indicators:
+    # (absolute path, kind) -> (mtime_ns, size, parsed read-only value)
+    _config_cache: Dict[Tuple[str, str], Tuple[int, int, object]] = {}
+    _config_cache_lock = threading.Lock()
+
     def __init__(self):
         """
         Initialize the BaseTenantIndicator with a predefined structure for cleaners.
@@ -22,28 +33,80 @@ class BaseTenantIndicator(ABC):
             "transaction_cleaner": None,
         }
         self.terminal_data: Dict[str, Dict[str, pd.DataFrame]] = {}
-        self.tenant_mapping: Dict[str, str] = {}  # Map terminalId -> tenantName
+        self.tenant_mapping: Mapping[str, str] = {}  # Map terminalId -> tenantName
+        # Persistent ID dictionary of the cleaners' data, when memberId/terminalId are int32 codes
+        self.id_dictionary: Optional[IdDictionary] = None
 
         # Private parameters for RSSI thresholds
-        self._pass_by_rssi_threshold: Dict[str, int] = {}
-        self._entry_rssi_threshold: Dict[str, int] = {}
+        self._pass_by_rssi_threshold: Mapping[str, int] = {}
+        self._entry_rssi_threshold: Mapping[str, int] = {}
         self._transaction_rssi_threshold: int = -30
 
-    def set_rssi_thresholds_from_file(self, file_path: str):
+    @classmethod
+    def _load_cached_workbook(cls, file_path: str, kind: str, parse: Callable[[pd.DataFrame], object]):
         """
-        Set the RSSI thresholds for pass-by and entry calculations from an Excel file.
+        Parse an Excel config workbook once per process and reuse the result until the file changes.
+        :param file_path: Path to the Excel file.
+        :param kind: Name of the parsed view, so one workbook can back several caches.
+        :param parse: Function turning the first sheet into the cached (read-only) value.
+        :return: The parsed value.
+        """
+        key = (os.path.abspath(file_path), kind)
+        stat = os.stat(file_path)
+        with cls._config_cache_lock:
+            cached = cls._config_cache.get(key)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
+
+        value = parse(pd.read_excel(file_path))
+        with cls._config_cache_lock:
+            cls._config_cache[key] = (stat.st_mtime_ns, stat.st_size, value)
+        return value
+
+    @classmethod
+    def load_rssi_thresholds(cls, file_path: str) -> Tuple[Mapping[str, int], Mapping[str, int]]:
+        """
+        Load the pass-by and entry RSSI thresholds from an Excel file, through the shared config cache.
         The file must have columns 'terminalId', 'pass_by_rssi_threshold', and 'entry_rssi_threshold'.
 
         :param file_path: Path to the Excel file containing threshold data.
+        :return: Read-only (pass-by thresholds, entry thresholds) mappings keyed by terminalId.
         """
-        try:
-            threshold_data = pd.read_excel(file_path)
+        def parse(threshold_data: pd.DataFrame):
             if not {'terminalId', 'pass_by_rssi_threshold', 'entry_rssi_threshold'}.issubset(threshold_data.columns):
                 raise ValueError("The file must contain 'terminalId', 'pass_by_rssi_threshold', and 'entry_rssi_threshold' columns.")
+            threshold_data = threshold_data.set_index('terminalId')
+            return (
+                MappingProxyType(threshold_data['pass_by_rssi_threshold'].to_dict()),
+                MappingProxyType(threshold_data['entry_rssi_threshold'].to_dict()),
+            )
+
+        return cls._load_cached_workbook(file_path, "rssi_thresholds", parse)
+
+    @classmethod
+    def load_tenant_mapping(cls, mapping_table_path: str) -> Mapping[str, str]:
+        """
+        Load a tenantName-terminalId mapping table from an xlsx file, through the shared config cache.
+        :param mapping_table_path: Path to the xlsx file containing the mapping table.
+        :return: Read-only mapping of terminalId -> tenantName.
+        """
+        def parse(mapping_table: pd.DataFrame):
+            required_columns = {"tenantName", "terminalId"}
+            if not required_columns.issubset(mapping_table.columns):
+                raise ValueError(f"The mapping table must contain the columns: {required_columns}")
+            return MappingProxyType(mapping_table.set_index("terminalId")["tenantName"].to_dict())
+
+        return cls._load_cached_workbook(mapping_table_path, "tenant_mapping", parse)
+
+    def set_rssi_thresholds_from_file(self, file_path: str):
+        """
+        Set the RSSI thresholds for pass-by and entry calculations from an Excel file.
+        The file must have columns 'terminalId', 'pass_by_rssi_threshold', and 'entry_rssi_threshold'.
 
-            # Convert to dictionaries
-            self._pass_by_rssi_threshold = threshold_data.set_index('terminalId')['pass_by_rssi_threshold'].to_dict()
-            self._entry_rssi_threshold = threshold_data.set_index('terminalId')['entry_rssi_threshold'].to_dict()
+        :param file_path: Path to the Excel file containing threshold data.
+        """
+        try:
+            self._pass_by_rssi_threshold, self._entry_rssi_threshold = self.load_rssi_thresholds(file_path)
             print("RSSI thresholds successfully loaded from file.")
         except Exception as e:
             print(f"Error loading RSSI thresholds from file: {e}")
@@ -56,16 +119,8 @@ class BaseTenantIndicator(ABC):
         if not mapping_table_path:
             raise FileNotFoundError(f"The file {mapping_table_path} does not exist.")
 
-        # Load the mapping table
-        mapping_table = pd.read_excel(mapping_table_path)
-
-        # Validate the mapping table
-        required_columns = {"tenantName", "terminalId"}
-        if not required_columns.issubset(mapping_table.columns):
-            raise ValueError(f"The mapping table must contain the columns: {required_columns}")
-
-        # Convert mapping table to dictionary
-        self.tenant_mapping = mapping_table.set_index("terminalId")["tenantName"].to_dict()
+        # Load the mapping table (parsed once per process and shared read-only)
+        self.tenant_mapping = self.load_tenant_mapping(mapping_table_path)
         print("TenantName mapping table has been successfully loaded.")
 
 
@@ -85,16 +140,54 @@ class BaseTenantIndicator(ABC):
         if 'terminalId' not in data.columns:
             raise ValueError(f"The data from cleaner '{cleaner_name}' is missing the 'terminalId' column.")
 
+        # Data encoded with a persistent ID dictionary: groups are keyed by the decoded terminal IDs,
+        # so tenant mappings and thresholds apply unchanged, while memberId stays nullable Int32 codes
+        id_dictionary = getattr(cleaner_instance, "id_dictionary", None)
+        if id_dictionary is not None:
+            self.id_dictionary = id_dictionary
         grouped_data = {
-            terminal_id: group.reset_index(drop=True)
-            for terminal_id, group in data.groupby('terminalId')
+            self._terminal_key(terminal_id, id_dictionary): group.reset_index(drop=True)
+            for terminal_id, group in data.groupby('terminalId', observed=True)
         }
 
         # Store grouped data
         self.terminal_data[cleaner_name] = grouped_data
 
+    def set_snapshot(self, cleaner_name: str, snapshot: Union[str, EventSnapshot]):
+        """
+        Use a memory-mapped event snapshot instead of a cleaner as the data source.
+        Per-terminal frames are built lazily from the snapshot when an indicator accesses them.
+        :param cleaner_name: The name of the cleaner the snapshot replaces (e.g., "ble_cleaner").
+        :param snapshot: An EventSnapshot or the path of a snapshot directory.
+        """
+        if cleaner_name not in self.cleaners:
+            raise ValueError(f"Cleaner '{cleaner_name}' is not recognized. Allowed cleaners: {list(self.cleaners.keys())}")
+
+        if isinstance(snapshot, str):
+            snapshot = EventSnapshot(snapshot)
+        self.terminal_data[cleaner_name] = snapshot.terminal_data()
+
+
+    @staticmethod
+    def _terminal_key(terminal_id, id_dictionary: Optional[IdDictionary]):
+        """
+        Return the terminal ID a group is stored under, decoding dictionary codes.
+        """
+        if id_dictionary is None:
+            return terminal_id
+        return id_dictionary.decode("terminalId", [terminal_id])[0]
+
+    def decode_members(self, codes) -> np.ndarray:
+        """
+        Reverse lookup of memberId codes for reports; returns the values unchanged without a dictionary.
+        :param codes: Array-like of memberId values as stored in terminal_data.
+        :return: Array of member IDs.
+        """
+        if self.id_dictionary is None:
+            return np.asarray(codes)
+        return self.id_dictionary.decode("memberId", codes)
 
-    def get_mapping(self) -> Dict[str, str]:
+    def get_mapping(self) -> Mapping[str, str]:
         """
         Get the tenantName to terminalId mapping dictionary.
         :return: The mapping dictionary.
@@ -165,7 +258,9 @@ class BaseTenantIndicator(ABC):
             filtered_data['eventTime'] = pd.to_datetime(filtered_data['eventTime'], errors='coerce')
 
             # Calculate dwell_time per memberId on filtered data
-            dwell_times = filtered_data.groupby('memberId')['eventTime'].agg(['min', 'max'])
+            last_column = 'lastEventTime' if 'lastEventTime' in filtered_data.columns else 'eventTime'
+            dwell_times = filtered_data.groupby('memberId', observed=True).agg(
+                min=('eventTime', 'min'), max=(last_column, 'max'))
             dwell_times['dwell_time'] = (dwell_times['max'] - dwell_times['min']).dt.total_seconds()
 
             # Unique memberId with dwell_time > dwell_time_threshold
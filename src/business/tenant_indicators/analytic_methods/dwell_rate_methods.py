@@ -43,9 +43,10 @@ class DwellRateMethods:
                 data = data[(data['eventTime'] >= start_time) & (data['eventTime'] <= end_time)]
 
             visit_count = len(data['memberId'].unique())
-            # Calculate first and last times for each member
-            member_dwell_times = data.groupby('memberId')['eventTime'].agg(
-                first_time='min', last_time='max'
+            # Calculate first and last times for each member (downsampled rows carry their last detection time)
+            last_column = 'lastEventTime' if 'lastEventTime' in data.columns else 'eventTime'
+            member_dwell_times = data.groupby('memberId', observed=True).agg(
+                first_time=('eventTime', 'min'), last_time=(last_column, 'max')
             )
             member_dwell_times['dwellDuration'] = (
                 member_dwell_times['last_time'] - member_dwell_times['first_time']
@@ -83,9 +84,11 @@ class DwellRateMethods:
 
             # Calculate dwell time per member
             data['eventTime'] = pd.to_datetime(data['eventTime'], errors='coerce')
-            data['dwellTime'] = data.groupby('memberId')['eventTime'].transform(
-                lambda x: (x.max() - x.min()).total_seconds()
-            )
+            last_column = 'lastEventTime' if 'lastEventTime' in data.columns else 'eventTime'
+            members = data.groupby('memberId', observed=True)
+            data['dwellTime'] = (
+                members[last_column].transform('max') - members['eventTime'].transform('min')
+            ).dt.total_seconds()
 
             # Advanced aggregation logic
             dwell_rate = data['dwellTime'].median() if not data.empty else 0
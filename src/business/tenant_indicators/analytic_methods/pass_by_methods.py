@@ -58,6 +58,8 @@ class PassByMethods:
     ) -> pd.DataFrame:
         """
         Calculate pass-by counts using an advanced method, considering additional metrics like RSSI or dwell time.
+        Counts detections; on downsampled data each row counts its 'hits' (downsample with a -75 threshold
+        per terminal so that rows on either side of the RSSI filter are kept apart).
 
         :param terminal_data: Terminal data grouped by terminal ID.
         :param tenant_mapping: Mapping of terminal IDs to tenant names.
@@ -70,7 +72,8 @@ class PassByMethods:
 
             # Filter data by RSSI > -75 as an example of advanced filtering
             filtered_data = data[data['rssi'] > -75]
-            pass_by_count = len(filtered_data)
+            # Downsampled rows stand for 'hits' detections each
+            pass_by_count = int(filtered_data['hits'].sum()) if 'hits' in filtered_data.columns else len(filtered_data)
 
             results.append({
                 "tenantName": tenant_name,
@@ -45,7 +45,8 @@ class PassByIndicator(BaseTenantIndicator):
                 raise ValueError("BLECleaner data is required for pass-by calculations.")
 
             terminal_data = {
-                terminal_id: df for terminal_id, df in ble_data.get_data().groupby("terminalId")
+                self._terminal_key(terminal_id, ble_data.id_dictionary): df
+                for terminal_id, df in ble_data.get_data().groupby("terminalId", observed=True)
             }
 
             return PassByMethods.advanced(
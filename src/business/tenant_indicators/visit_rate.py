@@ -114,9 +114,10 @@ class VisitRateIndicator(BaseTenantIndicator):
                 continue
 
             # Group by memberId and calculate first and last event times
-            member_dwell_times = terminal_data.groupby("memberId").agg(
+            last_column = "lastEventTime" if "lastEventTime" in terminal_data.columns else "eventTime"
+            member_dwell_times = terminal_data.groupby("memberId", observed=True).agg(
                 first_time=("eventTime", "min"),
-                last_time=("eventTime", "max")
+                last_time=(last_column, "max")
             ).reset_index()
 
             # Calculate dwell duration and filter positive durations
@@ -175,9 +176,10 @@ class VisitRateIndicator(BaseTenantIndicator):
                 terminal_data = terminal_data[(terminal_data["eventTime"] >= start_time) & (terminal_data["eventTime"] <= end_time)]
 
             # Group by memberId to calculate dwell times
-            member_dwell_times = terminal_data.groupby("memberId").agg(
+            last_column = "lastEventTime" if "lastEventTime" in terminal_data.columns else "eventTime"
+            member_dwell_times = terminal_data.groupby("memberId", observed=True).agg(
                 start_time=("eventTime", "min"),
-                end_time=("eventTime", "max")
+                end_time=(last_column, "max")
             ).reset_index()
 
             # Calculate dwell durations and filter by >10 seconds
@@ -1,9 +1,26 @@
 import os
 import json
+from datetime import datetime
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from src.data_processing.loader import DataManager
+from src.data_processing.cache import CleanedDataCache
+from src.data_processing.diagnostics import Diagnostics
+from src.data_processing.id_dictionary import IdDictionary
+from src.data_processing.predicates import (APPLE_MANUFACTURER_FILTER, ColumnFilter, apple_manufacturer, filter_mask,
+                                            split_steps)
+from src.data_processing.plan import CleaningPlan
+from src.data_processing.partitioned import (DEFAULT_ROW_GROUP_SIZE, PARTITIONED_FORMATS, ScanStats,
+                                             read_partitioned, write_partitioned)
+from src.data_processing.manifest import IngestManifest
+from src.data_processing.profiling import ProfileAccumulator
+from src.data_processing.projection import ColumnProjection
+from src.data_processing.schema import concat_frames
+from src.data_processing.sorting import merge_sorted_runs
 
 
 class BaseCleaner(ABC):
@@ -12,30 +29,301 @@ class BaseCleaner(ABC):
     All custom cleaners should inherit from this class.
     """
 
-    def __init__(self, file_path: Optional[str] = None, directory: Optional[str] = None):
+    # Bump in a subclass whenever its clean() output changes, to invalidate cached results
+    cache_version: int = 1
+
+    # Declared column dtypes applied at read time (see src/data_processing/schema.py)
+    schema: Optional[Dict[str, str]] = None
+
+    # Input columns needed by clean(), read instead of the full files when cleaning (see projection.py)
+    projection: Optional[ColumnProjection] = None
+
+    def __init__(self, file_path: Optional[str] = None, directory: Optional[str] = None,
+                 diagnostics: Optional[Diagnostics] = None):
         """
         Initialize the BaseCleaner with either a file path or a directory.
         :param file_path: Path to a single file.
         :param directory: Path to a folder containing multiple files.
+        :param diagnostics: Sink for cleaning diagnostics and bad rows (optional, prints at info level by default).
         """
-        self.data_manager = DataManager(file_path=file_path, directory=directory)
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        self.data_manager = DataManager(file_path=file_path, directory=directory, schema=self.schema,
+                                        diagnostics=self.diagnostics)
         self.data = None
+        self.cache: Optional[CleanedDataCache] = None
+        # Rows per source file in self.data, in order, while the data is still the concatenation of the files
+        self.run_lengths: Optional[List[int]] = None
+        self.rows_reordered: Optional[int] = None  # Rows the last sort() had to move within their own file
+        self.read_filters: List[ColumnFilter] = []  # Filter steps known to hold for every row of self.data
+        self.plan: Optional[CleaningPlan] = None  # Last executed cleaning plan
+        self.scan_stats: Optional[ScanStats] = None  # Bytes and row groups skipped by the last load_partitioned()
+        self.id_dictionary: Optional[IdDictionary] = None  # Encodes memberId/terminalId at the end of clean()
+        self.timestamp_unique_ratio: Optional[float] = None  # Distinct timestamp strings / rows parsed by the last clean()
 
-    def load_data(self, pattern: str = None, sheet_name_column: str = None) -> pd.DataFrame:
+    def load_data(self, pattern: str = None, sheet_name_column: str = None,
+                  workers: int = 1, pool: str = "thread", chunksize: Optional[int] = None,
+                  cfg: Optional[str] = None, date_range: Optional[Tuple[str, str]] = None,
+                  projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
         """
         Load data using DataManager.
+        Rows without Apple manufacturer data are dropped while reading, per chunk in streaming mode.
         :param pattern: Optional regex pattern to filter files.
+        :param workers: Number of parallel workers for multi-file loading (1 loads sequentially).
+        :param pool: Pool type for parallel loading, "thread" or "process".
+        :param chunksize: Stream CSV files in chunks of this many rows (optional).
+        :param cfg: Optional path to JSON cleaning steps. Filter steps are applied while reading,
+                    the remaining steps (e.g. sort) run on the combined data afterwards.
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format; files are looked up
+                           in the partition catalog instead of scanning the directory (optional).
+        :param projection: Only read the columns in this projection, e.g. self.projection before clean() (optional).
         :return: Loaded pandas DataFrame.
         """
-        self.data = self.data_manager.load_files(pattern=pattern, sheet_name_column=sheet_name_column)
-        #print(self.data.columns)
-        #print(self.data['accessAddress'].head())
-        if 'accessAddress' in self.data.columns: 
-            self.data = self.data[self.data['accessAddress'].str[14:20] == 'ff4c00']
-        #print(self.data)
-        #exit()
+        predicates, remaining_steps = self._read_predicates(cfg, projection=projection)
+        self.data = self.data_manager.load_files(pattern=pattern, sheet_name_column=sheet_name_column,
+                                                 workers=workers, pool=pool, chunksize=chunksize,
+                                                 predicates=predicates, date_range=date_range, projection=projection)
+        self.run_lengths = list(self.data_manager.file_lengths)
+        self.read_filters = [p for p in predicates if isinstance(p, ColumnFilter)]
+        if apple_manufacturer in predicates and "accessAddress" in self.data.columns:
+            # apple_manufacturer saw accessAddress while reading
+            self.read_filters.append(APPLE_MANUFACTURER_FILTER)
+        self.run_steps(remaining_steps)
+        return self.data
+
+    def _read_predicates(self, cfg: Optional[str] = None, projection: Optional[ColumnProjection] = None) -> tuple:
+        """
+        Build the row predicates applied while reading and the steps left for the combined data.
+        apple_manufacturer only applies to files that store accessAddress as a column: raw exports
+        keep their non-Apple rows whether or not the projection extracts accessAddress while reading.
+        :param cfg: Optional path to JSON cleaning steps.
+        :param projection: Projection the files are read with (optional).
+        :return: Tuple of (row predicates, remaining steps).
+        """
+        predicates = [] if projection and projection.extracts("accessAddress") else [apple_manufacturer]
+        remaining_steps = []
+        if cfg:
+            step_predicates, remaining_steps = split_steps(self._read_steps(cfg))
+            predicates.extend(step_predicates)
+        return predicates, remaining_steps
+
+    def ingest(self, store_dir: str, pattern: str = None, sheet_name_column: str = None, cfg: Optional[str] = None,
+               chunksize: Optional[int] = None, date_range: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
+        """
+        Incrementally clean newly arrived or changed source files into a store directory.
+        Each source file is cleaned on its own and written as one Parquet part; files already
+        recorded in the store's manifest with the same size/mtime or content hash are skipped,
+        so a refresh costs O(new data). A file that changes while it is being cleaned (e.g. an
+        export still being written) is not recorded and is picked up again by the next refresh,
+        and a different cleaning configuration (see cache_config) cleans every file again.
+        :param store_dir: Directory holding the cleaned parts and '_manifest.json'.
+        :param pattern: Optional regex pattern to filter files.
+        :param cfg: Optional path to the JSON cleaning steps applied after clean().
+        :param chunksize: Stream CSV files in chunks of this many rows (optional).
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+        :return: The newly cleaned rows (empty DataFrame if nothing changed).
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        manifest = IngestManifest(os.path.join(store_dir, "_manifest.json"))
+        if manifest.use_config(self.cache_config(cfg, sheet_name_column=sheet_name_column)):
+            self.diagnostics.warning(f"Cleaning configuration changed: re-ingesting every file into {store_dir}")
+        predicates, _ = self._read_predicates(projection=self.projection)
+
+        new_parts = []
+        for file_path in self.data_manager.resolve_files(pattern=pattern, date_range=date_range):
+            changed = manifest.changed_digest(file_path)
+            if changed is None:
+                continue
+            digest, stat = changed
+
+            self.data = self.data_manager.load_paths([file_path], sheet_name_column=sheet_name_column,
+                                                     chunksize=chunksize, predicates=predicates,
+                                                     projection=self.projection)
+            self.run_lengths = [len(self.data)]
+            self.read_filters = []
+            self.clean()
+            if cfg:
+                self.execute_steps(cfg)
+
+            current = os.stat(file_path)
+            if (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                self.diagnostics.warning(f"{file_path} changed while it was being ingested; it will be ingested again")
+                continue
+
+            output_path = os.path.join(store_dir, f"{os.path.basename(file_path)}.parquet")
+            tmp_path = f"{output_path}.tmp{os.getpid()}"
+            self.data.to_parquet(tmp_path)
+            os.replace(tmp_path, output_path)
+
+            manifest.record(file_path, digest, stat, output_path, rows=len(self.data))
+            manifest.save()
+            new_parts.append(self.data)
+            self.diagnostics.info(f"Ingested {file_path}: {len(self.data)} rows -> {output_path}")
+
+        # Persist hash-only refreshes of unchanged files as well
+        manifest.save()
+        self.diagnostics.info(f"Ingest finished: {len(new_parts)} new or changed files.")
+        self.data = self._renumber_ids(concat_frames(new_parts)) if new_parts else pd.DataFrame()
+        self.run_lengths = [len(part) for part in new_parts]
+        self.read_filters = []
+        return self.data
+
+    def load_store(self, store_dir: str) -> pd.DataFrame:
+        """
+        Load every cleaned part recorded in a store built by ingest().
+        :param store_dir: Directory holding the cleaned parts and '_manifest.json'.
+        :return: Combined cleaned DataFrame, ordered by source file name.
+        """
+        manifest = IngestManifest(os.path.join(store_dir, "_manifest.json"))
+        if not manifest.entries:
+            raise ValueError(f"No ingested data found in {store_dir}. Call 'ingest()' first.")
+
+        parts = [pd.read_parquet(os.path.join(store_dir, manifest.entries[name]["output"]))
+                 for name in sorted(manifest.entries)]
+        self.data = self._renumber_ids(concat_frames(parts))
+        self.run_lengths = [len(part) for part in parts]
+        self.read_filters = []
         return self.data
-    
+
+    @staticmethod
+    def _renumber_ids(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Number the 'id' column of combined parts from 1, as clean() does for combined files;
+        each part was cleaned on its own and starts at 1.
+        """
+        if "id" in data.columns:
+            data["id"] = np.arange(1, len(data) + 1, dtype=data["id"].dtype)
+        return data
+
+    def enable_cache(self, cache_dir: str, fmt: str = "parquet") -> None:
+        """
+        Enable the columnar cache of cleaned data used by load_cleaned().
+        :param cache_dir: Directory where cached files are stored.
+        :param fmt: Columnar format to use, "parquet" or "feather".
+        """
+        self.cache = CleanedDataCache(cache_dir, fmt=fmt, diagnostics=self.diagnostics)
+
+    def enable_excel_sidecars(self, sidecar_dir: str) -> None:
+        """
+        Convert each Excel workbook to a Parquet sidecar file on first load, and read the sidecar afterwards.
+        :param sidecar_dir: Directory where sidecar files are stored.
+        """
+        self.data_manager.sidecar_dir = sidecar_dir
+
+    def enable_id_dictionary(self, path: str) -> None:
+        """
+        Encode memberId and terminalId as stable int32 codes from a persistent dictionary shared across days.
+        :param path: Dictionary directory (see src/data_processing/id_dictionary.py).
+        """
+        self.id_dictionary = IdDictionary(path)
+
+    def encode_ids(self) -> None:
+        """
+        Replace the memberId and terminalId columns by their dictionary codes, if a dictionary is enabled.
+        Called at the end of clean().
+        """
+        if self.id_dictionary is not None and self.data is not None:
+            self.data = self.id_dictionary.encode_frame(self.data)
+
+    def cache_config(self, cfg: Optional[str] = None, sheet_name_column: Optional[str] = None) -> dict:
+        """
+        Describe the cleaning configuration that produced the cached data.
+        Subclasses with extra cleaning options should extend this dictionary.
+        :param cfg: Optional path to the JSON cleaning steps applied after clean().
+        :param sheet_name_column: Column the Excel sheet names were stored in, if any (it changes the output).
+        :return: JSON-serializable configuration dictionary.
+        """
+        config = {"cleaner": type(self).__name__, "version": self.cache_version, "schema": self.data_manager.schema}
+        if sheet_name_column:
+            config["sheet_name_column"] = sheet_name_column
+        if cfg:
+            config["cleaning_steps"] = self._read_steps(cfg)
+        if self.id_dictionary is not None:
+            config["id_dictionary"] = os.path.abspath(self.id_dictionary.path)
+        return config
+
+    def load_cleaned(self, pattern: str = None, sheet_name_column: str = None, cfg: Optional[str] = None,
+                     workers: int = 1, pool: str = "thread",
+                     date_range: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
+        """
+        Load and clean data, reusing the cached result when the source files and cleaning
+        configuration are unchanged. Without enable_cache() this is load_data() + clean().
+        :param pattern: Optional regex pattern to filter files.
+        :param cfg: Optional path to the JSON cleaning steps applied after clean().
+        :param workers: Number of parallel workers for multi-file loading (1 loads sequentially).
+        :param pool: Pool type for parallel loading, "thread" or "process".
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+        :return: Cleaned pandas DataFrame.
+        """
+        key = None
+        if self.cache is not None:
+            source_files = self.data_manager.resolve_files(pattern=pattern, date_range=date_range)
+            key = self.cache.fingerprint(source_files, self.cache_config(cfg, sheet_name_column=sheet_name_column))
+            cached = self.cache.load(key)
+            if cached is not None:
+                self.diagnostics.info(f"Loaded cleaned data from cache: {self.cache.path_for(key)}")
+                self.data = cached
+                self.run_lengths = None
+                self.read_filters = []
+                return self.data
+
+        self.load_data(pattern=pattern, sheet_name_column=sheet_name_column, workers=workers, pool=pool,
+                       date_range=date_range, projection=self.projection)
+        self.clean()
+        if cfg:
+            self.execute_steps(cfg)
+
+        if key is not None:
+            path = self.cache.save(key, self.data)
+            if path:
+                self.diagnostics.info(f"Cleaned data cached to {path}")
+        return self.data
+
+
+    @classmethod
+    def profile_accumulator(cls) -> ProfileAccumulator:
+        """
+        Return an empty profile of this cleaner's output; subclasses choose the profiled columns.
+        """
+        return ProfileAccumulator()
+
+    def profile(self) -> dict:
+        """
+        Profile the loaded data in one pass (see profile_accumulator).
+        :return: A dictionary containing data profiling information.
+        """
+        if self.data is None:
+            raise ValueError("No data loaded. Call 'load_data()' first.")
+        return self.profile_accumulator().update(self.data).result()
+
+    def profile_files(self, pattern: str = None, sheet_name_column: str = None, chunksize: int = 100_000,
+                      workers: int = 1, date_range: Optional[Tuple[str, str]] = None) -> dict:
+        """
+        Profile the cleaned rows of the source files without loading them at once.
+        Each file is read and cleaned chunk by chunk into its own profile, and the per-file profiles
+        are merged in file order, so memory is bounded by one chunk per worker. self.data is not changed.
+        The positional 'id' column, assigned only to combined data, is left out of the profiled rows.
+        :param pattern: Optional regex pattern to filter files.
+        :param chunksize: Number of rows per chunk.
+        :param workers: Number of worker processes profiling files in parallel (1 profiles sequentially).
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+        :return: The same dictionary as profile() on the loaded and cleaned files.
+        """
+        files = self.data_manager.resolve_files(pattern=pattern, date_range=date_range)
+        predicates, _ = self._read_predicates(projection=self.projection)
+        profile_file = partial(_profile_file, type(self), self.data_manager, chunksize=chunksize,
+                               sheet_name_column=sheet_name_column, predicates=predicates)
+        if workers > 1 and len(files) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(files))) as executor:
+                # executor.map yields results in input order, keeping ties on the earliest file
+                profiles = list(executor.map(profile_file, files))
+        else:
+            profiles = [profile_file(file) for file in files]
+
+        total = self.profile_accumulator()
+        for file_profile in profiles:
+            total.merge(file_profile)
+        self.diagnostics.info(f"Profiled {total.rows} rows from {len(files)} files")
+        return total.result()
 
     @abstractmethod
     def clean(self) -> pd.DataFrame:
@@ -87,17 +375,44 @@ class BaseCleaner(ABC):
     def sort(self, column: str, ascending: bool = True) -> None:
         """
         Sort the DataFrame by a specific column.
+        While the data is still the concatenation of its source files, an ascending sort merges the
+        per-file runs instead of sorting globally: files that are already in order are only merged,
+        and rows_reordered records how many rows had to move within their own file.
         :param column: Column name to sort by.
         :param ascending: Sort order (True for ascending, False for descending).
         """
         if self.data is not None:
             if column not in self.data.columns:
                 raise ValueError(f"Column '{column}' not found in data.")
+
+            if ascending and self._has_file_runs():
+                try:
+                    order, self.rows_reordered = merge_sorted_runs(self.data[column].to_numpy(), self.run_lengths)
+                except TypeError:
+                    # Keys that cannot be compared with each other (e.g. mixed types)
+                    order = None
+                if order is not None:
+                    self.data = self.data.iloc[order]
+                    self.run_lengths = None
+                    self.diagnostics.info(f"Merged {len(order)} rows from pre-sorted files on '{column}': "
+                                          f"{self.rows_reordered} rows needed reordering")
+                    return
+
             self.data = self.data.sort_values(by=column, ascending=ascending)
+            self.rows_reordered = None
+            self.run_lengths = None
         else:
             raise ValueError("No data loaded. Call 'load_data()' first.")
 
 
+    def _has_file_runs(self) -> bool:
+        """
+        Check that the data still consists of the loaded files, concatenated in order.
+        """
+        return (self.run_lengths is not None and len(self.run_lengths) > 0
+                and sum(self.run_lengths) == len(self.data)
+                and self.data.index.equals(pd.RangeIndex(len(self.data))))
+
     def filter(self, column: str, condition: str, operation: str = "query") -> None:
         """
         Filter the DataFrame based on a specific condition.
@@ -112,48 +427,76 @@ class BaseCleaner(ABC):
             raise ValueError(f"Column '{column}' not found in data.")
 
         try:
-            if operation == "query":
-                self.data = self.data.query(f"{column} {condition}")
-            elif operation == "contains":
-                self.data = self.data[self.data[column].str.contains(condition, na=False)]
-            elif operation == "startswith":
-                self.data = self.data[self.data[column].str.startswith(condition, na=False)]
-            else:
-                raise ValueError(f"Unsupported filter operation: {operation}")
+            self.data = self.data[filter_mask(self.data, column, condition, operation)]
         except Exception as e:
             raise ValueError(f"Invalid filter operation. Error: {e}")
 
 
     def execute_steps(self, cfg: str) -> None:
         """
-        Execute a series of cleaning steps in the specified order.
+        Execute a series of cleaning steps through an optimized plan (see CleaningPlan).
         :param steps: List of cleaning steps in the format:
                       [{"operation": "sort", "params": {...}}, {"operation": "filter", "params": {...}}]
         """
-        steps = []
+        self.run_steps(self._read_steps(cfg))
+
+    def explain(self, cfg: Optional[str] = None) -> str:
+        """
+        Describe the optimized cleaning plan.
+        :param cfg: Path to JSON cleaning steps to plan without running them (optional).
+                    Without it, the last executed plan is described, with the rows kept at each stage.
+        :return: Plan description.
+        """
+        if cfg:
+            return CleaningPlan(self._read_steps(cfg), applied=self.read_filters).explain()
+        if self.plan is None:
+            raise ValueError("No cleaning plan executed yet. Call 'execute_steps()' first.")
+        return self.plan.explain()
+
+    @staticmethod
+    def _read_steps(cfg: str) -> list:
+        """
+        Read the cleaning steps from a JSON config file.
+        :param cfg: Path to the JSON config.
+        :return: List of cleaning steps.
+        """
         with open(cfg, "r") as f:
-            steps = json.load(f).get("cleaning_steps", [])
+            return json.load(f).get("cleaning_steps", [])
 
+    def run_steps(self, steps: list) -> None:
+        """
+        Execute already-parsed cleaning steps.
+        The steps are planned first: filters run ahead of sorts as one mask per column, redundant
+        filters are skipped and the result is materialized once.
+        :param steps: List of cleaning steps in the format used by execute_steps.
+        """
         if self.data is None:
             raise ValueError("No data loaded. Call 'load_data()' first.")
+        if not steps:
+            return
 
-        for step in steps:
-            operation = step.get("operation")
-            params = step.get("params", {})
-
-            if operation == "sort":
-                self.sort(**params)
-            elif operation == "filter":
-                self.filter(**params)
-            else:
-                raise ValueError(f"Unsupported operation: {operation}")    
+        plan = CleaningPlan(steps, applied=self.read_filters)
+        result = plan.execute(self.data, run_lengths=self.run_lengths if self._has_file_runs() else None)
+        if result is not self.data:
+            self.data = result
+            self.run_lengths = None
+        self.plan = plan
+        if plan.rows_reordered is not None:
+            self.rows_reordered = plan.rows_reordered
+        self.read_filters = self.read_filters + plan.filters()
+        if self.diagnostics.enabled("debug"):
+            self.diagnostics.debug(plan.explain())
             
-    def save_to(self, output_path: str, encoding: str = "utf-8") -> None:
+    def save_to(self, output_path: str, encoding: str = "utf-8", partition_by: Optional[List[str]] = None,
+                row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> None:
         """
         Save the cleaned data to a specified file with support for encoding.
         :param output_path: The path where the data should be saved.
-                            Supports .csv and .xlsx formats.
+                            Supports .csv and .xlsx formats, and .parquet/.feather dataset directories
+                            partitioned by date (see partitioned.write_partitioned).
         :param encoding: Encoding to use when saving the file (default: "utf-8-sig").
+        :param partition_by: Extra partition columns for .parquet/.feather, e.g. ["terminalId"] (optional).
+        :param row_group_size: Rows per Parquet row group.
         """
         if self.data is None or self.data.empty:
             raise ValueError("No data to save. Ensure data is loaded and cleaned before saving.")
@@ -167,14 +510,61 @@ class BaseCleaner(ABC):
         elif ext == ".xlsx":
             # For Excel, pandas handles encoding internally
             self.data.to_excel(output_path, index=False)
+        elif ext in PARTITIONED_FORMATS:
+            files = write_partitioned(self.data, output_path, fmt=PARTITIONED_FORMATS[ext],
+                                      partition_by=partition_by, row_group_size=row_group_size)
+            self.diagnostics.info(f"Data saved to {len(files)} partitions under {output_path}")
+            return
         else:
-            raise ValueError(f"Unsupported file format: {ext}. Only .csv and .xlsx are supported.")
+            raise ValueError(f"Unsupported file format: {ext}. Only .csv, .xlsx, .parquet and .feather are supported.")
+
+        self.diagnostics.info(f"Data saved to {output_path} with encoding {encoding}")
 
-        print(f"Data saved to {output_path} with encoding {encoding}")
 
+    def load_partitioned(self, path: str, date_range: Optional[Tuple[str, str]] = None,
+                         partition_filters: Optional[Dict[str, List]] = None,
+                         time_range: Optional[Tuple[datetime, datetime]] = None,
+                         terminal_ids: Optional[List] = None) -> pd.DataFrame:
+        """
+        Load cleaned data saved by save_to() as a partitioned .parquet/.feather dataset.
+        Only the matching partitions, and within them the Parquet row groups whose statistics
+        overlap time_range and terminal_ids, are read; scan_stats records what was skipped.
+        :param path: Dataset directory.
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+        :param partition_filters: Map partition column -> accepted values, e.g. {"terminalId": ["T1"]} (optional).
+        :param time_range: Inclusive (start, end) eventTime window (optional).
+        :param terminal_ids: Keep only these terminals (optional).
+        :return: Loaded pandas DataFrame.
+        """
+        self.scan_stats = ScanStats()
+        self.data = read_partitioned(path, date_range=date_range, partition_filters=partition_filters,
+                                     time_range=time_range, terminal_ids=terminal_ids, stats=self.scan_stats)
+        self.diagnostics.info(f"Loaded {len(self.data)} rows from {path}: {self.scan_stats}")
+        self.run_lengths = None
+        self.read_filters = []
+        return self.data
 
     def get_data(self):
         """
         Return a view of the data.
         """
-        return self.data.copy(deep=False) if self.data is not None else None
\ No newline at end of file
+        return self.data.copy(deep=False) if self.data is not None else None
+
+
+def _profile_file(cleaner_class: type, data_manager: DataManager, file_path: str, chunksize: int,
+                  sheet_name_column: str = None, predicates: Optional[list] = None) -> ProfileAccumulator:
+    """
+    Clean one file chunk by chunk with a throwaway cleaner and fold each chunk into a profile.
+    Module-level so it can run in a process pool.
+    """
+    cleaner = cleaner_class(diagnostics=Diagnostics(level="error", echo=False))
+    profile = cleaner_class.profile_accumulator()
+    for chunk in data_manager.iter_file_chunks(file_path, chunksize, sheet_name_column=sheet_name_column,
+                                               predicates=predicates, projection=cleaner_class.projection):
+        if chunk.empty:
+            continue
+        cleaner.data = chunk
+        cleaner.run_lengths = None
+        cleaned = cleaner.clean()
+        profile.update(cleaned.drop(columns=["id"], errors="ignore"))
+    return profile
@@ -0,0 +1,91 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from typing import List, Optional
+from src.data_processing.diagnostics import Diagnostics
+
+
+class CleanedDataCache:
+    """
+    Columnar on-disk cache for cleaned DataFrames.
+    Each entry is keyed by a fingerprint of the source files (path, size, mtime)
+    and the cleaning configuration, so an entry is rebuilt only when an input changes.
+    """
+
+    SUPPORTED_FORMATS = ("parquet", "feather")
+
+    def __init__(self, cache_dir: str, fmt: str = "parquet", diagnostics: Optional[Diagnostics] = None):
+        """
+        Initialize the cache.
+        :param cache_dir: Directory where cached files are stored.
+        :param fmt: Columnar format to use, "parquet" or "feather".
+        :param diagnostics: Sink for cache warnings (optional, prints at info level by default).
+        """
+        if fmt not in self.SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported cache format: {fmt}. Use one of {self.SUPPORTED_FORMATS}.")
+        self.cache_dir = cache_dir
+        self.fmt = fmt
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(source_files: List[str], config: Optional[dict] = None) -> str:
+        """
+        Build a cache key from the source files and the cleaning configuration.
+        :param source_files: List of input file paths.
+        :param config: JSON-serializable cleaning configuration.
+        :return: Hex digest identifying this combination of inputs.
+        """
+        sources = []
+        for path in sorted(source_files):
+            stat = os.stat(path)
+            sources.append([os.path.abspath(path), stat.st_size, stat.st_mtime_ns])
+
+        payload = json.dumps({"sources": sources, "config": config or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """
+        Return the cache file path for a given key.
+        """
+        return os.path.join(self.cache_dir, f"{key}.{self.fmt}")
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached DataFrame.
+        :param key: Cache key from fingerprint().
+        :return: The cached DataFrame, or None if there is no entry for this key.
+        """
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+
+        if self.fmt == "parquet":
+            return pd.read_parquet(path)
+        return pd.read_feather(path)
+
+    def save(self, key: str, data: pd.DataFrame) -> Optional[str]:
+        """
+        Write a DataFrame to the cache. The file is written to a temporary path first and
+        then moved into place, so readers never see a partially written entry.
+        :param key: Cache key from fingerprint().
+        :param data: DataFrame to store.
+        :return: Path of the cached file, or None if the frame could not be stored.
+        """
+        path = self.path_for(key)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            if self.fmt == "parquet":
+                data.to_parquet(tmp_path)
+            else:
+                data.reset_index(drop=True).to_feather(tmp_path)
+        except (ValueError, TypeError, ImportError) as e:
+            # Columns with mixed Python types cannot be stored in a columnar file
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self.diagnostics.warning(f"Could not write cache file {path}. Error: {e}")
+            return None
+
+        os.replace(tmp_path, path)
+        return path
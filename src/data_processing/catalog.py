@@ -0,0 +1,246 @@
+import os
+import re
+import json
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from src.data_processing.diagnostics import Diagnostics
+
+# Candidate column names for the terminal and store of a row, across raw, processed and POS layouts
+TERMINAL_COLUMNS = ["terminalId", "POSCode", "機號"]
+STORE_COLUMNS = ["StoreId", "storeId", "店別"]
+
+# A date in a file name, e.g. '2024-12-09' or '20241209', not part of a longer run of digits
+DATE_IN_NAME = re.compile(r"(?<!\d)(\d{4})-?(\d{2})-?(\d{2})(?!\d)")
+
+
+class PartitionCatalog:
+    """
+    Persistent index of the data files in a directory, partitioned by date, terminal and store.
+    Dates come from the file names. The directory is listed again only when its mtime changes
+    (a file was added, removed or renamed), and a lookup re-stats only the files in the requested
+    date range, re-indexing those that changed. Terminals and stores are read from a file's
+    contents only when a lookup filters on them.
+    """
+
+    INDEX_FILE_NAME = "_catalog.json"
+    SUPPORTED_EXTENSIONS = (".csv", ".csv.gz", ".csv.xz", ".csv.bz2", ".xlsx", ".xls")
+
+    # Process-wide catalogs, one per (directory, index path), shared by all DataManagers
+    _instances: Dict[Tuple[str, str], "PartitionCatalog"] = {}
+
+    def __init__(self, directory: str, index_path: Optional[str] = None, diagnostics: Optional[Diagnostics] = None):
+        """
+        Initialize the catalog and bring its file list up to date with the directory.
+        :param directory: Path to the folder containing the data files.
+        :param index_path: Where to persist the index (default: '_catalog.json' inside the directory).
+        :param diagnostics: Sink for indexing warnings (optional, prints at info level by default).
+        """
+        self.directory = directory
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        self.index_path = index_path or os.path.join(directory, self.INDEX_FILE_NAME)
+        # Map file name -> {"date", "size", "mtime_ns"}, plus "terminals" and "stores" once the contents are read
+        self.entries: Dict[str, dict] = {}
+        self.directory_mtime_ns: Optional[int] = None  # Directory mtime when it was last listed
+        self._by_date: Dict[Optional[str], List[str]] = {}
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            self.entries = index.get("files", {})
+            self.directory_mtime_ns = index.get("directory_mtime_ns")
+        self._group_by_date()
+        if self._sync_listing():
+            self.save()
+
+    @classmethod
+    def for_directory(cls, directory: str, index_path: Optional[str] = None,
+                      diagnostics: Optional[Diagnostics] = None) -> "PartitionCatalog":
+        """
+        Return the shared catalog for a directory. Lookups keep it up to date (see files()).
+        :param directory: Path to the folder containing the data files.
+        :param index_path: Where to persist the index (default: '_catalog.json' inside the directory).
+        :param diagnostics: Sink for indexing warnings of the caller's lookups (optional).
+        :return: PartitionCatalog instance.
+        """
+        index_path = index_path or os.path.join(directory, cls.INDEX_FILE_NAME)
+        key = (os.path.abspath(directory), os.path.abspath(index_path))
+        catalog = cls._instances.get(key)
+        if catalog is None:
+            catalog = cls(directory, index_path=index_path, diagnostics=diagnostics)
+            cls._instances[key] = catalog
+        elif diagnostics is not None:
+            catalog.diagnostics = diagnostics
+        return catalog
+
+    def refresh(self) -> None:
+        """
+        List the directory and re-stat every file, re-indexing new or changed files and dropping
+        deleted ones, then persist the index if anything changed.
+        """
+        self.directory_mtime_ns = None
+        changed = self._sync_listing()
+        changed = self._restat(list(self.entries)) or changed
+        if changed:
+            self.save()
+
+    def _sync_listing(self) -> bool:
+        """
+        List the directory again if its mtime changed: add new files and drop deleted ones.
+        Files already indexed are not stat'ed here.
+        :return: True if the index changed.
+        """
+        mtime_ns = os.stat(self.directory).st_mtime_ns
+        if mtime_ns == self.directory_mtime_ns:
+            return False
+
+        changed = False
+        seen = set()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file() or not entry.name.lower().endswith(self.SUPPORTED_EXTENSIONS):
+                    continue
+                seen.add(entry.name)
+                if entry.name not in self.entries:
+                    self.entries[entry.name] = self._file_entry(entry.name, entry.stat())
+                    changed = True
+        for name in set(self.entries) - seen:
+            del self.entries[name]
+            changed = True
+
+        self.directory_mtime_ns = mtime_ns
+        self._group_by_date()
+        return True
+
+    def _restat(self, names: List[str]) -> bool:
+        """
+        Re-stat files; those whose size or mtime changed lose their indexed contents, deleted ones are dropped.
+        :return: True if the index changed.
+        """
+        changed = False
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                del self.entries[name]
+                changed = True
+                continue
+            indexed = self.entries[name]
+            if indexed["size"] != stat.st_size or indexed["mtime_ns"] != stat.st_mtime_ns:
+                self.entries[name] = self._file_entry(name, stat)
+                changed = True
+        if changed:
+            self._group_by_date()
+        return changed
+
+    def _group_by_date(self) -> None:
+        self._by_date = {}
+        for name in sorted(self.entries):
+            self._by_date.setdefault(self.entries[name]["date"], []).append(name)
+
+    def save(self) -> None:
+        """
+        Persist the index as JSON.
+        """
+        tmp_path = f"{self.index_path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"directory": self.directory, "directory_mtime_ns": self.directory_mtime_ns,
+                       "files": self.entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.index_path)
+        if os.path.dirname(os.path.abspath(self.index_path)) == os.path.abspath(self.directory):
+            # Writing the index changed the directory mtime; the persisted value is re-listed once by the next process
+            self.directory_mtime_ns = os.stat(self.directory).st_mtime_ns
+
+    @staticmethod
+    def _file_entry(name: str, stat: os.stat_result) -> dict:
+        """
+        Build the index entry of a file from its name and stat; contents are indexed on demand.
+        """
+        return {"date": date_in_name(name), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _index_contents(self, name: str) -> None:
+        """
+        Read the terminals and stores of a file into its entry.
+        Terminals and stores are read from CSV contents (compressed or not);
+        they are left unknown (None) for Excel files.
+        """
+        file_path = os.path.join(self.directory, name)
+        terminals, stores = None, None
+        if not file_path.lower().endswith((".xlsx", ".xls")):
+            try:
+                header = pd.read_csv(file_path, nrows=0).columns
+                terminal_column = next((c for c in TERMINAL_COLUMNS if c in header), None)
+                store_column = next((c for c in STORE_COLUMNS if c in header), None)
+                usecols = [c for c in (terminal_column, store_column) if c]
+                if usecols:
+                    values = pd.read_csv(file_path, usecols=usecols, dtype=str)
+                    if terminal_column:
+                        terminals = sorted(values[terminal_column].dropna().unique().tolist())
+                    if store_column:
+                        stores = sorted(values[store_column].dropna().unique().tolist())
+            except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError) as e:
+                self.diagnostics.warning(f"Could not index contents of {file_path}. Error: {e}")
+
+        self.entries[name].update(terminals=terminals, stores=stores)
+
+    def dates(self) -> List[str]:
+        """
+        Return all indexed dates in ascending order.
+        """
+        if self._sync_listing():
+            self.save()
+        return sorted(d for d in self._by_date if d is not None)
+
+    def files(self, date_range: Optional[Tuple[str, str]] = None, terminal_ids: Optional[List[str]] = None,
+              store_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Look up the files matching the given partitions.
+        New or deleted files are picked up from the directory mtime; the files in the date range
+        are re-stat'ed, so rows appended to them are seen. Files whose terminals or stores are
+        unknown are kept, since they cannot be ruled out.
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+        :param terminal_ids: Keep files containing any of these terminals (optional).
+        :param store_ids: Keep files containing any of these stores (optional).
+        :return: Sorted list of file paths.
+        """
+        changed = self._sync_listing()
+        names = self._names_in_range(date_range)
+        if self._restat(names):
+            changed = True
+            names = self._names_in_range(date_range)
+
+        for wanted_ids, field in ((terminal_ids, "terminals"), (store_ids, "stores")):
+            if wanted_ids is None:
+                continue
+            for name in names:
+                if field not in self.entries[name]:
+                    self._index_contents(name)
+                    changed = True
+            wanted = {str(i) for i in wanted_ids}
+            names = [n for n in names if self.entries[n][field] is None or wanted & set(self.entries[n][field])]
+
+        if changed:
+            self.save()
+        return [os.path.join(self.directory, name) for name in sorted(names)]
+
+    def _names_in_range(self, date_range: Optional[Tuple[str, str]]) -> List[str]:
+        if not date_range:
+            return sorted(self.entries)
+        start, end = date_range
+        return [name for date in sorted(d for d in self._by_date if d is not None)
+                if start <= date <= end for name in self._by_date[date]]
+
+
+def date_in_name(name: str) -> Optional[str]:
+    """
+    Return the first valid date in a file name as 'YYYY-MM-DD', or None.
+    Digit runs that are not a calendar date (e.g. a record id) are skipped.
+    """
+    for match in DATE_IN_NAME.finditer(name):
+        date = "-".join(match.groups())
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            continue
+        return date
+    return None
@@ -1,136 +1,98 @@
 import os
+import multiprocessing
+import numpy as np
 import pandas as pd
-import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Mapping, Optional, Tuple
 from ..base_cleaner import BaseCleaner
+from ..diagnostics import Diagnostics
+from ..member_summary import MemberSummary, single_terminal_mask
+from ..schema import BLE_SCHEMA, concat_frames
+from ..profiling import ProfileAccumulator
+from ..projection import BLE_PROJECTION, extract_json_fields
+from ..timestamps import format_event_time_stats, normalize_event_times, unique_ratio
 
 class BLECleaner(BaseCleaner):
     """
     Cleaner for BLE scan data.
     """
 
-    def clean(self) -> pd.DataFrame:
+    schema = BLE_SCHEMA
+    projection = BLE_PROJECTION
+    # 2: accessAddress/rssi are extracted at read time and typed by the schema
+    # 3: read-time filter steps see the projected accessAddress
+    # 4: apple_manufacturer no longer runs on the projected accessAddress; the projection does not change the rows
+    cache_version = 4
+
+    def __init__(self, file_path: str = None, directory: str = None, diagnostics: Optional[Diagnostics] = None):
+        super().__init__(file_path=file_path, directory=directory, diagnostics=diagnostics)
+        self.raw_data_split: Optional[dict] = None  # Rows of the last rawData parse decoded in bulk ("fast") or by json.loads ("slow")
+        self.event_time_formats: Optional[dict] = None  # Rows and invalid values per eventTime format of the last clean
+        self.downsample_ratio: Optional[float] = None  # Rows kept / rows before the last downsample()
+
+    def clean(self, workers: int = 1) -> pd.DataFrame:
         """
         Clean the intermediate BLE data:
         1. Retain only required columns.
         2. Parse 'rawData' (JSON format) to extract 'accessAddress' and 'rssi'.
         3. Add parsed values as new columns.
+        4. Normalize 'eventTime' to datetime.
+        When the data was loaded with BLE_PROJECTION, 'accessAddress' and 'rssi' were already
+        extracted while reading and step 2 is skipped.
+        Steps 1-4 are row-local: with workers > 1 they run on balanced row ranges (see
+        _partition_bounds) in a process pool, and the parts are concatenated
+        before the 'id' column is assigned, giving the same result as the serial path.
+        :param workers: Number of worker processes (1 cleans in this process).
         """
         if self.data is None:
             raise ValueError("No data loaded. Call 'load_data()' first.")
 
-        # 檢查是否需要處理無 header 的情況
-        if not any(col in self.data.columns for col in ["POSCode", "UserId", "PLICd", "PLIEventCd", "PLIEventTimestamp", "Distance", "RawData"]):
-            # 定義欄位順序
-            columns = ["BeaconRecordId", "ConglomeratedId", "StoreId", "POSCode", "UserId", "PLICd", "PLIEventCd", "PLIEventTimestamp", "Distance", "RawData", "Source"]
-            # 重新命名欄位
-            self.data.columns = columns
-
-        # Define column name mapping (new column names -> old column names)
-        column_mapping = {
-            "POSCode": "terminalId",
-            "UserId": "memberId",
-            "PLICd": "eventSource",
-            "PLIEventCd": "eventType",
-            "PLIEventTimestamp": "eventTime",
-            "Distance": "distance",
-            "RawData": "rawData"
-        }
-        
-        # Rename columns to old names for compatibility
-        self.data.rename(columns=column_mapping, inplace=True)
-        
-        # Retain only required columns
-        required_columns = [
-            "terminalId", "memberId", "eventSource", "eventType", "eventTime", "distance", "rawData"
-        ]
-        if not set(required_columns).issubset(self.data.columns):
-            raise ValueError(f"Missing required columns: {set(required_columns) - set(self.data.columns)}")
-        
-        self.data = self.data[required_columns]
+        if workers > 1 and len(self.data) > 1:
+            bounds = self._partition_bounds(workers)
+            results = _clean_partitions(self.data, bounds, workers)
+            self.data = concat_frames([data for data, _ in results])
+            stats = merge_clean_stats([part_stats for _, part_stats in results])
+            self.diagnostics.info(f"Cleaned {len(bounds)} partitions with {min(workers, len(bounds))} processes")
+        else:
+            self.data, stats = clean_rows(self.data)
 
-        # Parse 'rawData' and add 'accessAddress' and 'rssi'
-        def parse_raw_data(raw_data):
-            try:
-                parsed = json.loads(raw_data)
-                return parsed.get("AD3"), parsed.get("rssi")
-            except (json.JSONDecodeError, TypeError):
-                return None, None
-
-        self.data["accessAddress"], self.data["rssi"] = zip(*self.data["rawData"].map(parse_raw_data))
-
-        # Drop the original 'rawData' column and any unused columns
-        self.data.drop(columns=["rawData", "distance", "eventSource"], inplace=True)
+        self.raw_data_split = stats["raw_data_split"]
+        if self.raw_data_split is not None:
+            self.diagnostics.info(f"rawData 解析: {self.raw_data_split['fast']} 筆快速路徑, {self.raw_data_split['slow']} 筆 json.loads")
 
         # Add a unique 'id' column (optional)
         self.data.reset_index(drop=True, inplace=True)
         self.data.insert(0, "id", self.data.index + 1)
 
-        def convert_to_24_hour_format(value):
-            """
-            Convert Chinese AM/PM time format to 24-hour format and return valid datetime strings.
-            Handle invalid or empty values gracefully.
-            """
-            if not isinstance(value, str) or value.strip() == "":
-                print(f"空值或非字串值: {value}")
-                return None
-
-            value = value.strip()  # Remove leading/trailing whitespace
-            #print(f"處理時間值: {value}")
-
-            try:
-                # 檢查是否已經是 24 小時制格式（包含毫秒）
-                if ".000" in value:
-                    # 將日期中的 - 替換為 /
-                    result = value.replace(".000", "").replace("-", "/")
-                    #print(f"24小時制格式（含毫秒）: {value} -> {result}")
-                    return result
-                
-                if "上午" in value:
-                    result = value.replace("上午", "").strip()
-                    #print(f"上午格式: {value} -> {result}")
-                    return result
-                elif "下午" in value:
-                    try:
-                        # 嘗試處理有兩個空格的情況
-                        date_part, time_part = value.replace("下午", "").strip().split("  ")
-                        #print(f"下午格式（兩個空格）: {value}")
-                    except ValueError:
-                        # 如果失敗，嘗試處理有一個空格的情況
-                        date_part, time_part = value.replace("下午", "").strip().split(" ")
-                        #print(f"下午格式（一個空格）: {value}")
-                    
-                    hour, minute, second = map(int, time_part.split(":"))
-                    if hour != 12:  # Avoid converting 12 PM to 24
-                        hour += 12
-                    time_part = f"{hour}:{minute:02}:{second:02}"
-                    result = f"{date_part} {time_part}"
-                    #print(f"下午轉換結果: {value} -> {result}")
-                    return result
-                else:
-                    #print(f"其他格式（直接返回）: {value}")
-                    return value
-            except (ValueError, IndexError) as e:
-                # Log invalid values and return None
-                print(f"時間格式轉換錯誤: {value}. 錯誤: {e}")
-                return None
-
-        # Apply the conversion function and extract only the date
-        print("開始標準化 'eventTime' 欄位...")
-        print(f"轉換前的時間值範例:\n{self.data['eventTime'].head()}")
-        self.data["eventTime"] = self.data["eventTime"].map(convert_to_24_hour_format)
-        print(f"轉換後的時間值範例:\n{self.data['eventTime'].head()}")
-        self.data["eventTime"] = pd.to_datetime(self.data["eventTime"], format="%Y/%m/%d %H:%M:%S", errors="coerce")
-        print(f"最終轉換為 datetime 後的範例:\n{self.data['eventTime'].head()}")
-
-        # Log invalid rows
-        invalid_rows = self.data[self.data["eventTime"].isna()]
-        if not invalid_rows.empty:
-            print("Warning: The following rows have invalid 'eventTime' values and were set to NaT:")
-            print(invalid_rows)
-
-        print("Cleaning process completed successfully.")
+        self.event_time_formats = stats["event_time_formats"]
+        self.diagnostics.info(f"eventTime 格式: {format_event_time_stats(self.event_time_formats)}")
+        self.timestamp_unique_ratio = unique_ratio(self.event_time_formats)
+        self.diagnostics.info(f"eventTime 唯一值: {self.event_time_formats['unique']} / {self.event_time_formats['total']} 筆")
+        if self.diagnostics.enabled("debug"):
+            self.diagnostics.debug(f"最終轉換為 datetime 後的範例:\n{self.data['eventTime'].head()}")
+
+        # Record invalid rows: counted and sampled, not printed
+        invalid = self.data["eventTime"].isna()
+        if invalid.any():
+            self.diagnostics.record_rows("invalid_eventTime", self.data[invalid],
+                                         "Rows with invalid 'eventTime' values were set to NaT")
+
+        # Stable integer codes for memberId/terminalId, if a persistent dictionary is enabled
+        self.encode_ids()
+
+        self.diagnostics.info("Cleaning process completed successfully.")
         return self.data
 
+    def _partition_bounds(self, workers: int) -> List[Tuple[int, int]]:
+        """
+        Row ranges for the clean workers: one equal chunk per worker, further cut at the source file
+        boundaries while the data is still the concatenation of its files. No range is larger than
+        len(data) / workers, so one large file does not leave the other workers idle.
+        """
+        edges = np.linspace(0, len(self.data), min(workers, len(self.data)) + 1).astype(int)
+        if self._has_file_runs() and len(self.run_lengths) > 1:
+            edges = np.union1d(edges, np.cumsum([0] + list(self.run_lengths)))
+        return [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
 
     def validate(self) -> bool:
         """
@@ -140,69 +102,236 @@ class BLECleaner(BaseCleaner):
         required_columns = ["rssi", "timestamp", "device_id"]
         return all(column in self.data.columns for column in required_columns)
     
-    def profile(self) -> dict:
+    @classmethod
+    def profile_accumulator(cls) -> ProfileAccumulator:
+        """
+        Profile of total rows, distinct memberIds, the rows with the maximum and minimum rssi and null counts.
+        """
+        return ProfileAccumulator(distinct_column="memberId", value_column="rssi",
+                                  labels={"distinct": "unique_member_ids", "max_row": "max_rssi_row",
+                                          "min_row": "min_rssi_row"})
+
+    def filter_invalid_member_ids(self, summary: Optional[MemberSummary] = None,
+                                  date_range: Optional[Tuple[str, str]] = None) -> None:
         """
-        Provide a profile of the data, including key statistics.
-        :return: A dictionary containing data profiling information.
+        Filter out member_ids that are only detected on a single terminalId.
+        Log the total count of member_ids before and after filtering, and rows removed.
+        With a MemberSummary, the loaded days are added to the summary first and terminals are
+        counted over every summarized day, so earlier days are taken into account without
+        loading their detections; call summary.save() to persist it.
+        :param summary: Persistent per-member summary for multi-day runs (optional).
+        :param date_range: Inclusive (start, end) dates of the summary to count over (optional, all days).
         """
         if self.data is None:
             raise ValueError("No data loaded. Call 'load_data()' first.")
 
-        # 1. Total number of rows
-        total_rows = len(self.data)
-
-        # 2. Number of unique memberID values
-        unique_members = self.data["memberId"].nunique()
-
-        # 3. Row with maximum rssi value
-        max_rssi_row = self.data.loc[self.data["rssi"].idxmax()].to_dict()
+        terminal_counts = None
+        if summary is not None:
+            summary.update(self.data)
+            terminal_counts = summary.terminal_counts(date_range)
 
-        # 4. Row with minimum rssi value
-        min_rssi_row = self.data.loc[self.data["rssi"].idxmin()].to_dict()
+        # One boolean mask from the member/terminal codes, used for the counts and the filter
+        remove = single_terminal_mask(self.data["memberId"], self.data["terminalId"], terminal_counts)
+        rows_to_remove = int(remove.sum())
+        member_ids_before = self.data["memberId"].nunique()
+        removed_member_ids = self.data["memberId"][remove].nunique()
+        if rows_to_remove:
+            self.data = self.data[~remove]
 
-        # Construct profile dictionary
-        profile = {
-            "total_rows": total_rows,
-            "unique_member_ids": unique_members,
-            "max_rssi_row": max_rssi_row,
-            "min_rssi_row": min_rssi_row,
-        }
-
-        return profile
+        # Log filtering results
+        self.diagnostics.count("removed_member_rows", rows_to_remove)
+        self.diagnostics.info(f"Filtering invalid member_ids...")
+        self.diagnostics.info(f"Total member_ids before filtering: {member_ids_before}")
+        self.diagnostics.info(f"Total member_ids after filtering: {member_ids_before - removed_member_ids}")
+        self.diagnostics.info(f"Total removed member_ids: {removed_member_ids}")
+        self.diagnostics.info(f"Rows removed: {rows_to_remove}")
+        
 
-    def filter_invalid_member_ids(self) -> None:
+    def downsample(self, bucket: str = "1s", rssi_thresholds: Iterable[Mapping] = ()) -> None:
         """
-        Filter out member_ids that are only detected on a single terminalId.
-        Log the total count of member_ids before and after filtering, and rows removed.
+        Collapse repeated detections to one row per (memberId, terminalId, time bucket).
+        Each kept row is the bucket's first detection, with 'eventTime' and 'lastEventTime' its
+        first and last detection times, 'rssi' the bucket's maximum and a 'hits' column counting
+        the detections it replaces. The dwell indicators measure up to 'lastEventTime' and the
+        advanced pass-by count adds up 'hits', so both are unchanged. Pass the RSSI thresholds the indicators will filter on (e.g. the
+        pass-by and entry thresholds) so that detections on either side of a threshold are kept
+        in separate rows; otherwise a row that passes a threshold can carry the times of weaker
+        detections. Optional; call after clean() and before building indicators.
+        :param bucket: Bucket width as a pandas Timedelta string, e.g. "1s" or "10s".
+        :param rssi_thresholds: Mappings of terminal ID to RSSI threshold, as used by the indicators.
         """
         if self.data is None:
             raise ValueError("No data loaded. Call 'load_data()' first.")
 
-        # 計算剔除前的 memberId 總數
-        member_ids_before = self.data['memberId'].nunique()
+        rows_before = len(self.data)
+        if self.id_dictionary is not None:
+            rssi_thresholds = [{self.id_dictionary.lookup("terminalId", terminal): value
+                                for terminal, value in thresholds.items()} for thresholds in rssi_thresholds]
+        self.data = downsample_detections(self.data, bucket, rssi_thresholds)
+        self.downsample_ratio = len(self.data) / rows_before if rows_before else None
+        self.run_lengths = None
+
+        self.diagnostics.count("downsampled_rows", rows_before - len(self.data))
+        self.diagnostics.info(f"Downsampled to {bucket} buckets: {rows_before} -> {len(self.data)} rows "
+                              f"(reduction {rows_before / max(len(self.data), 1):.1f}x)")
+
 
-        # Group by memberId and count the number of unique terminalIds for each memberId
-        member_terminal_counts = self.data.groupby('memberId')['terminalId'].nunique()
+def downsample_detections(data: pd.DataFrame, bucket: str = "1s",
+                          rssi_thresholds: Iterable[Mapping] = ()) -> pd.DataFrame:
+    """
+    Keep one row per (memberId, terminalId, eventTime bucket) with the bucket's earliest eventTime,
+    latest time ('lastEventTime'), maximum rssi and number of detections ('hits'). With RSSI
+    thresholds, each bucket is further split by how many of its terminal's thresholds a detection
+    exceeds. Keys are turned into integer codes and the buckets are aggregated with one groupby;
+    rows keep their index and order of first detection. Rows with a missing key are grouped among
+    themselves like any other key value.
+    :param data: Cleaned detections with memberId, terminalId, eventTime and rssi.
+    :param bucket: Bucket width as a pandas Timedelta string.
+    :param rssi_thresholds: Mappings of terminalId value to RSSI threshold (rssi > threshold passes).
+    :return: Downsampled rows.
+    """
+    missing = [c for c in ["memberId", "terminalId", "eventTime", "rssi"] if c not in data.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+    width = pd.Timedelta(bucket).value
+    if width <= 0:
+        raise ValueError(f"Bucket width must be positive: {bucket}")
+
+    times = pd.to_datetime(data["eventTime"]).to_numpy(dtype="datetime64[ns]")
+    last_times = (pd.to_datetime(data["lastEventTime"]).to_numpy(dtype="datetime64[ns]")
+                  if "lastEventTime" in data.columns else times)
+    previous_hits = data["hits"].to_numpy() if "hits" in data.columns else 1
+    band = np.zeros(len(data), dtype=np.int8)
+    for thresholds in rssi_thresholds:
+        band += (data["rssi"] > data["terminalId"].map(thresholds).astype(float)).to_numpy()
+    keys = pd.DataFrame({
+        "member": pd.factorize(data["memberId"])[0],
+        "terminal": pd.factorize(data["terminalId"])[0],
+        "bucket": times.view(np.int64) // width,  # NaT falls into one bucket of its own
+        "band": band,
+        "row": np.arange(len(data)),
+        "rssi": data["rssi"].to_numpy(),
+        "eventTime": times,
+        "lastEventTime": last_times,
+        "hits": np.broadcast_to(previous_hits, len(data)),
+    })
+    buckets = keys.groupby(["member", "terminal", "bucket", "band"], sort=False).agg(
+        row=("row", "first"), rssi=("rssi", "max"), eventTime=("eventTime", "min"),
+        lastEventTime=("lastEventTime", "max"), hits=("hits", "sum"))
+
+    result = data.iloc[buckets["row"].to_numpy()].copy()
+    result["rssi"] = buckets["rssi"].to_numpy()
+    result["eventTime"] = buckets["eventTime"].to_numpy()
+    result["lastEventTime"] = buckets["lastEventTime"].to_numpy()
+    result["hits"] = buckets["hits"].to_numpy()
+    return result
 
-        # 找出只出現在單一 terminalId 的 memberId
-        invalid_member_ids = member_terminal_counts[member_terminal_counts == 1].index
 
-        # 計算要剔除的 rows 數量
-        rows_to_remove = self.data[self.data['memberId'].isin(invalid_member_ids)].shape[0]
+def clean_rows(data: pd.DataFrame) -> Tuple[pd.DataFrame, dict]:
+    """
+    Row-local stages of BLECleaner.clean: column selection and renaming, rawData parsing and
+    eventTime normalization. Runs in worker processes in parallel mode.
+    :param data: Loaded rows (a whole dataset, one file or one chunk); not modified.
+    :return: (cleaned rows, {"raw_data_split", "event_time_formats"} counters).
+    """
+    data = data.copy(deep=False)
 
-        # 剔除無效的 memberId
-        self.data = self.data[~self.data['memberId'].isin(invalid_member_ids)]
+    # 檢查是否需要處理無 header 的情況
+    if not any(col in data.columns for col in ["POSCode", "UserId", "PLICd", "PLIEventCd", "PLIEventTimestamp", "Distance", "RawData"]):
+        # 定義欄位順序並重新命名欄位
+        data.columns = ["BeaconRecordId", "ConglomeratedId", "StoreId", "POSCode", "UserId", "PLICd", "PLIEventCd",
+                        "PLIEventTimestamp", "Distance", "RawData", "Source"]
 
-        # 計算剔除後的 memberId 總數
-        member_ids_after = self.data['memberId'].nunique()
+    # Define column name mapping (new column names -> old column names)
+    column_mapping = {
+        "POSCode": "terminalId",
+        "UserId": "memberId",
+        "PLICd": "eventSource",
+        "PLIEventCd": "eventType",
+        "PLIEventTimestamp": "eventTime",
+        "Distance": "distance",
+        "RawData": "rawData"
+    }
 
-        # 計算被剔除的 memberId 總數
-        total_removed_member_ids = member_ids_before - member_ids_after
+    # Rename columns to old names for compatibility
+    data = data.rename(columns=column_mapping)
 
-        # Log filtering results
-        print(f"Filtering invalid member_ids...")
-        print(f"Total member_ids before filtering: {member_ids_before}")
-        print(f"Total member_ids after filtering: {member_ids_after}")
-        print(f"Total removed member_ids: {total_removed_member_ids}")
-        print(f"Rows removed: {rows_to_remove}")
-        
\ No newline at end of file
+    # 欄位投影讀取時，rawData 已在讀檔階段解析為 accessAddress / rssi
+    projected = "rawData" not in data.columns and {"accessAddress", "rssi"}.issubset(data.columns)
+
+    # Retain only required columns
+    if projected:
+        required_columns = ["terminalId", "memberId", "eventType", "eventTime", "accessAddress", "rssi"]
+    else:
+        required_columns = [
+            "terminalId", "memberId", "eventSource", "eventType", "eventTime", "distance", "rawData"
+        ]
+    if not set(required_columns).issubset(data.columns):
+        raise ValueError(f"Missing required columns: {set(required_columns) - set(data.columns)}")
+
+    data = data[required_columns]
+
+    raw_data_split = None
+    if not projected:
+        # Parse 'rawData' in bulk and add 'accessAddress' and 'rssi'; irregular rows fall back to json.loads
+        raw_data_split = {"fast": 0, "slow": 0}
+        extracted = extract_json_fields(data["rawData"], {"AD3": "accessAddress", "rssi": "rssi"}, stats=raw_data_split)
+        data["accessAddress"] = extracted["accessAddress"].tolist()
+        data["rssi"] = extracted["rssi"].tolist()
+
+        # Drop the original 'rawData' column and any unused columns
+        data = data.drop(columns=["rawData", "distance", "eventSource"])
+
+    # Classify eventTime formats with string masks and parse each format in bulk
+    event_time_formats = {}
+    data["eventTime"] = normalize_event_times(data["eventTime"], stats=event_time_formats)
+    return data, {"raw_data_split": raw_data_split, "event_time_formats": event_time_formats}
+
+
+# Data shared with forked clean workers, which inherit it instead of receiving a pickled copy
+_SHARED_DATA: Optional[pd.DataFrame] = None
+
+
+def _clean_shared_partition(bounds: Tuple[int, int]) -> Tuple[pd.DataFrame, dict]:
+    start, stop = bounds
+    return clean_rows(_SHARED_DATA.iloc[start:stop])
+
+
+def _clean_partitions(data: pd.DataFrame, bounds: List[Tuple[int, int]], workers: int) -> List[Tuple[pd.DataFrame, dict]]:
+    """
+    Run clean_rows on row ranges of data in a process pool, returning the results in order.
+    Where fork is available the workers read the ranges from the parent's memory; otherwise
+    each range is sent to its worker.
+    """
+    global _SHARED_DATA
+    max_workers = min(workers, len(bounds))
+    if "fork" in multiprocessing.get_all_start_methods():
+        _SHARED_DATA = data
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork")) as executor:
+                # executor.map yields results in input order, keeping the concat deterministic
+                return list(executor.map(_clean_shared_partition, bounds))
+        finally:
+            _SHARED_DATA = None
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(clean_rows, [data.iloc[start:stop] for start, stop in bounds]))
+
+
+def merge_clean_stats(stats: List[dict]) -> dict:
+    """
+    Add up the counters returned by clean_rows for several partitions.
+    Distinct eventTime values are counted per partition, so "unique" is an upper bound.
+    """
+    def add(total, part):
+        if part is None:
+            return total
+        if total is None:
+            return part
+        return {key: add(total.get(key), value) if isinstance(value, dict) else total.get(key, 0) + value
+                for key, value in part.items()}
+
+    merged = {"raw_data_split": None, "event_time_formats": None}
+    for part in stats:
+        merged = {key: add(merged[key], part[key]) for key in merged}
+    return merged
@@ -1,12 +1,25 @@
 import os
 import pandas as pd
+from typing import Optional
 from ..base_cleaner import BaseCleaner
+from ..diagnostics import Diagnostics
+from ..schema import TRANSACTION_SCHEMA
+from ..profiling import ProfileAccumulator
+from ..projection import TRANSACTION_PROJECTION
+from ..timestamps import TRANSACTION_TIME_CLASSES, compose_hhmm_timestamps, format_event_time_stats, unique_ratio
 
 class TransactionCleaner(BaseCleaner):
     """
     Cleaner for transaction data.
     """
 
+    schema = TRANSACTION_SCHEMA
+    projection = TRANSACTION_PROJECTION
+
+    def __init__(self, file_path: str = None, directory: str = None, diagnostics: Optional[Diagnostics] = None):
+        super().__init__(file_path=file_path, directory=directory, diagnostics=diagnostics)
+        self.transaction_time_formats: Optional[dict] = None  # Rows and invalid values per transTime format of the last clean
+
     def clean(self) -> pd.DataFrame:
         """
         Clean the intermediate transaction data:
@@ -37,23 +50,29 @@ class TransactionCleaner(BaseCleaner):
 
         self.data = self.data[required_columns]
        
-         # Combine 'eventDate' and 'eventTime' into a single 'timestamp' column
-        self.data["eventTime"] = pd.to_datetime(
-            self.data["transDate"].astype(str) + " " + self.data["transTime"].astype(str),
-            format="%Y-%m-%d %H%M",
-            errors="coerce"
+        # Combine 'transDate' and 'transTime' into 'eventTime': numeric HHMM times are added to the parsed
+        # dates as timedeltas, other values are joined and parsed once per distinct pair
+        self.transaction_time_formats = {}
+        self.data["eventTime"] = compose_hhmm_timestamps(
+            self.data["transDate"], self.data["transTime"], date_format="%Y-%m-%d", stats=self.transaction_time_formats
         )
+        self.timestamp_unique_ratio = unique_ratio(self.transaction_time_formats)
+        self.diagnostics.info(f"交易時間格式: {format_event_time_stats(self.transaction_time_formats, TRANSACTION_TIME_CLASSES)}")
+        self.diagnostics.info(f"交易時間唯一值: {self.transaction_time_formats['unique']} / {self.transaction_time_formats['total']} 筆")
 
         # Drop original 'eventDate' and 'eventTime' columns
         self.data.drop(columns=["transDate", "transTime"], inplace=True)
 
-        # Log invalid rows with missing timestamps
-        invalid_rows = self.data[self.data["eventTime"].isna()]
-        if not invalid_rows.empty:
-            print("Warning: The following rows have invalid 'timestamp' values and were set to NaT:")
-            print(invalid_rows)
+        # Record invalid rows with missing timestamps: counted and sampled, not printed
+        invalid = self.data["eventTime"].isna()
+        if invalid.any():
+            self.diagnostics.record_rows("invalid_timestamp", self.data[invalid],
+                                         "Rows with invalid 'timestamp' values were set to NaT")
+
+        # Stable integer codes for memberId/terminalId, if a persistent dictionary is enabled
+        self.encode_ids()
 
-        print("Cleaning process completed successfully.")
+        self.diagnostics.info("Cleaning process completed successfully.")
         return self.data
 
     def validate(self) -> bool:
@@ -64,27 +83,14 @@ class TransactionCleaner(BaseCleaner):
         required_columns = ["tenantName", "terminalId", "eventTime"]
         return all(column in self.data.columns for column in required_columns)
 
-    def profile(self) -> dict:
+    @classmethod
+    def profile_accumulator(cls) -> ProfileAccumulator:
         """
-        Provide a profile of the transaction data, including key statistics.
-        :return: A dictionary containing data profiling information.
+        Profile of total rows, distinct terminals, the last and first transactions and null counts.
         """
-        if self.data is None:
-            raise ValueError("No data loaded. Call 'load_data()' first.")
-
-        total_rows = len(self.data)
-        unique_users = self.data["user_id"].nunique()
-        max_amount_row = self.data.loc[self.data["amount"].idxmax()].to_dict()
-        min_amount_row = self.data.loc[self.data["amount"].idxmin()].to_dict()
-
-        profile = {
-            "total_rows": total_rows,
-            "unique_users": unique_users,
-            "max_amount_row": max_amount_row,
-            "min_amount_row": min_amount_row
-        }
-
-        return profile
+        return ProfileAccumulator(distinct_column="terminalId", value_column="eventTime",
+                                  labels={"distinct": "unique_terminals", "max_row": "last_transaction_row",
+                                          "min_row": "first_transaction_row"})
 
     def filter_invalid_transactions(self) -> None:
         """
@@ -101,4 +107,4 @@ class TransactionCleaner(BaseCleaner):
         after_count = len(self.data)
         removed_count = before_count - after_count
 
-        print(f"Filtered invalid transactions. Rows before: {before_count}, after: {after_count}, removed: {removed_count}")
+        self.diagnostics.info(f"Filtered invalid transactions. Rows before: {before_count}, after: {after_count}, removed: {removed_count}")
@@ -0,0 +1,116 @@
+import os
+import pandas as pd
+from collections import Counter, deque
+from typing import Dict, List, Optional, Tuple
+
+# Log levels, from most to least verbose
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+
+class Diagnostics:
+    """
+    Bounded sink for cleaner diagnostics.
+    Messages are kept in a ring buffer and printed when at or above the configured level.
+    Bad rows are counted per kind; only a capped sample is kept in memory, and all of them
+    can be appended to one CSV file per kind in a spill directory.
+    """
+
+    def __init__(self, level: str = "info", max_samples: int = 20, max_messages: int = 1000,
+                 spill_dir: Optional[str] = None, echo: bool = True):
+        """
+        :param level: Minimum level printed, "debug", "info", "warning" or "error".
+        :param max_samples: Bad rows kept in memory per kind.
+        :param max_messages: Messages kept in memory, oldest dropped first.
+        :param spill_dir: Directory where all bad rows are appended as '{kind}.csv' (optional).
+        :param echo: Print messages at or above the level (False only records them).
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unsupported log level: {level}. Use one of {list(LEVELS)}.")
+        self.level = level
+        self.max_samples = max_samples
+        self.spill_dir = spill_dir
+        self.echo = echo
+        self.messages: deque = deque(maxlen=max_messages)  # (level, message)
+        self.counters: Counter = Counter()
+        self.samples: Dict[str, pd.DataFrame] = {}
+
+    def enabled(self, level: str) -> bool:
+        """
+        Check whether messages of a level are printed; use it to skip formatting costly messages.
+        """
+        return LEVELS[level] >= LEVELS[self.level]
+
+    def log(self, level: str, message: str) -> None:
+        if level not in LEVELS:
+            raise ValueError(f"Unsupported log level: {level}. Use one of {list(LEVELS)}.")
+        self.counters[f"messages.{level}"] += 1
+        if not self.enabled(level):
+            return
+        self.messages.append((level, message))
+        if self.echo:
+            print(message if LEVELS[level] < LEVELS["warning"] else f"{level.capitalize()}: {message}")
+
+    def debug(self, message: str) -> None:
+        self.log("debug", message)
+
+    def info(self, message: str) -> None:
+        self.log("info", message)
+
+    def warning(self, message: str) -> None:
+        self.log("warning", message)
+
+    def error(self, message: str) -> None:
+        self.log("error", message)
+
+    def count(self, key: str, n: int = 1) -> None:
+        """
+        Add to a named counter.
+        """
+        self.counters[key] += n
+
+    def record_rows(self, kind: str, rows: pd.DataFrame, message: str, level: str = "warning") -> None:
+        """
+        Record bad rows: count them, keep the first max_samples in memory, spill all of them if a
+        spill directory is set, and log a one-line summary instead of the rows themselves.
+        :param kind: Name of the problem, e.g. "invalid_eventTime".
+        :param rows: The bad rows.
+        :param message: Description of the problem.
+        :param level: Level of the summary message.
+        """
+        if rows.empty:
+            return
+        self.counters[kind] += len(rows)
+
+        kept = self.samples.get(kind)
+        room = self.max_samples - (len(kept) if kept is not None else 0)
+        if room > 0:
+            sample = rows.head(room)
+            self.samples[kind] = sample if kept is None else pd.concat([kept, sample])
+
+        spilled = ""
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            path = os.path.join(self.spill_dir, f"{kind}.csv")
+            rows.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+            spilled = f", written to {path}"
+        self.log(level, f"{message}: {len(rows)} rows ({self.counters[kind]} in total{spilled})")
+
+    def summary(self) -> dict:
+        """
+        Return the counters and the number of sampled rows per kind.
+        """
+        return {
+            "counters": dict(self.counters),
+            "samples": {kind: len(rows) for kind, rows in self.samples.items()},
+        }
+
+    def recent(self, level: str = "debug") -> List[Tuple[str, str]]:
+        """
+        Return the buffered messages at or above a level, oldest first.
+        """
+        return [(lvl, message) for lvl, message in self.messages if LEVELS[lvl] >= LEVELS[level]]
+
+    def reset(self) -> None:
+        self.messages.clear()
+        self.counters.clear()
+        self.samples.clear()
@@ -0,0 +1,206 @@
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to an exclusive lock file
+    fcntl = None
+
+# ID columns encoded by default
+ID_COLUMNS = ("memberId", "terminalId")
+
+# Largest code an int32 column can hold
+MAX_CODE = np.iinfo(np.int32).max
+
+
+class IdDictionary:
+    """
+    Persistent dictionary assigning stable int32 codes to memberIds and terminalIds across days.
+    Each kind of ID is an append-only file with one JSON-encoded ID per line, and an ID's code is
+    its line number, so codes never change once assigned. New IDs are appended under an exclusive
+    file lock after re-reading the lines other processes appended, so several processes can grow
+    the dictionary while ingesting different days. IDs are looked up by their string form (see
+    id_key), so the same numeric ID read as 123 on one day and 123.0 on another gets one code, and
+    numeric IDs are stored as JSON integers, so decode gives back 123 rather than "123".
+    """
+
+    def __init__(self, path: str):
+        """
+        Open the dictionary directory, creating it if needed. Files are read lazily per kind.
+        :param path: Dictionary directory.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self._values: Dict[str, list] = {}
+        self._offsets: Dict[str, int] = {}  # Bytes of each file already read
+
+    def _file(self, kind: str) -> str:
+        return os.path.join(self.path, f"{kind}.ids")
+
+    def _refresh(self, kind: str) -> None:
+        """
+        Read the IDs appended to a kind's file since the last read.
+        """
+        codes = self._codes.setdefault(kind, {})
+        values = self._values.setdefault(kind, [])
+        path = self._file(kind)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            f.seek(self._offsets.get(kind, 0))
+            block = f.read()
+        # Only complete lines; a line being written by another process is read next time
+        end = block.rfind(b"\n") + 1
+        for line in block[:end].splitlines():
+            value = json.loads(line)
+            codes[id_key(value)] = len(values)
+            values.append(value)
+        self._offsets[kind] = self._offsets.get(kind, 0) + end
+
+    def encode(self, kind: str, values: pd.Series) -> np.ndarray:
+        """
+        Encode IDs as int32 codes, adding unseen IDs to the dictionary.
+        Each distinct value is looked up once. Missing values get code -1; encode_frame stores them as <NA>.
+        :param kind: ID kind, e.g. "memberId".
+        :param values: Series of IDs.
+        :return: int32 array of codes aligned with values.
+        """
+        value_codes, uniques = pd.factorize(values)
+        uniques = np.asarray(uniques, dtype=object)
+        keys = [id_key(v) for v in uniques]
+        with self._lock:
+            self._refresh(kind)
+            codes = self._codes[kind]
+            if any(key not in codes for key in keys):
+                self._append(kind, uniques)
+            unique_codes = np.array([codes[key] for key in keys], dtype=np.int32)
+        return np.append(unique_codes, np.int32(-1))[value_codes]
+
+    def _append(self, kind: str, ids: Iterable) -> None:
+        """
+        Append the IDs missing from the file under an exclusive lock.
+        """
+        with _FileLock(self._file(kind) + ".lock"):
+            # Other processes may have added some of these IDs since the last read
+            self._refresh(kind)
+            codes, values = self._codes[kind], self._values[kind]
+            new = list({id_key(v): id_value(v) for v in ids if id_key(v) not in codes}.values())
+            if len(values) + len(new) - 1 > MAX_CODE:
+                raise ValueError(f"Too many {kind} values for int32 codes.")
+            lines = "".join(json.dumps(value, ensure_ascii=False) + "\n" for value in new).encode("utf-8")
+            with open(self._file(kind), "ab") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            # Codes are line numbers, so read the new lines back instead of numbering them here
+            self._refresh(kind)
+
+    def decode(self, kind: str, codes) -> np.ndarray:
+        """
+        Reverse lookup of codes to IDs. Numeric IDs come back as int, others as str; code -1 and
+        missing codes give None.
+        :param kind: ID kind, e.g. "memberId".
+        :param codes: Array-like of codes, e.g. an encoded Int32 column.
+        :return: Object array of IDs.
+        """
+        codes = pd.array(np.asarray(codes, dtype=object), dtype="Int64").fillna(-1).to_numpy(dtype=np.int64)
+        with self._lock:
+            if len(codes) and codes.max(initial=-1) >= len(self._values.get(kind, [])):
+                self._refresh(kind)
+            values = np.array(self._values.get(kind, []) + [None], dtype=object)
+        if len(codes) and codes.max() >= len(values) - 1:
+            raise ValueError(f"Unknown {kind} code: {codes.max()}")
+        return values[codes]
+
+    def lookup(self, kind: str, value) -> Optional[int]:
+        """
+        Return the code of an ID without adding it, or None if it was never encoded.
+        """
+        with self._lock:
+            self._refresh(kind)
+            return self._codes[kind].get(id_key(value))
+
+    def size(self, kind: str) -> int:
+        with self._lock:
+            self._refresh(kind)
+            return len(self._values[kind])
+
+    def encode_frame(self, data: pd.DataFrame, columns: Iterable[str] = ID_COLUMNS) -> pd.DataFrame:
+        """
+        Replace the ID columns present in a DataFrame by their codes, as nullable Int32 columns.
+        Missing IDs stay missing (<NA>), so groupby, nunique and unique still leave them out.
+        :param data: DataFrame to encode (modified in place and returned).
+        :param columns: ID columns to encode; each column is its own kind.
+        :return: The encoded DataFrame.
+        """
+        for column in columns:
+            if column in data.columns:
+                codes = self.encode(column, data[column])
+                data[column] = pd.arrays.IntegerArray(codes, codes < 0)
+        return data
+
+
+def id_value(value):
+    """
+    Form an ID is stored in: whole numbers as int (so JSON keeps them numeric), other strings unchanged
+    and anything else as its string form.
+    """
+    key = id_key(value)
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool) and key.lstrip("-").isdigit():
+        return int(key)
+    return value if isinstance(value, str) else key
+
+
+def id_key(value) -> str:
+    """
+    String form of an ID used as dictionary key. Whole-number floats are written as integers,
+    since numeric IDs are read as floats on days where the column has missing values.
+    """
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    if isinstance(value, np.integer):
+        return str(int(value))
+    return str(value)
+
+
+class _FileLock:
+    """
+    Exclusive inter-process lock on a file, held for the duration of a with block.
+    """
+
+    def __init__(self, path: str, timeout: float = 60.0):
+        self.path = path
+        self.timeout = timeout
+        self._fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self.path, os.O_CREAT | os.O_RDWR)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            return self
+
+        import time
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+                return self
+            except FileExistsError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not lock {self.path} within {self.timeout} seconds.")
+                time.sleep(0.01)
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        else:
+            os.close(self._fd)
+            os.remove(self.path)
+        return False
@@ -1,6 +1,54 @@
 import os
+import io
+import bz2
+import gzip
+import json
+import lzma
+import time
+import hashlib
 import pandas as pd
-from typing import List, Union, Callable
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Union, Callable, Optional, Dict, Tuple, Iterator
+from src.data_processing.predicates import RowPredicate, apply_predicates
+from src.data_processing.catalog import PartitionCatalog
+from src.data_processing.diagnostics import Diagnostics
+from src.data_processing.projection import ColumnProjection
+from src.data_processing.schema import apply_schema, concat_frames, memory_report
+
+# Compressed CSV exports, decompressed as a stream while parsing
+COMPRESSED_CSV_OPENERS = {
+    ".csv.gz": gzip.open,
+    ".csv.xz": lzma.open,
+    ".csv.bz2": bz2.open,
+}
+
+# Rows per chunk when streaming .xlsx workbooks without an explicit chunksize
+EXCEL_CHUNKSIZE = 50_000
+
+
+class _CountingReader(io.RawIOBase):
+    """
+    Binary stream wrapper that counts the bytes read, used to measure decompressed throughput.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.raw.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self.bytes_read += size
+        return size
+
+    def close(self) -> None:
+        self.raw.close()
+        super().close()
 
 class DataManager:
     """
@@ -8,72 +56,433 @@ class DataManager:
     Supports directory-based loading, filtering by naming rules, and custom conditions.
     """
 
-    def __init__(self, directory: str = None, file_path: str = None):
+    def __init__(self, directory: str = None, file_path: str = None, schema: Optional[Dict[str, str]] = None,
+                 sidecar_dir: Optional[str] = None, diagnostics: Optional[Diagnostics] = None,
+                 catalog_path: Optional[str] = None):
         """
         Initialize the DataManager.
         :param directory: Path to the folder containing files.
         :param file_path: Path to a single file.
+        :param schema: Declared column dtypes applied to each file or chunk as it is read (optional).
+        :param sidecar_dir: Folder for Parquet copies of Excel workbooks, reused by later runs (optional).
+        :param diagnostics: Sink for loading messages (optional, prints at info level by default).
+        :param catalog_path: Where the partition catalog index is kept, e.g. outside a read-only data
+                             directory (default: '_catalog.json' inside the directory).
         """
-        print(f"Directory: {directory}")
-        print(f"File Path: {file_path}")
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        self.diagnostics.debug(f"Directory: {directory}")
+        self.diagnostics.debug(f"File Path: {file_path}")
         self.directory = directory
         self.file_path = file_path
+        self.schema = schema
+        self.sidecar_dir = sidecar_dir
+        self.catalog_path = catalog_path
+        self.load_timings: Dict[str, float] = {}  # Map file path -> load time in seconds
+        self.memory_usage: Dict[str, List[int]] = {}  # Map column -> [bytes before, bytes after] schema conversion
+        self.throughput: Dict[str, dict] = {}  # Map CSV file path -> codec, bytes on disk/decompressed, MB/s
+        self.file_lengths: List[int] = []  # Rows contributed by each file to the last combined DataFrame, in order
 
-    def load_files(self, pattern: str = None, filter_func: Callable[[str], bool] = None, sheet_name_column: str = None) -> pd.DataFrame:
+    def load_files(self, pattern: str = None, filter_func: Callable[[str], bool] = None, sheet_name_column: str = None,
+                   workers: int = 1, pool: str = "thread", chunksize: Optional[int] = None,
+                   predicates: Optional[List[RowPredicate]] = None, date_range: Optional[Tuple[str, str]] = None,
+                   terminal_ids: Optional[List[str]] = None, store_ids: Optional[List[str]] = None,
+                   projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
         """
         Load data from a directory or a single file.
         :param pattern: Regex pattern to match filenames (optional).
         :param filter_func: Custom filter function for filenames (optional).
+        :param workers: Number of parallel workers used in directory mode (1 loads files sequentially).
+        :param pool: Pool type for parallel loading, "thread" or "process".
+        :param chunksize: Read CSV files in chunks of this many rows (optional, streaming mode).
+        :param predicates: Row predicates applied to each chunk (or whole file) before combining (optional).
+        :param date_range: Inclusive (start, end) dates; files are looked up in the partition catalog (optional).
+        :param terminal_ids: Only load files that contain these terminals, per the partition catalog (optional).
+        :param store_ids: Only load files that contain these stores, per the partition catalog (optional).
+        :param projection: Only read the columns (and JSON fields) a pipeline needs (optional).
         :return: Combined pandas DataFrame.
         """
         if self.file_path:  # Single file mode
-            return self._load_file(self.file_path, sheet_name_column=sheet_name_column)
+            return self._combine_files([self.file_path], sheet_name_column=sheet_name_column,
+                                       chunksize=chunksize, predicates=predicates, projection=projection)
         
         if self.directory:  # Directory mode
-            all_files = [os.path.join(self.directory, f) for f in os.listdir(self.directory)]
+            all_files = self.resolve_files(pattern=pattern, filter_func=filter_func, date_range=date_range,
+                                           terminal_ids=terminal_ids, store_ids=store_ids)
+            # Load and combine files
+            return self._combine_files(all_files, sheet_name_column=sheet_name_column, workers=workers, pool=pool,
+                                       chunksize=chunksize, predicates=predicates, projection=projection)
+
+        raise ValueError("Either 'directory' or 'file_path' must be specified.")
+
+    def load_paths(self, file_paths: List[str], sheet_name_column: str = None, workers: int = 1,
+                   pool: str = "thread", chunksize: Optional[int] = None,
+                   predicates: Optional[List[RowPredicate]] = None,
+                   projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
+        """
+        Load an explicit list of files, e.g. the new files found by an incremental ingest.
+        Accepts the same loading options as load_files.
+        :param file_paths: List of file paths to load.
+        :return: Combined pandas DataFrame.
+        """
+        return self._combine_files(file_paths, sheet_name_column=sheet_name_column, workers=workers, pool=pool,
+                                   chunksize=chunksize, predicates=predicates, projection=projection)
+
+    def resolve_files(self, pattern: str = None, filter_func: Callable[[str], bool] = None,
+                      date_range: Optional[Tuple[str, str]] = None, terminal_ids: Optional[List[str]] = None,
+                      store_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Resolve the list of files that load_files would read, without loading them.
+        When any partition filter is given, files come from the shared partition catalog
+        instead of a directory listing.
+        :param pattern: Regex pattern to match filenames (optional).
+        :param filter_func: Custom filter function for filenames (optional).
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+        :param terminal_ids: Keep files containing any of these terminals (optional).
+        :param store_ids: Keep files containing any of these stores (optional).
+        :return: Sorted list of file paths.
+        """
+        if self.file_path:
+            return [self.file_path]
+
+        if self.directory:
+            if date_range or terminal_ids is not None or store_ids is not None:
+                catalog = PartitionCatalog.for_directory(self.directory, index_path=self.catalog_path,
+                                                         diagnostics=self.diagnostics)
+                all_files = catalog.files(date_range=date_range, terminal_ids=terminal_ids, store_ids=store_ids)
+            else:
+                all_files = [os.path.join(self.directory, f) for f in sorted(os.listdir(self.directory))
+                             if f != PartitionCatalog.INDEX_FILE_NAME]
             # Apply filtering if provided
             if pattern:
                 import re
                 all_files = [f for f in all_files if re.search(pattern, f)]
             if filter_func:
                 all_files = [f for f in all_files if filter_func(f)]
-            # Load and combine files
-            return self._combine_files(all_files, sheet_name_column=sheet_name_column)
+            return all_files
 
         raise ValueError("Either 'directory' or 'file_path' must be specified.")
 
-    def _load_file(self, file_path: str, sheet_name_column: str = None) -> pd.DataFrame:
+    def _load_file(self, file_path: str, sheet_name_column: str = None, chunksize: Optional[int] = None,
+                   predicates: Optional[List[RowPredicate]] = None,
+                   memory: Optional[Dict[str, List[int]]] = None,
+                   throughput: Optional[dict] = None,
+                   projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
         """
         Load a single file into a pandas DataFrame.
-        Supports .xlsx, .xls, and .csv files.
+        Supports .xlsx, .xls, .csv and compressed .csv.gz, .csv.xz and .csv.bz2 files.
+        Row predicates and the schema are applied per chunk when chunksize is set, otherwise to the whole file.
+        With chunksize, .xlsx workbooks are streamed row by row instead of being loaded whole; with a
+        sidecar_dir, each workbook is converted to Parquet once and later loads read the Parquet copy.
+        :param memory: Optional dictionary that accumulates per-column memory before/after the schema.
+        :param throughput: Optional dictionary that receives the CSV read throughput figures.
+        :param projection: Only read the projected columns and JSON fields (optional).
         """
         if file_path.endswith(('.xlsx', '.xls')):
-            return self._load_and_merge_sheets(file_path, sheet_name_column=sheet_name_column)  # Handle multi-sheet logic
-        elif file_path.endswith('.csv'):
-            print(f"Loading CSV file: {file_path}")
-            return pd.read_csv(file_path)
+            if self.sidecar_dir:
+                df = self._load_excel_sidecar(file_path, sheet_name_column=sheet_name_column, projection=projection)
+                return self._prepare(df, predicates, memory, projection)
+            if chunksize and file_path.endswith('.xlsx'):
+                self.diagnostics.debug(f"Streaming Excel file: {file_path} (chunksize={chunksize})")
+                chunks = [self._prepare(chunk, predicates, memory, projection)
+                          for chunk in self._stream_excel(file_path, sheet_name_column=sheet_name_column,
+                                                          chunksize=chunksize, projection=projection)]
+                return concat_frames(chunks) if chunks else pd.DataFrame()
+            df = self._load_and_merge_sheets(file_path, sheet_name_column=sheet_name_column,  # Handle multi-sheet logic
+                                             usecols=projection.keep_column if projection else None)
+            return self._prepare(df, predicates, memory, projection)
+        elif file_path.endswith('.csv') or self._compression_suffix(file_path):
+            read_options = projection.read_options(self._csv_header(file_path)) if projection else {}
+            start = time.perf_counter()
+            with self._open_csv(file_path) as source:
+                if chunksize:
+                    df = self._load_csv_chunked(source, chunksize=chunksize, predicates=predicates, memory=memory,
+                                                name=file_path, read_options=read_options, projection=projection)
+                else:
+                    self.diagnostics.debug(f"Loading CSV file: {file_path}")
+                    df = self._prepare(pd.read_csv(source, **read_options), predicates, memory, projection)
+                decompressed = source.bytes_read if isinstance(source, _CountingReader) else os.path.getsize(file_path)
+
+            if throughput is not None:
+                seconds = time.perf_counter() - start
+                throughput.update({
+                    "codec": (self._compression_suffix(file_path) or ".csv").split(".")[-1],
+                    "file_mb": os.path.getsize(file_path) / 1024 ** 2,
+                    "decompressed_mb": decompressed / 1024 ** 2,
+                    "seconds": seconds,
+                    "mb_per_s": decompressed / 1024 ** 2 / seconds if seconds > 0 else 0.0,
+                })
+            return df
         else:
             raise ValueError(f"Unsupported file format: {file_path}")
 
-    def _combine_files(self, file_paths: List[str], sheet_name_column: str = None) -> pd.DataFrame:
+    def iter_file_chunks(self, file_path: str, chunksize: int, sheet_name_column: str = None,
+                         predicates: Optional[List[RowPredicate]] = None,
+                         projection: Optional[ColumnProjection] = None) -> Iterator[pd.DataFrame]:
+        """
+        Yield the filtered, projected and typed rows of one file in chunks, without combining them.
+        CSV files (compressed or not) and .xlsx workbooks are streamed; .xls workbooks and Excel
+        sidecars are read whole and yielded as a single chunk.
+        :param file_path: Path to the file.
+        :param chunksize: Number of rows per chunk.
+        :param predicates: Row predicates applied to each chunk (optional).
+        :param projection: Only read the projected columns and JSON fields (optional).
+        :return: Iterator of DataFrame chunks, in file order.
+        """
+        if file_path.endswith('.csv') or self._compression_suffix(file_path):
+            read_options = projection.read_options(self._csv_header(file_path)) if projection else {}
+            with self._open_csv(file_path) as source:
+                with pd.read_csv(source, chunksize=chunksize, **read_options) as reader:
+                    for chunk in reader:
+                        yield self._prepare(chunk, predicates, projection=projection)
+        elif file_path.endswith('.xlsx') and not self.sidecar_dir:
+            for chunk in self._stream_excel(file_path, sheet_name_column=sheet_name_column,
+                                            chunksize=chunksize, projection=projection):
+                yield self._prepare(chunk, predicates, projection=projection)
+        else:
+            yield self._load_file(file_path, sheet_name_column=sheet_name_column, predicates=predicates,
+                                  projection=projection)
+
+    @staticmethod
+    def _compression_suffix(file_path: str) -> Optional[str]:
+        """
+        Return the compressed CSV suffix of a file name (e.g. '.csv.gz'), or None.
+        """
+        return next((suffix for suffix in COMPRESSED_CSV_OPENERS if file_path.endswith(suffix)), None)
+
+    def _open_csv(self, file_path: str):
+        """
+        Open a CSV file for reading. Compressed files are decompressed as a stream,
+        without writing a decompressed copy to disk.
+        """
+        suffix = self._compression_suffix(file_path)
+        if suffix is None:
+            return open(file_path, "rb")
+        return _CountingReader(COMPRESSED_CSV_OPENERS[suffix](file_path, "rb"))
+
+    def _csv_header(self, file_path: str) -> List:
+        """
+        Parse only the first row of a CSV file (the header, if it has one).
+        """
+        with self._open_csv(file_path) as source:
+            return list(pd.read_csv(source, nrows=0).columns)
+
+    def _prepare(self, df: pd.DataFrame, predicates: Optional[List[RowPredicate]] = None,
+                 memory: Optional[Dict[str, List[int]]] = None,
+                 projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
+        """
+        Extract projected JSON fields from a freshly parsed frame, filter it and convert it to the declared schema.
+        Predicates run after the projection, so they can use the extracted fields (e.g. accessAddress).
+        """
+        if projection:
+            df = projection.apply(df)
+        df = apply_predicates(df, predicates)
+        if self.schema:
+            df, stats = apply_schema(df, self.schema)
+            if memory is not None:
+                for column, (before, after) in stats.items():
+                    totals = memory.setdefault(column, [0, 0])
+                    totals[0] += before
+                    totals[1] += after
+        return df
+
+    def _load_csv_chunked(self, source, chunksize: int,
+                          predicates: Optional[List[RowPredicate]] = None,
+                          memory: Optional[Dict[str, List[int]]] = None, name: Optional[str] = None,
+                          read_options: Optional[dict] = None,
+                          projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
+        """
+        Stream a CSV file in bounded chunks, filtering each chunk before it is kept.
+        Peak memory scales with the filtered output plus one chunk, not with the raw file.
+        :param source: Path to the CSV file or an open binary stream.
+        :param chunksize: Number of rows per chunk.
+        :param predicates: Row predicates applied to each chunk (optional).
+        :param name: File name used in log messages (defaults to source).
+        :param read_options: Extra read_csv keyword arguments, e.g. usecols (optional).
+        :param projection: Column projection whose JSON fields are extracted per chunk (optional).
+        :return: Filtered DataFrame.
+        """
+        name = name or source
+        self.diagnostics.debug(f"Streaming CSV file: {name} (chunksize={chunksize})")
+        rows_read = 0
+        kept_chunks = []
+        with pd.read_csv(source, chunksize=chunksize, **(read_options or {})) as reader:
+            for chunk in reader:
+                rows_read += len(chunk)
+                kept_chunks.append(self._prepare(chunk, predicates, memory, projection))
+
+        data = concat_frames(kept_chunks)
+        self.diagnostics.debug(f"Kept {len(data)} of {rows_read} rows from {name}")
+        return data
+
+    def _timed_load_file(self, file_path: str, sheet_name_column: str = None, chunksize: Optional[int] = None,
+                         predicates: Optional[List[RowPredicate]] = None,
+                         projection: Optional[ColumnProjection] = None) -> tuple:
+        """
+        Load a single file and measure how long it took.
+        :return: Tuple of (DataFrame, elapsed seconds, per-column memory before/after the schema,
+                 CSV throughput figures).
+        """
+        start = time.perf_counter()
+        memory: Dict[str, List[int]] = {}
+        throughput: dict = {}
+        df = self._load_file(file_path, sheet_name_column=sheet_name_column, chunksize=chunksize,
+                             predicates=predicates, memory=memory, throughput=throughput, projection=projection)
+        return df, time.perf_counter() - start, memory, throughput
+
+    def _combine_files(self, file_paths: List[str], sheet_name_column: str = None,
+                       workers: int = 1, pool: str = "thread", chunksize: Optional[int] = None,
+                       predicates: Optional[List[RowPredicate]] = None,
+                       projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
         """
         Combine multiple files into a single pandas DataFrame.
+        Files are concatenated in the order of file_paths, regardless of which worker finishes first.
         :param file_paths: List of file paths to load.
+        :param workers: Number of parallel workers (1 loads files sequentially).
+        :param pool: Pool type for parallel loading, "thread" or "process".
+        :param chunksize: Read CSV files in chunks of this many rows (optional).
+        :param predicates: Row predicates applied before combining (optional).
+        :param projection: Only read the projected columns and JSON fields (optional).
         :return: Combined DataFrame.
         """
-        dataframes = [self._load_file(file, sheet_name_column=sheet_name_column) for file in file_paths]
-        return pd.concat(dataframes, ignore_index=True)
+        if pool not in ("thread", "process"):
+            raise ValueError(f"Unsupported pool type: {pool}. Use 'thread' or 'process'.")
+
+        load = partial(self._timed_load_file, sheet_name_column=sheet_name_column,
+                       chunksize=chunksize, predicates=predicates, projection=projection)
+        if workers > 1 and len(file_paths) > 1:
+            executor_class = ThreadPoolExecutor if pool == "thread" else ProcessPoolExecutor
+            with executor_class(max_workers=min(workers, len(file_paths))) as executor:
+                # executor.map yields results in input order, keeping the concat deterministic
+                results = list(executor.map(load, file_paths))
+        else:
+            results = [load(file) for file in file_paths]
+
+        self.load_timings = {}
+        self.memory_usage = {}
+        self.throughput = {}
+        dataframes = []
+        for file, (df, elapsed, memory, throughput) in zip(file_paths, results):
+            self.load_timings[file] = elapsed
+            self.diagnostics.info(f"Loaded {file} in {elapsed:.2f}s ({len(df)} rows)")
+            if throughput:
+                self.throughput[file] = throughput
+                self.diagnostics.debug(f"  {throughput['codec']}: {throughput['file_mb']:.2f} MB on disk, "
+                                       f"{throughput['decompressed_mb']:.2f} MB decompressed and parsed at {throughput['mb_per_s']:.1f} MB/s")
+            for column, (before, after) in memory.items():
+                totals = self.memory_usage.setdefault(column, [0, 0])
+                totals[0] += before
+                totals[1] += after
+            dataframes.append(df)
+        self.file_lengths = [len(df) for df in dataframes]
+
+        if self.memory_usage and self.diagnostics.enabled("debug"):
+            report = memory_report(self.memory_usage).to_string(index=False, float_format="%.2f")
+            self.diagnostics.debug(f"Memory per column before/after schema (MB):\n{report}")
+        return concat_frames(dataframes)
+
+    def _stream_excel(self, file_path: str, sheet_name_column: str = None, chunksize: Optional[int] = None,
+                      projection: Optional[ColumnProjection] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream an .xlsx workbook one sheet at a time with openpyxl's read-only mode.
+        Only the projected columns of each row are kept, and rows are emitted in DataFrame chunks,
+        so peak memory scales with one chunk instead of the whole workbook.
+        :param file_path: Path to the .xlsx file.
+        :param sheet_name_column: Name of the column to store sheet names. If None, no column is added.
+        :param chunksize: Number of rows per chunk (default EXCEL_CHUNKSIZE).
+        :param projection: Only keep the projected columns (optional).
+        :return: Iterator of DataFrame chunks, in sheet and row order.
+        """
+        from openpyxl import load_workbook
+
+        chunksize = chunksize or EXCEL_CHUNKSIZE
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet in workbook.worksheets:
+                rows = sheet.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    continue
+                columns = [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+                keep = [i for i, name in enumerate(columns) if projection is None or projection.keep_column(name)]
+                names = [columns[i] for i in keep]
+
+                batch, emitted = [], False
+                for row in rows:
+                    if all(value is None for value in row):
+                        continue
+                    batch.append([row[i] if i < len(row) else None for i in keep])
+                    if len(batch) >= chunksize:
+                        yield self._sheet_chunk(batch, names, sheet.title, sheet_name_column)
+                        batch, emitted = [], True
+                if batch or not emitted:
+                    yield self._sheet_chunk(batch, names, sheet.title, sheet_name_column)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _sheet_chunk(rows: List[list], columns: List[str], sheet_name: str,
+                     sheet_name_column: Optional[str]) -> pd.DataFrame:
+        """
+        Build a DataFrame chunk from rows of cell values, letting pandas infer each column's type.
+        """
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        if sheet_name_column:
+            df[sheet_name_column] = sheet_name
+        return df
+
+    def _load_excel_sidecar(self, file_path: str, sheet_name_column: str = None,
+                            projection: Optional[ColumnProjection] = None) -> pd.DataFrame:
+        """
+        Load an Excel workbook through its columnar sidecar file, converting the workbook on first use.
+        The sidecar name includes the workbook's size and mtime and the projected columns,
+        so a changed workbook or pipeline is converted again.
+        :param file_path: Path to the Excel file.
+        :param sheet_name_column: Name of the column to store sheet names. If None, no column is added.
+        :param projection: Only keep the projected columns (optional).
+        :return: DataFrame with the rows of all sheets.
+        """
+        stat = os.stat(file_path)
+        key = json.dumps([os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, sheet_name_column,
+                          projection.columns if projection else None], ensure_ascii=False)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        sidecar_path = os.path.join(self.sidecar_dir, f"{os.path.basename(file_path)}.{digest}.parquet")
+
+        if os.path.exists(sidecar_path):
+            self.diagnostics.debug(f"Loading Excel sidecar: {sidecar_path}")
+            return pd.read_parquet(sidecar_path)
+
+        if file_path.endswith('.xlsx'):
+            chunks = list(self._stream_excel(file_path, sheet_name_column=sheet_name_column, projection=projection))
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        else:
+            df = self._load_and_merge_sheets(file_path, sheet_name_column=sheet_name_column,
+                                             usecols=projection.keep_column if projection else None)
+
+        os.makedirs(self.sidecar_dir, exist_ok=True)
+        tmp_path = f"{sidecar_path}.tmp{os.getpid()}"
+        try:
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, sidecar_path)
+            self.diagnostics.info(f"Converted {file_path} to sidecar {sidecar_path}")
+        except (ValueError, TypeError, ImportError) as e:
+            # e.g. columns mixing numbers and text cannot be stored; keep using the workbook
+            self.diagnostics.warning(f"Could not write sidecar for {file_path}. Error: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return df
 
-    def _load_and_merge_sheets(self, file_path: str, sheet_name_column: str = None) -> pd.DataFrame:
+    def _load_and_merge_sheets(self, file_path: str, sheet_name_column: str = None,
+                               usecols: Optional[Callable] = None) -> pd.DataFrame:
         """
         Load data from all sheets in an Excel file and merge them into a single DataFrame.
         Optionally adds a column to differentiate data from each sheet if there are multiple sheets.
 
         :param file_path: Path to the Excel file.
         :param sheet_name_column: Name of the column to store sheet names. If None, no column is added.
+        :param usecols: Callable selecting the columns to read (optional, all columns by default).
         :return: Merged DataFrame.
         """
-        sheets = pd.read_excel(file_path, sheet_name=None)  # Read all sheets
+        sheets = pd.read_excel(file_path, sheet_name=None, usecols=usecols)  # Read all sheets
         dataframes = []
 
         for sheet_name, df in sheets.items():
@@ -82,5 +491,5 @@ class DataManager:
             dataframes.append(df)
 
         merged_data = pd.concat(dataframes, ignore_index=True)
-        print(f"Merged data from {len(sheets)} sheets in file: {file_path}")
-        return merged_data
\ No newline at end of file
+        self.diagnostics.debug(f"Merged data from {len(sheets)} sheets in file: {file_path}")
+        return merged_data
@@ -0,0 +1,95 @@
+import os
+import json
+import hashlib
+from typing import Dict, Optional, Tuple
+
+
+class IngestManifest:
+    """
+    Persistent record of the source files already cleaned into a store.
+    A file is considered unchanged when its size and mtime match the manifest, or, if those
+    changed (e.g. the file was copied again), when its content hash still matches.
+    The cleaning configuration of the store is kept as well, so a different configuration
+    can be detected and the files cleaned again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the manifest, or start an empty one.
+        :param path: Path of the JSON manifest file.
+        """
+        self.path = path
+        self.entries: Dict[str, dict] = {}  # Map source file name -> {"size", "mtime_ns", "sha256", "output", "rows"}
+        self.config: Optional[dict] = None  # Cleaning configuration the recorded parts were produced with
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.entries = manifest.get("files", {})
+            self.config = manifest.get("config")
+
+    def use_config(self, config: dict) -> bool:
+        """
+        Set the cleaning configuration; if it differs from the recorded one, forget every recorded file.
+        :param config: JSON-serializable cleaning configuration, e.g. BaseCleaner.cache_config().
+        :return: True if recorded files were invalidated.
+        """
+        config = json.loads(json.dumps(config))  # Compare in the form it is stored in
+        invalidated = self.config is not None and config != self.config and bool(self.entries)
+        if config != self.config:
+            self.entries = {}
+        self.config = config
+        return invalidated
+
+    @staticmethod
+    def file_digest(file_path: str, block_size: int = 1 << 20) -> str:
+        """
+        Compute the SHA-256 of a file, reading it in blocks.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def changed_digest(self, file_path: str) -> Optional[Tuple[str, os.stat_result]]:
+        """
+        Check whether a source file needs to be (re)processed.
+        :param file_path: Path of the source file.
+        :return: The file's content hash and the stat it was taken with if it is new or changed,
+                 otherwise None. Record that stat, not a later one, so a file that grew after
+                 it was hashed is processed again.
+        """
+        name = os.path.basename(file_path)
+        stat = os.stat(file_path)
+        entry = self.entries.get(name)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return None
+
+        digest = self.file_digest(file_path)
+        if entry and entry["sha256"] == digest:
+            # Same content with new metadata; remember the new stat so it is not hashed again
+            entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+            return None
+        return digest, stat
+
+    def record(self, file_path: str, digest: str, stat: os.stat_result, output_path: str, rows: int) -> None:
+        """
+        Record a processed source file and where its cleaned rows were written.
+        :param stat: The stat returned by changed_digest together with digest.
+        """
+        self.entries[os.path.basename(file_path)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "output": os.path.basename(output_path),
+            "rows": rows,
+        }
+
+    def save(self) -> None:
+        """
+        Persist the manifest as JSON.
+        """
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"config": self.config, "files": self.entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
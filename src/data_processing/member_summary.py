@@ -0,0 +1,105 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+from src.data_processing.id_dictionary import id_key
+
+SUMMARY_COLUMNS = ["date", "memberId", "terminalId"]
+
+
+class MemberSummary:
+    """
+    Persistent per-member summary of the terminals each member was detected on, per day.
+    One row per distinct (date, memberId, terminalId), a tiny fraction of the raw detections,
+    so multi-day runs can count a member's terminals over earlier days without loading them.
+    IDs are stored as strings in the ID dictionary's key form (see id_key), so 123 and 123.0 are one member.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the summary, or start an empty one.
+        :param path: Path of the Parquet summary file.
+        """
+        self.path = path
+        if os.path.exists(path):
+            self.pairs = pd.read_parquet(path)
+        else:
+            self.pairs = pd.DataFrame({c: pd.Series(dtype=object) for c in SUMMARY_COLUMNS})
+
+    def update(self, data: pd.DataFrame, time_column: str = "eventTime") -> None:
+        """
+        Replace the days present in data with their distinct (memberId, terminalId) pairs.
+        Rows without a member, terminal or event time are not summarized.
+        :param data: Cleaned detections with memberId, terminalId and an event time column.
+        :param time_column: Datetime column the day is taken from.
+        """
+        missing = [c for c in ["memberId", "terminalId", time_column] if c not in data.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+
+        times = data[time_column]
+        if not pd.api.types.is_datetime64_any_dtype(times):
+            times = pd.to_datetime(times, errors="coerce")
+        pairs = pd.DataFrame({
+            "date": times.dt.strftime("%Y-%m-%d").to_numpy(dtype=object),
+            "memberId": data["memberId"].to_numpy(dtype=object),
+            "terminalId": data["terminalId"].to_numpy(dtype=object),
+        }).dropna().drop_duplicates()
+        for column in ["memberId", "terminalId"]:
+            pairs[column] = pairs[column].map(id_key)
+        pairs = pairs.drop_duplicates()  # Distinct again once 123 and 123.0 have the same key
+
+        kept = self.pairs[~self.pairs["date"].isin(pairs["date"].unique())]
+        self.pairs = pd.concat([kept, pairs], ignore_index=True).sort_values(SUMMARY_COLUMNS, ignore_index=True)
+
+    def daily_terminal_counts(self) -> pd.DataFrame:
+        """
+        Return the terminal-set cardinality of each member per day (columns date, memberId, terminals).
+        """
+        return (self.pairs.groupby(["date", "memberId"]).size().rename("terminals").reset_index())
+
+    def terminal_counts(self, date_range: Optional[Tuple[str, str]] = None) -> pd.Series:
+        """
+        Count the distinct terminals of each member over all summarized days.
+        :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional, all days by default).
+        :return: Series memberId -> number of distinct terminals.
+        """
+        pairs = self.pairs
+        if date_range:
+            pairs = pairs[pairs["date"].between(*date_range)]
+        return pairs.drop_duplicates(["memberId", "terminalId"]).groupby("memberId").size()
+
+    def dates(self) -> list:
+        return sorted(self.pairs["date"].unique())
+
+    def save(self) -> None:
+        """
+        Persist the summary as Parquet.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        self.pairs.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+
+def single_terminal_mask(member_ids: pd.Series, terminal_ids: pd.Series,
+                         terminal_counts: Optional[pd.Series] = None) -> np.ndarray:
+    """
+    Flag the rows of members detected on exactly one terminal, in one pass over integer codes.
+    :param member_ids: memberId column.
+    :param terminal_ids: terminalId column, aligned with member_ids.
+    :param terminal_counts: Distinct terminals per member (memberId as id_key string) from a MemberSummary;
+                            counted from the given rows if omitted.
+    :return: Boolean array, True for the rows to remove. Rows without a member are never flagged.
+    """
+    member_codes, members = pd.factorize(member_ids)
+    if terminal_counts is not None:
+        counts = terminal_counts.reindex(pd.Index([id_key(m) for m in np.asarray(members, dtype=object)])).fillna(0).to_numpy()
+    else:
+        terminal_codes, terminals = pd.factorize(terminal_ids)
+        present = (member_codes >= 0) & (terminal_codes >= 0)
+        # Distinct (member, terminal) pairs, then the number of pairs per member
+        pairs = np.unique(member_codes[present].astype(np.int64) * len(terminals) + terminal_codes[present])
+        counts = np.bincount(pairs // max(len(terminals), 1), minlength=len(members))
+    invalid = np.append(counts == 1, False)  # Code -1 (missing member) maps to the last entry
+    return invalid[member_codes]
@@ -0,0 +1,248 @@
+import os
+import pandas as pd
+from datetime import datetime
+from urllib.parse import quote, unquote
+from typing import Dict, List, Optional, Tuple
+from src.data_processing.schema import concat_frames
+
+# Extensions of partitioned dataset directories, and the format of the files inside
+PARTITIONED_FORMATS = {".parquet": "parquet", ".feather": "feather"}
+
+# Rows per Parquet row group; each row group carries min/max statistics for every column
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+# Partition value for rows whose event time is missing
+UNKNOWN_DATE = "unknown"
+
+
+class ScanStats:
+    """
+    Counters of what a pruned read of a partitioned dataset skipped and read.
+    Bytes are compressed bytes on disk: whole files for skipped partitions, column chunks for row groups.
+    """
+
+    def __init__(self):
+        self.files_read = 0
+        self.files_skipped = 0
+        self.row_groups_read = 0
+        self.row_groups_skipped = 0
+        self.bytes_read = 0
+        self.bytes_skipped = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        return (f"ScanStats(files {self.files_read} read / {self.files_skipped} skipped, "
+                f"row groups {self.row_groups_read} read / {self.row_groups_skipped} skipped, "
+                f"bytes {self.bytes_read} read / {self.bytes_skipped} skipped)")
+
+
+def write_partitioned(data: pd.DataFrame, path: str, fmt: str = "parquet", partition_by: Optional[List[str]] = None,
+                      row_group_size: int = DEFAULT_ROW_GROUP_SIZE, time_column: str = "eventTime") -> List[str]:
+    """
+    Write a DataFrame as a dataset directory partitioned by date, and optionally by more columns.
+    Partitions are nested 'key=value' directories (e.g. date=2024-12-09/terminalId=T1) holding one file each.
+    Rows are sorted by time within a partition, so the eventTime statistics of each Parquet row group
+    cover a narrow interval. Dtypes, including categoricals, are preserved. Partitions present in the
+    data replace the existing ones; other partitions already in the dataset are kept.
+    :param data: DataFrame to write.
+    :param path: Dataset directory.
+    :param fmt: File format, "parquet" or "feather" (Feather files carry no row-group statistics).
+    :param partition_by: Columns to partition by after the date, e.g. ["terminalId"] or ["StoreId"] (optional).
+    :param row_group_size: Rows per Parquet row group.
+    :param time_column: Datetime column the date partition is derived from.
+    :return: List of written file paths.
+    """
+    if fmt not in PARTITIONED_FORMATS.values():
+        raise ValueError(f"Unsupported partitioned format: {fmt}. Use 'parquet' or 'feather'.")
+    partition_by = partition_by or []
+    missing = [c for c in [time_column] + partition_by if c not in data.columns]
+    if missing:
+        raise ValueError(f"Missing partition columns: {missing}")
+
+    times = data[time_column]
+    if not pd.api.types.is_datetime64_any_dtype(times):
+        times = pd.to_datetime(times, errors="coerce")
+    dates = times.dt.strftime("%Y-%m-%d").fillna(UNKNOWN_DATE).rename("date")
+
+    written = []
+    keys = [dates] + [data[c].astype(str).rename(c) for c in partition_by]
+    for values, part in data.groupby(keys, sort=True, observed=True):
+        values = values if isinstance(values, tuple) else (values,)
+        segments = [f"{name}={quote(str(value), safe='')}" for name, value in zip(["date"] + partition_by, values)]
+        directory = os.path.join(path, *segments)
+        os.makedirs(directory, exist_ok=True)
+
+        part = part.sort_values(time_column, kind="stable").reset_index(drop=True)
+        file_path = os.path.join(directory, f"part-0.{fmt}")
+        tmp_path = f"{file_path}.tmp{os.getpid()}"
+        if fmt == "parquet":
+            part.to_parquet(tmp_path, index=False, row_group_size=row_group_size)
+        else:
+            part.to_feather(tmp_path)
+        os.replace(tmp_path, file_path)
+        written.append(file_path)
+
+    return written
+
+
+def partition_values(path: str, file_path: str) -> Dict[str, str]:
+    """
+    Parse the 'key=value' partition directories of a file inside a dataset.
+    """
+    relative = os.path.relpath(os.path.dirname(file_path), path)
+    values = {}
+    for segment in relative.split(os.sep):
+        if "=" in segment:
+            key, value = segment.split("=", 1)
+            values[key] = unquote(value)
+    return values
+
+
+def list_partition_files(path: str, date_range: Optional[Tuple[str, str]] = None,
+                         partition_filters: Optional[Dict[str, List]] = None) -> List[str]:
+    """
+    List the data files of a dataset whose partitions match, without opening any file.
+    :param path: Dataset directory.
+    :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+    :param partition_filters: Map partition column -> accepted values, e.g. {"terminalId": ["T1"]} (optional).
+                              Datasets not partitioned by a column are not filtered on it.
+    :return: Sorted list of file paths.
+    """
+    if not os.path.isdir(path):
+        raise ValueError(f"No partitioned dataset found at {path}.")
+
+    wanted = {key: {str(v) for v in values} for key, values in (partition_filters or {}).items()}
+    files = []
+    for root, _, names in os.walk(path):
+        for name in names:
+            if not name.startswith("part-") or os.path.splitext(name)[1] not in PARTITIONED_FORMATS:
+                continue
+            file_path = os.path.join(root, name)
+            values = partition_values(path, file_path)
+            date = values.get("date")
+            if date_range and (date is None or date == UNKNOWN_DATE or not date_range[0] <= date <= date_range[1]):
+                continue
+            if any(key in values and values[key] not in accepted for key, accepted in wanted.items()):
+                continue
+            files.append(file_path)
+    return sorted(files)
+
+
+def read_partitioned(path: str, date_range: Optional[Tuple[str, str]] = None,
+                     partition_filters: Optional[Dict[str, List]] = None,
+                     columns: Optional[List[str]] = None,
+                     time_range: Optional[Tuple[datetime, datetime]] = None,
+                     terminal_ids: Optional[List] = None, time_column: str = "eventTime",
+                     stats: Optional[ScanStats] = None) -> pd.DataFrame:
+    """
+    Read the matching rows of a dataset written by write_partitioned, touching as little data as possible:
+    1. Partitions are pruned by their directory names (dates, and terminalId if partitioned by it).
+    2. Parquet row groups whose eventTime or terminalId min/max statistics rule them out are skipped,
+       and files with no remaining row group are not read at all.
+    3. The rows of the row groups read are filtered exactly.
+    :param path: Dataset directory.
+    :param date_range: Inclusive (start, end) dates in 'YYYY-MM-DD' format (optional).
+    :param partition_filters: Map partition column -> accepted values (optional).
+    :param columns: Columns to return (optional, all columns by default).
+    :param time_range: Inclusive (start, end) event time window (optional).
+    :param terminal_ids: Keep only these terminals (optional).
+    :param time_column: Datetime column time_range applies to.
+    :param stats: ScanStats accumulating bytes and row groups read and skipped (optional).
+    :return: Combined DataFrame, ordered by partition (empty if nothing matches).
+    """
+    stats = stats if stats is not None else ScanStats()
+    start, end = (pd.Timestamp(t) for t in time_range) if time_range else (None, None)
+    if time_range:
+        days = (start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
+        date_range = (max(date_range[0], days[0]), min(date_range[1], days[1])) if date_range else days
+    partition_filters = dict(partition_filters or {})
+    if terminal_ids is not None:
+        partition_filters.setdefault("terminalId", list(terminal_ids))
+    wanted_terminals = sorted({str(t) for t in terminal_ids}) if terminal_ids is not None else None
+
+    candidates = list_partition_files(path, date_range=date_range, partition_filters=partition_filters)
+    for file_path in set(list_partition_files(path)) - set(candidates):
+        stats.files_skipped += 1
+        stats.bytes_skipped += os.path.getsize(file_path)
+
+    # The filtered columns are needed to filter rows, even when not returned
+    read_columns = None
+    if columns is not None:
+        read_columns = list(columns) + [c for c in (time_column, "terminalId") if c not in columns]
+
+    frames = []
+    for file_path in candidates:
+        if file_path.endswith(".parquet"):
+            df = _read_parquet_pruned(file_path, read_columns, start, end, wanted_terminals, time_column, stats)
+            if df is None:
+                continue
+        else:
+            # Feather files have no statistics
+            df = pd.read_feather(file_path)
+            stats.files_read += 1
+            stats.bytes_read += os.path.getsize(file_path)
+
+        mask = pd.Series(True, index=df.index)
+        if start is not None and time_column in df.columns:
+            mask &= df[time_column].between(start, end)
+        if wanted_terminals is not None and "terminalId" in df.columns:
+            mask &= df["terminalId"].astype(str).isin(wanted_terminals)
+        df = df[mask] if not mask.all() else df
+        frames.append(df[[c for c in columns if c in df.columns]] if columns is not None else df)
+
+    return concat_frames(frames) if frames else pd.DataFrame(columns=columns)
+
+
+def _read_parquet_pruned(file_path: str, columns: Optional[List[str]], start: Optional[pd.Timestamp],
+                         end: Optional[pd.Timestamp], terminal_ids: Optional[List[str]], time_column: str,
+                         stats: ScanStats) -> Optional[pd.DataFrame]:
+    """
+    Read the row groups of a Parquet file whose statistics may match the time window and terminals.
+    :return: DataFrame of the kept row groups, or None if every row group was skipped.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    keep = []
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        chunks = {row_group.column(j).path_in_schema: row_group.column(j) for j in range(row_group.num_columns)}
+        size = sum(chunk.total_compressed_size for chunk in chunks.values())
+        if _row_group_matches(chunks, start, end, terminal_ids, time_column):
+            keep.append(i)
+            stats.row_groups_read += 1
+            stats.bytes_read += size
+        else:
+            stats.row_groups_skipped += 1
+            stats.bytes_skipped += size
+
+    if not keep:
+        stats.files_skipped += 1
+        return None
+    stats.files_read += 1
+    if columns is not None:
+        columns = [c for c in columns if c in metadata.schema.names]
+    return parquet_file.read_row_groups(keep, columns=columns).to_pandas()
+
+
+def _row_group_matches(chunks: dict, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp],
+                       terminal_ids: Optional[List[str]], time_column: str) -> bool:
+    """
+    Check whether a row group's min/max statistics allow rows in the time window and terminal set.
+    Row groups without statistics are always read.
+    """
+    chunk = chunks.get(time_column)
+    if start is not None and chunk is not None and chunk.is_stats_set and chunk.statistics.has_min_max:
+        if pd.Timestamp(chunk.statistics.max) < start or pd.Timestamp(chunk.statistics.min) > end:
+            return False
+
+    chunk = chunks.get("terminalId")
+    if terminal_ids is not None and chunk is not None and chunk.is_stats_set and chunk.statistics.has_min_max:
+        low, high = str(chunk.statistics.min), str(chunk.statistics.max)
+        if isinstance(chunk.statistics.min, str) and not any(low <= t <= high for t in terminal_ids):
+            return False
+    return True
+
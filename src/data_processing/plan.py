@@ -0,0 +1,226 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+from src.data_processing.predicates import ColumnFilter, filter_mask
+from src.data_processing.sorting import merge_sorted_runs
+
+STRING_OPERATIONS = ("startswith", "contains")
+
+
+class FilterStage:
+    """
+    One filter stage of a plan: one or more filters on the same column evaluated as a single mask.
+    Several string filters are compiled into one anchored regular expression with a lookahead per
+    filter, so the strings are scanned once.
+    """
+
+    def __init__(self, filters: List[ColumnFilter]):
+        self.filters = filters
+        self.column = filters[0].column
+
+    def mask(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Evaluate the stage on a DataFrame.
+        :return: Boolean mask aligned with data.
+        """
+        if len(self.filters) == 1:
+            f = self.filters[0]
+            return filter_mask(data, f.column, f.condition, f.operation)
+        if self.column not in data.columns:
+            raise ValueError(f"Column '{self.column}' not found in data.")
+        return data[self.column].str.contains(self.pattern(), na=False, regex=True)
+
+    def pattern(self) -> str:
+        """
+        Combined regular expression of the stage's string filters.
+        Conditions of 'contains' filters are regular expressions, as in str.contains.
+        """
+        lookaheads = []
+        for f in self.filters:
+            if f.operation == "startswith":
+                lookaheads.append(f"(?={re.escape(f.condition)})")
+            else:
+                lookaheads.append(f"(?=.*?(?:{f.condition}))")
+        return "(?s)^" + "".join(lookaheads)
+
+    def describe(self) -> str:
+        return "filter " + " AND ".join(f"{f.column} {f.operation} {f.condition!r}" for f in self.filters)
+
+
+class SortStage:
+    """
+    One sort stage of a plan.
+    """
+
+    def __init__(self, column: str, ascending: bool = True):
+        self.column = column
+        self.ascending = ascending
+        self.merged_runs: Optional[int] = None  # Number of presorted file runs merged, once executed
+
+    def describe(self) -> str:
+        description = f"sort {self.column} {'ascending' if self.ascending else 'descending'}"
+        if self.merged_runs is not None:
+            description += f" (merge of {self.merged_runs} per-file runs)"
+        return description
+
+
+class CleaningPlan:
+    """
+    Lazy, optimized execution plan for JSON cleaning steps.
+    Filters are row-local, so they are moved ahead of sorts; duplicate filters, filters implied by
+    another filter and filters already applied while loading are dropped; adjacent string filters
+    on the same column are merged into one mask. The plan only tracks row positions while it runs
+    and materializes the result with a single take at the end.
+    """
+
+    def __init__(self, steps: List[dict], applied: Optional[List[ColumnFilter]] = None):
+        """
+        Build and optimize the plan.
+        :param steps: List of cleaning steps in the format used by BaseCleaner.execute_steps.
+        :param applied: Filters already applied to the data, e.g. while loading (optional).
+        """
+        self.steps = steps
+        self.dropped: List[Tuple[str, str]] = []  # (step description, reason)
+        self.rows: List[int] = []  # Row count before the first stage and after each stage, once executed
+        self.rows_reordered: Optional[int] = None
+
+        filters: List[ColumnFilter] = []
+        sorts: List[SortStage] = []
+        for step in steps:
+            operation = step.get("operation")
+            params = step.get("params", {})
+            if operation == "filter":
+                filters.append(ColumnFilter(**params))
+            elif operation == "sort":
+                sorts.append(SortStage(**params))
+            else:
+                raise ValueError(f"Unsupported operation: {operation}")
+
+        self.stages = self._filter_stages(self._prune(filters, applied or [])) + sorts
+
+    def _prune(self, filters: List[ColumnFilter], applied: List[ColumnFilter]) -> List[ColumnFilter]:
+        """
+        Drop duplicate filters, filters already applied and filters implied by a stricter one.
+        """
+        kept: List[ColumnFilter] = []
+        for f in filters:
+            if f in applied:
+                self.dropped.append((repr(f), "already applied while loading"))
+            elif f in kept:
+                self.dropped.append((repr(f), "duplicate"))
+            else:
+                kept.append(f)
+
+        pruned = []
+        for f in kept:
+            stricter = next((other for other in kept + applied if other is not f and _implies(other, f)), None)
+            if stricter is not None:
+                self.dropped.append((repr(f), f"implied by {stricter!r}"))
+            else:
+                pruned.append(f)
+        return pruned
+
+    @staticmethod
+    def _filter_stages(filters: List[ColumnFilter]) -> List[FilterStage]:
+        """
+        Group adjacent string filters on the same column into one stage.
+        """
+        stages: List[FilterStage] = []
+        for f in filters:
+            last = stages[-1] if stages else None
+            if (last is not None and f.operation in STRING_OPERATIONS and last.column == f.column
+                    and all(g.operation in STRING_OPERATIONS for g in last.filters)):
+                last.filters.append(f)
+            else:
+                stages.append(FilterStage([f]))
+        return stages
+
+    def filters(self) -> List[ColumnFilter]:
+        """
+        Return the filters the plan applies, after pruning.
+        """
+        return [f for stage in self.stages if isinstance(stage, FilterStage) for f in stage.filters]
+
+    def execute(self, data: pd.DataFrame, run_lengths: Optional[List[int]] = None) -> pd.DataFrame:
+        """
+        Run the plan on a DataFrame.
+        :param data: DataFrame to clean.
+        :param run_lengths: Rows per source file if data is still the concatenation of its files in order;
+                            ascending sorts then merge the per-file runs (optional).
+        :return: The filtered and sorted DataFrame (data itself if nothing changed).
+        """
+        positions = np.arange(len(data))
+        self.rows = [len(data)]
+        for stage in self.stages:
+            if stage.column not in data.columns:
+                raise ValueError(f"Column '{stage.column}' not found in data.")
+
+            if isinstance(stage, FilterStage):
+                # String filters only need their column; query conditions may refer to other columns
+                string_only = all(f.operation in STRING_OPERATIONS for f in stage.filters)
+                subset = data[[stage.column]] if string_only else data
+                if len(positions) != len(data):
+                    subset = subset.iloc[positions]
+                try:
+                    mask = stage.mask(subset).to_numpy(dtype=bool)
+                except Exception as e:
+                    raise ValueError(f"Invalid filter operation. Error: {e}")
+                positions = positions[mask]
+            else:
+                column = data[stage.column].iloc[positions].reset_index(drop=True)
+                keys = column.to_numpy()
+                order = None
+                if stage.ascending and run_lengths:
+                    # Rows kept from each file, still in file order
+                    bounds = np.searchsorted(positions, np.cumsum(run_lengths))
+                    lengths = np.diff(np.concatenate([[0], bounds])).tolist()
+                    try:
+                        order, self.rows_reordered = merge_sorted_runs(keys, lengths)
+                        stage.merged_runs = len(lengths)
+                    except TypeError:
+                        order = None
+                if order is None:
+                    order = column.sort_values(ascending=stage.ascending).index.to_numpy()
+                positions = positions[order]
+                run_lengths = None
+            self.rows.append(len(positions))
+
+        if len(positions) == len(data) and (positions == np.arange(len(data))).all():
+            return data
+        return data.iloc[positions]
+
+    def explain(self) -> str:
+        """
+        Describe the optimized plan, with the rows kept at each stage once it has been executed.
+        """
+        executed = len(self.rows) == len(self.stages) + 1
+        lines = [f"Cleaning plan: {len(self.steps)} steps -> {len(self.stages)} stages"]
+        if executed:
+            lines.append(f"  0. scan{'':<44} rows: {self.rows[0]}")
+        for i, stage in enumerate(self.stages, start=1):
+            line = f"  {i}. {stage.describe():<48}"
+            if executed:
+                line += f" rows: {self.rows[i]}"
+            lines.append(line)
+        if self.rows_reordered is not None:
+            lines.append(f"  Rows reordered within their file: {self.rows_reordered}")
+        for description, reason in self.dropped:
+            lines.append(f"  Dropped {description}: {reason}")
+        return "\n".join(lines)
+
+
+def _implies(stricter: ColumnFilter, weaker: ColumnFilter) -> bool:
+    """
+    Check whether every row kept by one literal string filter is also kept by another.
+    Only literal conditions are compared; regular expressions are never considered implied.
+    """
+    if stricter.column != weaker.column or weaker.operation not in STRING_OPERATIONS:
+        return False
+    if stricter.operation not in STRING_OPERATIONS or re.escape(weaker.condition) != weaker.condition:
+        return False
+    if re.escape(stricter.condition) != stricter.condition and stricter.operation == "contains":
+        return False
+    if weaker.operation == "startswith":
+        return stricter.operation == "startswith" and stricter.condition.startswith(weaker.condition)
+    return weaker.condition in stricter.condition
@@ -0,0 +1,101 @@
+import pandas as pd
+from typing import Callable, List, Optional, Tuple
+
+# A row predicate receives a DataFrame (a whole file or one chunk of it) and returns a boolean
+# mask of the rows to keep, or None if it does not apply to this frame.
+RowPredicate = Callable[[pd.DataFrame], Optional[pd.Series]]
+
+
+def filter_mask(data: pd.DataFrame, column: str, condition: str, operation: str = "query") -> pd.Series:
+    """
+    Build the boolean mask for a single filter step.
+    :param data: DataFrame to evaluate.
+    :param column: Column name to apply the filter on.
+    :param condition: Condition as a string (e.g., "== 'some_value'" or substring for 'contains').
+    :param operation: The type of filtering operation ("query", "contains", or "startswith").
+    :return: Boolean Series aligned with data.
+    """
+    if column not in data.columns:
+        raise ValueError(f"Column '{column}' not found in data.")
+
+    if operation == "query":
+        return data.eval(f"{column} {condition}")
+    elif operation == "contains":
+        return data[column].str.contains(condition, na=False)
+    elif operation == "startswith":
+        return data[column].str.startswith(condition, na=False)
+    raise ValueError(f"Unsupported filter operation: {operation}")
+
+
+def apple_manufacturer(data: pd.DataFrame) -> Optional[pd.Series]:
+    """
+    Keep rows whose advertisement carries Apple's manufacturer data ('ff4c00' at offset 14).
+    Does not apply to frames without an 'accessAddress' column (e.g. raw exports).
+    """
+    if "accessAddress" not in data.columns:
+        return None
+    return data["accessAddress"].str[14:20] == "ff4c00"
+
+
+class ColumnFilter:
+    """
+    Row predicate equivalent to a JSON "filter" cleaning step.
+    Implemented as a class rather than a closure so it can be sent to process pools.
+    """
+
+    def __init__(self, column: str, condition: str, operation: str = "query"):
+        self.column = column
+        self.condition = condition
+        self.operation = operation
+
+    def __call__(self, data: pd.DataFrame) -> pd.Series:
+        return filter_mask(data, self.column, self.condition, self.operation)
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, ColumnFilter) and (self.column, self.condition, self.operation)
+                == (other.column, other.condition, other.operation))
+
+    def __hash__(self) -> int:
+        return hash((self.column, self.condition, self.operation))
+
+    def __repr__(self) -> str:
+        return f"ColumnFilter({self.column!r}, {self.condition!r}, {self.operation!r})"
+
+
+# Filter step that keeps every row apple_manufacturer keeps; used to recognize redundant JSON steps
+APPLE_MANUFACTURER_FILTER = ColumnFilter("accessAddress", "ff4c00", "contains")
+
+
+def split_steps(steps: List[dict]) -> Tuple[List[RowPredicate], List[dict]]:
+    """
+    Split JSON cleaning steps into row predicates that can be applied while reading
+    and the remaining steps that need the combined frame.
+    Filters are row-local, so they can be moved ahead of a sort without changing the result set.
+    :param steps: List of cleaning steps in the format used by BaseCleaner.execute_steps.
+    :return: Tuple of (row predicates, remaining steps in their original order).
+    """
+    predicates: List[RowPredicate] = []
+    remaining: List[dict] = []
+    for step in steps:
+        if step.get("operation") == "filter":
+            predicates.append(ColumnFilter(**step.get("params", {})))
+        else:
+            remaining.append(step)
+    return predicates, remaining
+
+
+def apply_predicates(data: pd.DataFrame, predicates: Optional[List[RowPredicate]]) -> pd.DataFrame:
+    """
+    Apply row predicates to a DataFrame, combining them into a single mask.
+    :param data: DataFrame to filter.
+    :param predicates: List of row predicates (optional).
+    :return: Filtered DataFrame.
+    """
+    mask = None
+    for predicate in predicates or []:
+        predicate_mask = predicate(data)
+        if predicate_mask is None:
+            continue
+        mask = predicate_mask if mask is None else mask & predicate_mask
+
+    return data if mask is None else data[mask]
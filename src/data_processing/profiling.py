@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+# Number of HyperLogLog register index bits: 2**14 registers, about 0.8% standard error
+SKETCH_PRECISION = 14
+
+# Distinct values counted exactly before a sketch falls back to its HyperLogLog estimate
+EXACT_DISTINCT_LIMIT = 100_000
+
+
+class DistinctSketch:
+    """
+    Mergeable distinct-value counter with bounded memory.
+    Values are counted exactly up to exact_limit distinct values; beyond that only the
+    HyperLogLog registers (16 KB) are kept and the count is an estimate. Values are compared
+    as strings, so chunks parsed with different dtypes count the same IDs once.
+    """
+
+    def __init__(self, exact_limit: int = EXACT_DISTINCT_LIMIT, precision: int = SKETCH_PRECISION):
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.exact: Optional[set] = set()
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Add the non-missing values of a Series.
+        """
+        uniques = pd.unique(values.dropna().astype(str).to_numpy(dtype=object))
+        if len(uniques) == 0:
+            return
+        hashes = pd.util.hash_array(uniques, categorize=False)
+        suffix_bits = 64 - self.precision
+        index = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << suffix_bits) - 1)
+        # Rank of the first set bit in the remaining bits (exact in float64, they are below 2**53)
+        rank = np.where(remainder == 0, suffix_bits + 1,
+                        suffix_bits - np.floor(np.log2(np.maximum(remainder, 1).astype(np.float64)))).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+        if self.exact is not None:
+            self.exact.update(uniques)
+            if len(self.exact) > self.exact_limit:
+                self.exact = None
+
+    def merge(self, other: "DistinctSketch") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precisions.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        if self.exact is not None and other.exact is not None:
+            self.exact |= other.exact
+            if len(self.exact) > self.exact_limit:
+                self.exact = None
+        else:
+            self.exact = None
+
+    def count(self) -> int:
+        """
+        Return the exact distinct count, or the HyperLogLog estimate once past the exact limit.
+        """
+        if self.exact is not None:
+            return len(self.exact)
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # Linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class ProfileAccumulator:
+    """
+    Streaming, mergeable profile of cleaned rows: row count, null counts per column, distinct
+    values of one column and the rows holding the minimum and maximum of another.
+    Chunks are folded in with update(), and profiles of separate files or processes are
+    combined with merge(); memory is bounded by the sketch and two rows.
+    Ties keep the earliest row, as idxmax/idxmin do, when chunks and merges follow row order.
+    """
+
+    def __init__(self, distinct_column: Optional[str] = None, value_column: Optional[str] = None,
+                 labels: Optional[Dict[str, str]] = None, exact_limit: int = EXACT_DISTINCT_LIMIT):
+        """
+        :param distinct_column: Column whose distinct values are counted, e.g. "memberId" (optional).
+        :param value_column: Column whose min/max rows are kept, e.g. "rssi" (optional).
+        :param labels: Output names of the "distinct", "max_row" and "min_row" entries (optional).
+        :param exact_limit: Distinct values counted exactly before switching to the sketch estimate.
+        """
+        self.distinct_column = distinct_column
+        self.value_column = value_column
+        self.labels = {"distinct": "distinct", "max_row": "max_row", "min_row": "min_row", **(labels or {})}
+        self.rows = 0
+        self.null_counts: Dict[str, int] = {}
+        self.distinct = DistinctSketch(exact_limit=exact_limit)
+        self.max_value = self.min_value = None
+        self.max_row: Optional[dict] = None
+        self.min_row: Optional[dict] = None
+
+    def update(self, chunk: pd.DataFrame) -> "ProfileAccumulator":
+        """
+        Fold a chunk of rows into the profile.
+        """
+        self.rows += len(chunk)
+        for column, nulls in chunk.isna().sum().items():
+            self.null_counts[column] = self.null_counts.get(column, 0) + int(nulls)
+
+        if self.distinct_column is not None and self.distinct_column in chunk.columns:
+            self.distinct.update(chunk[self.distinct_column])
+
+        if self.value_column is not None and self.value_column in chunk.columns:
+            values = chunk[self.value_column].reset_index(drop=True)
+            if values.notna().any():
+                high, low = values.idxmax(), values.idxmin()
+                self._offer(values[high], chunk.iloc[high].to_dict(), values[low], chunk.iloc[low].to_dict())
+        return self
+
+    def _offer(self, high, high_row: Optional[dict], low, low_row: Optional[dict]) -> None:
+        """
+        Keep the candidate extreme rows if they are strictly beyond the current ones.
+        """
+        if high_row is not None and (self.max_row is None or high > self.max_value):
+            self.max_value, self.max_row = high, high_row
+        if low_row is not None and (self.min_row is None or low < self.min_value):
+            self.min_value, self.min_row = low, low_row
+
+    def merge(self, other: "ProfileAccumulator") -> "ProfileAccumulator":
+        """
+        Fold another profile, of rows that come after this one's, into this profile.
+        """
+        self.rows += other.rows
+        for column, nulls in other.null_counts.items():
+            self.null_counts[column] = self.null_counts.get(column, 0) + nulls
+        self.distinct.merge(other.distinct)
+        self._offer(other.max_value, other.max_row, other.min_value, other.min_row)
+        return self
+
+    def result(self) -> dict:
+        """
+        Return the profile as a dictionary.
+        """
+        profile = {"total_rows": self.rows}
+        if self.distinct_column is not None:
+            profile[self.labels["distinct"]] = self.distinct.count()
+            profile["distinct_is_exact"] = self.distinct.exact is not None
+        if self.value_column is not None:
+            profile[self.labels["max_row"]] = self.max_row
+            profile[self.labels["min_row"]] = self.min_row
+        profile["null_counts"] = dict(self.null_counts)
+        return profile
@@ -0,0 +1,189 @@
+import re
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+
+class ColumnProjection:
+    """
+    Columns a cleaning pipeline needs from its input files.
+    The loader reads only these columns (usecols for CSV and Excel), and JSON columns are
+    replaced by the few fields extracted from them while reading, so unused columns are
+    never materialized.
+    """
+
+    def __init__(self, columns: List[str], names: Optional[List[str]] = None,
+                 json_fields: Optional[Dict[str, Dict[str, str]]] = None):
+        """
+        :param columns: Column names to keep, in any of the layouts the pipeline accepts.
+        :param names: Full column order of the headerless layout (optional).
+        :param json_fields: Map JSON column -> {field: output column} extracted while reading (optional).
+        """
+        self.columns = list(columns)
+        self.names = list(names) if names else None
+        self.json_fields = json_fields or {}
+
+    def extracts(self, column: str) -> bool:
+        """
+        Return True if a column is produced by JSON field extraction rather than read from the file.
+        """
+        return any(column in fields.values() for fields in self.json_fields.values())
+
+    def keep_column(self, column) -> bool:
+        """
+        Return True if a column is part of the projection (usable as a callable usecols).
+        """
+        return column in self.columns
+
+    def read_options(self, header: List) -> dict:
+        """
+        Build the read_csv keyword arguments for a file with the given first row.
+        A file whose first row contains none of the projected columns is read with the
+        headerless layout, if one is declared.
+        :param header: Column names parsed from the first row of the file.
+        :return: Dictionary of read_csv keyword arguments.
+        """
+        present = [column for column in header if self.keep_column(column)]
+        if present:
+            return {"usecols": present}
+        if self.names:
+            return {"header": None, "names": self.names, "usecols": [c for c in self.names if self.keep_column(c)]}
+        return {}
+
+    def apply(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace each JSON column by the fields extracted from it, at the same position.
+        :param data: Freshly parsed DataFrame (a whole file or one chunk).
+        :return: DataFrame with the extracted fields instead of the JSON columns.
+        """
+        for column, fields in self.json_fields.items():
+            if column not in data.columns:
+                continue
+            extracted = extract_json_fields(data[column], fields)
+            position = data.columns.get_loc(column)
+            data = data.drop(columns=column)
+            for offset, output_column in enumerate(extracted.columns):
+                data.insert(position + offset, output_column, extracted[output_column])
+        return data
+
+    def __repr__(self) -> str:
+        return f"ColumnProjection({self.columns!r}, json_fields={self.json_fields!r})"
+
+
+# JSON grammar for flat objects whose values are plain scalars (strings without escapes, numbers,
+# true/false/null), in RE2 syntax for pyarrow.compute. Rows matching it are valid JSON, so their
+# fields can be extracted with regular expressions and give exactly what json.loads would.
+_WS = r'[ \t\n\r]*'
+_JSON_STRING = r'"[^"\\\x00-\x1f]*"'
+_JSON_SCALAR = rf'(?:{_JSON_STRING}|-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|true|false|null)'
+_JSON_PAIR = rf'{_JSON_STRING}{_WS}:{_WS}{_JSON_SCALAR}'
+FLAT_JSON_OBJECT = rf'^{_WS}\{{{_WS}(?:{_JSON_PAIR}(?:{_WS},{_WS}{_JSON_PAIR})*)?{_WS}\}}{_WS}$'
+
+# Integers small enough to be parsed in bulk as int64; longer ones take the json.loads path
+_JSON_INT = r'-?(?:0|[1-9][0-9]{0,17})'
+
+
+def extract_json_fields(values: pd.Series, fields: Dict[str, str], stats: Optional[Dict[str, int]] = None) -> pd.DataFrame:
+    """
+    Extract fields from a column of JSON objects.
+    Flat objects with string, integer, boolean or null values are decoded in bulk with Arrow's
+    vectorized regular expressions; only the other rows (floats, escapes, nesting, invalid JSON)
+    go through json.loads, as do rows with duplicate keys.
+    Values that are not valid JSON objects yield None for every field.
+    :param values: Series of JSON strings.
+    :param fields: Map JSON field -> output column name.
+    :param stats: Optional dictionary that accumulates the "fast" and "slow" row counts.
+    :return: DataFrame with one column per field, aligned with values.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    objects = values.to_numpy(dtype=object)
+    try:
+        strings = pa.array(objects, type=pa.string(), from_pandas=True)
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        # Non-string values (e.g. numbers) take the json.loads path
+        strings = pa.array([v if isinstance(v, str) else None for v in objects], type=pa.string())
+
+    fast = pc.match_substring_regex(strings, FLAT_JSON_OBJECT).fill_null(False).to_numpy(zero_copy_only=False)
+    columns = {name: np.full(len(values), None, dtype=object) for name in fields.values()}
+    rows = np.flatnonzero(fast)
+    candidates = strings.take(pa.array(rows, type=pa.int64()))
+    for field, name in fields.items():
+        # Valid flat JSON strings contain no escaped quotes, so the literal '"field"' is a whole string:
+        # either the key (followed by ':') or a value. json.loads keeps the last of duplicate keys;
+        # rows where the literal occurs more than once take the slow path.
+        literal = json.dumps(field)
+        occurrences = pc.count_substring(candidates, literal).to_numpy(zero_copy_only=False)
+        duplicated = occurrences > 1
+        found = np.flatnonzero(occurrences == 1)
+        after_key = pc.list_element(pc.split_pattern(candidates.take(pa.array(found, type=pa.int64())), literal,
+                                                     max_splits=1), 1)
+        found_tokens = pc.struct_field(pc.extract_regex(after_key, rf'^{_WS}:{_WS}(?P<value>{_JSON_SCALAR})'), [0])
+        # Back to one token per candidate row, null where the key is absent
+        positions = np.full(len(candidates), -1, dtype=np.int64)
+        positions[found] = np.arange(len(found))
+        tokens = found_tokens.take(pa.array(positions, mask=positions < 0))
+        is_string = _flags(pc.starts_with(tokens, '"'))
+        is_int = _flags(pc.match_substring_regex(tokens, f"^{_JSON_INT}$"))
+        is_true = _flags(pc.equal(tokens, "true"))
+        is_false = _flags(pc.equal(tokens, "false"))
+        is_simple = _flags(pc.is_null(tokens)) | is_string | is_int | is_true | is_false | _flags(pc.equal(tokens, "null"))
+
+        column = columns[name]
+        column[rows[is_string]] = pc.utf8_slice_codeunits(tokens.filter(pa.array(is_string)), 1, -1).to_numpy(zero_copy_only=False)
+        column[rows[is_int]] = _object_array(pc.cast(tokens.filter(pa.array(is_int)), pa.int64()).to_pylist())
+        column[rows[is_true]] = True
+        column[rows[is_false]] = False
+        # Floats keep the exact json.loads conversion
+        fast[rows[~is_simple | duplicated]] = False
+
+    def parse(raw_data):
+        try:
+            parsed = json.loads(raw_data)
+        except (json.JSONDecodeError, TypeError):
+            return [None] * len(fields)
+        if not isinstance(parsed, dict):
+            return [None] * len(fields)
+        return [parsed.get(field) for field in fields]
+
+    slow = np.flatnonzero(~fast)
+    for position in slow:
+        for name, value in zip(fields.values(), parse(objects[position])):
+            columns[name][position] = value
+
+    if stats is not None:
+        stats["fast"] = stats.get("fast", 0) + int(len(values) - len(slow))
+        stats["slow"] = stats.get("slow", 0) + int(len(slow))
+    return pd.DataFrame({name: column.tolist() for name, column in columns.items()}, index=values.index)
+
+
+def _flags(mask) -> np.ndarray:
+    """
+    Convert an Arrow boolean array to a NumPy mask, treating nulls as False.
+    """
+    return mask.fill_null(False).to_numpy(zero_copy_only=False)
+
+
+def _object_array(items: list) -> np.ndarray:
+    """
+    Wrap Python objects in an object array without NumPy converting them.
+    """
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+
+# Raw BLE export columns needed by BLECleaner.clean; only AD3 and rssi are kept from RawData
+BLE_PROJECTION = ColumnProjection(
+    columns=["POSCode", "UserId", "PLIEventCd", "PLIEventTimestamp", "RawData"],
+    names=["BeaconRecordId", "ConglomeratedId", "StoreId", "POSCode", "UserId", "PLICd", "PLIEventCd",
+           "PLIEventTimestamp", "Distance", "RawData", "Source"],
+    json_fields={"RawData": {"AD3": "accessAddress", "rssi": "rssi"}},
+)
+
+# POS export columns needed by TransactionCleaner.clean, under their original or standardized names
+TRANSACTION_PROJECTION = ColumnProjection(
+    columns=["櫃位", "機號", "交易日期", "交易時間", "tenantName", "terminalId", "transDate", "transTime"],
+)
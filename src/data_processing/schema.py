@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from pandas.api.types import union_categoricals
+
+# Declared dtypes for BLE and transaction inputs, applied right after each file or chunk is parsed.
+# "category": low-cardinality IDs stored as integer codes.
+# "int8": small integers such as RSSI; kept as float32 when the column has missing or fractional values.
+# "datetime": ISO timestamps parsed to datetime64; unparseable values become NaT.
+BLE_SCHEMA: Dict[str, str] = {
+    # Processed layout (data/processed/ble)
+    "terminalId": "category",
+    "memberId": "category",
+    "eventType": "category",
+    "accessAddress": "category",
+    "rssi": "int8",
+    "eventTime": "datetime",
+    # Raw export layout
+    "StoreId": "category",
+    "POSCode": "category",
+    "UserId": "category",
+    "PLICd": "category",
+    "PLIEventCd": "category",
+    "Source": "category",
+}
+
+TRANSACTION_SCHEMA: Dict[str, str] = {
+    "店別": "category",
+    "櫃位": "category",
+    "機號": "category",
+    "storeId": "category",
+    "tenantName": "category",
+    "terminalId": "category",
+    "eventTime": "datetime",
+}
+
+
+def apply_schema(data: pd.DataFrame, schema: Optional[Dict[str, str]]) -> Tuple[pd.DataFrame, Dict[str, List[int]]]:
+    """
+    Convert the columns of a freshly parsed DataFrame to their declared dtypes.
+    Values are parsed by read_csv/read_excel first, so numeric IDs keep their numeric categories.
+    :param data: DataFrame to convert.
+    :param schema: Mapping of column name -> declared type (optional).
+    :return: Tuple of (converted DataFrame, {column: [bytes before, bytes after]} for converted columns).
+    """
+    memory: Dict[str, List[int]] = {}
+    if not schema:
+        return data, memory
+
+    # Shallow copy, so replacing columns never writes into a filtered view of the parsed frame
+    data = data.copy(deep=False)
+
+    for column, kind in schema.items():
+        if column not in data.columns:
+            continue
+        series = data[column]
+        before = int(series.memory_usage(index=False, deep=True))
+
+        if kind == "category":
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            converted = series.astype("category")
+        elif kind == "int8":
+            if series.dtype == np.int8:
+                continue
+            converted = pd.to_numeric(series, errors="coerce")
+            # Only whole numbers in range; astype(np.int8) would silently truncate e.g. -50.7 to -50
+            fits = (converted.isna().sum() == 0 and converted.between(-128, 127).all()
+                    and (converted == converted.round()).all())
+            converted = converted.astype(np.int8) if fits else converted.astype(np.float32)
+        elif kind == "datetime":
+            if pd.api.types.is_datetime64_any_dtype(series):
+                continue
+            converted = pd.to_datetime(series, errors="coerce", format="ISO8601")
+        else:
+            raise ValueError(f"Unsupported schema type '{kind}' for column '{column}'.")
+
+        data[column] = converted
+        memory[column] = [before, int(converted.memory_usage(index=False, deep=True))]
+
+    return data, memory
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate DataFrames, keeping categorical columns categorical.
+    pd.concat falls back to object dtype when the categories of the inputs differ,
+    so the categories are unified first.
+    :param frames: DataFrames to concatenate, in order.
+    :return: Combined DataFrame with a fresh RangeIndex.
+    """
+    if len(frames) > 1:
+        frames = [df.copy(deep=False) for df in frames]
+        categorical_columns = {
+            column for df in frames for column in df.columns
+            if isinstance(df[column].dtype, pd.CategoricalDtype)
+        }
+        for column in categorical_columns:
+            columns = [df[column] for df in frames if column in df.columns]
+            if len(columns) != len(frames) or not all(isinstance(c.dtype, pd.CategoricalDtype) for c in columns):
+                continue
+            try:
+                categories = union_categoricals([c.values for c in columns], ignore_order=True).categories
+            except TypeError:
+                # Categories of different types (e.g. int and str) cannot be unified
+                continue
+            for df in frames:
+                df[column] = df[column].cat.set_categories(categories)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def memory_report(memory: Dict[str, List[int]]) -> pd.DataFrame:
+    """
+    Format per-column memory usage before and after applying the schema.
+    :param memory: Mapping of column -> [bytes before, bytes after].
+    :return: DataFrame with columns 'column', 'before_mb', 'after_mb' and 'ratio'.
+    """
+    rows = [
+        {
+            "column": column,
+            "before_mb": before / 1024 ** 2,
+            "after_mb": after / 1024 ** 2,
+            "ratio": after / before if before else 0.0,
+        }
+        for column, (before, after) in memory.items()
+    ]
+    return pd.DataFrame(rows, columns=["column", "before_mb", "after_mb", "ratio"])
@@ -0,0 +1,205 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.data_processing.diagnostics import Diagnostics
+
+
+class EventSnapshot:
+    """
+    On-disk snapshot of prepared BLE events as flat NumPy arrays.
+    Events are sorted by terminal and then by time, with per-terminal offsets, and every array
+    is opened with np.memmap on load: a new process can query a day without parsing anything,
+    and only the pages of the terminals actually touched are read into memory.
+
+    Layout of a snapshot directory:
+        time.npy      datetime64[ns] event times
+        terminal.npy  int32 terminal codes (index into meta.json "terminals")
+        member.npy    int32 member codes (index into members.json)
+        rssi.npy      int8 RSSI (float32 when the source had missing values)
+        offsets.npy   int64, events of terminal i are rows offsets[i]:offsets[i + 1]
+        meta.json     terminal IDs and row count
+        members.json  member IDs, only read when codes need to be decoded
+    """
+
+    ARRAYS = ("time", "terminal", "member", "rssi", "offsets")
+
+    def __init__(self, path: str):
+        """
+        Open an existing snapshot. Arrays are memory-mapped copy-on-write, so callers may modify
+        frames built from them without touching the files.
+        :param path: Snapshot directory.
+        """
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No snapshot found at {path}.")
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self.path = path
+        self.terminals: List = meta["terminals"]
+        self.num_rows: int = meta["num_rows"]
+        self._terminal_index = {terminal_id: i for i, terminal_id in enumerate(self.terminals)}
+        self._members: Optional[List] = None
+
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="c") for name in self.ARRAYS}
+        self.time = arrays["time"]
+        self.terminal = arrays["terminal"]
+        self.member = arrays["member"]
+        self.rssi = arrays["rssi"]
+        self.offsets = arrays["offsets"]
+
+    @classmethod
+    def write(cls, data: pd.DataFrame, path: str, diagnostics: Optional[Diagnostics] = None) -> "EventSnapshot":
+        """
+        Write cleaned BLE events to a snapshot directory and open it.
+        Events without a valid eventTime, terminalId or memberId are left out.
+        :param data: DataFrame with 'terminalId', 'memberId', 'eventTime' and 'rssi' columns.
+        :param path: Snapshot directory (created if missing).
+        :param diagnostics: Sink for the summary message (optional, prints at info level by default).
+        :return: The opened EventSnapshot.
+        """
+        required_columns = {"terminalId", "memberId", "eventTime", "rssi"}
+        if not required_columns.issubset(data.columns):
+            raise ValueError(f"Missing required columns: {required_columns - set(data.columns)}")
+
+        event_time = pd.to_datetime(data["eventTime"], errors="coerce")
+        valid = (event_time.notna() & data["terminalId"].notna() & data["memberId"].notna()).to_numpy()
+        data = data[valid]
+        times = event_time[valid].to_numpy(dtype="datetime64[ns]")
+
+        terminal_codes, terminals = pd.factorize(data["terminalId"], sort=True)
+        member_codes, members = pd.factorize(data["memberId"])
+
+        rssi = pd.to_numeric(data["rssi"], errors="coerce")
+        if rssi.isna().any() or not rssi.between(-128, 127).all():
+            rssi = rssi.to_numpy(dtype=np.float32)
+        else:
+            rssi = rssi.to_numpy(dtype=np.int8)
+
+        # Sort by terminal, then by time within each terminal
+        order = np.lexsort((times, terminal_codes))
+        terminal_codes = terminal_codes[order].astype(np.int32)
+        offsets = np.zeros(len(terminals) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(terminal_codes, minlength=len(terminals)))
+
+        os.makedirs(path, exist_ok=True)
+        arrays = {
+            "time": times[order],
+            "terminal": terminal_codes,
+            "member": member_codes[order].astype(np.int32),
+            "rssi": rssi[order],
+            "offsets": offsets,
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+        with open(os.path.join(path, "members.json"), "w", encoding="utf-8") as f:
+            json.dump(_to_json_values(members), f, ensure_ascii=False)
+        # meta.json is written last, so a snapshot without it is treated as incomplete
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"terminals": _to_json_values(terminals), "num_rows": int(len(times))}, f, ensure_ascii=False)
+
+        diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        diagnostics.info(f"Snapshot with {len(times)} events and {len(terminals)} terminals written to {path}")
+        return cls(path)
+
+    @property
+    def members(self) -> List:
+        """
+        Member IDs indexed by member code, loaded on first use.
+        """
+        if self._members is None:
+            with open(os.path.join(self.path, "members.json"), "r", encoding="utf-8") as f:
+                self._members = json.load(f)
+        return self._members
+
+    def terminal_slice(self, terminal_id) -> slice:
+        """
+        Return the row range of a terminal's events.
+        :param terminal_id: Terminal ID as stored in the snapshot.
+        """
+        i = self._terminal_index.get(terminal_id)
+        if i is None:
+            return slice(0, 0)
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def window(self, terminal_id, time_interval: Optional[Tuple[datetime, datetime]] = None) -> slice:
+        """
+        Return the row range of a terminal's events within an inclusive time interval.
+        Events are time-sorted within each terminal, so this is two binary searches.
+        """
+        rows = self.terminal_slice(terminal_id)
+        if not time_interval:
+            return rows
+        start_time, end_time = (np.datetime64(pd.Timestamp(t), "ns") for t in time_interval)
+        times = self.time[rows]
+        start = rows.start + int(np.searchsorted(times, start_time, side="left"))
+        stop = rows.start + int(np.searchsorted(times, end_time, side="right"))
+        return slice(start, stop)
+
+    def unique_members(self, terminal_id, rssi_threshold: Optional[float] = None,
+                       time_interval: Optional[Tuple[datetime, datetime]] = None) -> int:
+        """
+        Count distinct members seen by a terminal, with the same filters as PassByMethods.simple.
+        :param terminal_id: Terminal ID as stored in the snapshot.
+        :param rssi_threshold: Keep events with rssi strictly greater than this value (optional).
+        :param time_interval: Inclusive (start, end) time window (optional).
+        :return: Number of distinct members.
+        """
+        rows = self.window(terminal_id, time_interval)
+        members = self.member[rows]
+        if rssi_threshold is not None:
+            members = members[self.rssi[rows] > rssi_threshold]
+        return int(len(np.unique(members)))
+
+    def terminal_frame(self, terminal_id) -> pd.DataFrame:
+        """
+        Build the per-terminal DataFrame used by the tenant indicators.
+        memberId holds member codes; decode them with the members property if needed.
+        """
+        rows = self.terminal_slice(terminal_id)
+        return pd.DataFrame({
+            "terminalId": np.full(rows.stop - rows.start, terminal_id, dtype=object),
+            "memberId": self.member[rows],
+            "eventTime": self.time[rows],
+            "rssi": self.rssi[rows],
+        }, copy=False)
+
+    def terminal_data(self) -> "SnapshotTerminalData":
+        """
+        Return a lazy terminalId -> DataFrame mapping over the snapshot.
+        """
+        return SnapshotTerminalData(self)
+
+
+class SnapshotTerminalData(Mapping):
+    """
+    Read-only terminalId -> DataFrame mapping that builds each frame from the snapshot on access.
+    Drop-in replacement for BaseTenantIndicator.terminal_data entries.
+    """
+
+    def __init__(self, snapshot: EventSnapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, terminal_id) -> pd.DataFrame:
+        if terminal_id not in self.snapshot._terminal_index:
+            raise KeyError(terminal_id)
+        return self.snapshot.terminal_frame(terminal_id)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.snapshot.terminals)
+
+    def __len__(self) -> int:
+        return len(self.snapshot.terminals)
+
+
+def _to_json_values(values) -> list:
+    """
+    Convert factorized uniques (possibly NumPy scalars) to plain JSON values.
+    """
+    return [v.item() if isinstance(v, np.generic) else v for v in values]
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from typing import List, Tuple
+
+
+def merge_sorted_runs(values: np.ndarray, run_lengths: List[int]) -> Tuple[np.ndarray, int]:
+    """
+    Compute the stable ascending order of values made of consecutive runs, one per source file.
+    Runs that are already in order are kept as they are; only runs that are out of order are
+    sorted, each on its own. The sorted runs are then merged with NumPy's stable sort (timsort),
+    which detects the presorted runs and merges them in O(n log k) for k runs.
+    Missing values are placed last, like DataFrame.sort_values.
+    :param values: Sort keys of all rows, runs concatenated in order.
+    :param run_lengths: Number of rows in each run; must sum to len(values).
+    :return: Tuple of (row positions in sorted order, number of rows reordered within their own run).
+    """
+    if sum(run_lengths) != len(values):
+        raise ValueError(f"Run lengths add up to {sum(run_lengths)} rows, expected {len(values)}.")
+
+    missing = np.asarray(pd.isna(values), dtype=bool)
+    runs = []
+    reordered = 0
+    start = 0
+    for length in run_lengths:
+        run = np.arange(start, start + length)
+        run = run[~missing[start:start + length]]
+        keys = values[run]
+        if len(keys) > 1 and not (keys[1:] >= keys[:-1]).all():
+            local_order = np.argsort(keys, kind="stable")
+            reordered += int((local_order != np.arange(len(local_order))).sum())
+            run = run[local_order]
+        runs.append(run)
+        start += length
+
+    presorted = np.concatenate(runs) if runs else np.array([], dtype=np.int64)
+    order = presorted[np.argsort(values[presorted], kind="stable")]
+    return np.concatenate([order, np.flatnonzero(missing)]), reordered
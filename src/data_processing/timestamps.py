@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Tuple
+
+# Layout every BLE eventTime format is normalized to before parsing
+EVENT_TIME_FORMAT = "%Y/%m/%d %H:%M:%S"
+
+# eventTime formats of the raw BLE exports, in the order rows are classified
+EVENT_TIME_CLASSES = ("millisecond", "am", "pm", "other")
+
+# Transaction time formats: HHMM numbers composed arithmetically, anything else parsed as text
+TRANSACTION_TIME_CLASSES = ("numeric", "string")
+
+
+def normalize_event_times(values: pd.Series, stats: Optional[Dict[str, Dict[str, int]]] = None) -> pd.Series:
+    """
+    Parse raw BLE eventTime strings in bulk.
+    Each distinct string is parsed once and the result is broadcast back to the rows; a day of
+    second-resolution detections has at most 86,400 distinct values per format.
+    Rows are classified by format with Arrow string masks, rewritten with vectorized string
+    kernels and each class is converted with one to_datetime call:
+    - millisecond: '2024-12-09 16:45:00.000' ('.000' dropped, '-' read as '/')
+    - am: '2024/12/09 上午 10:15:00' (marker dropped, hour kept)
+    - pm: '2024/12/09 下午 03:20:00' (12 hours added unless the hour is 12; hours above 12 are invalid)
+    - other: already in '%Y/%m/%d %H:%M:%S'
+    Empty and non-string values, and values that do not parse, become NaT.
+    :param values: Series of raw eventTime values.
+    :param stats: Optional dictionary filled with {"rows", "invalid"} counts per format, plus the "empty"
+                  rows and the "unique" values among the "total" rows.
+    :return: datetime64 Series aligned with values.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # Parse each distinct string once; rows map to their value through the codes
+    codes, uniques = factorize_values(values)
+    rows_per_value = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+    strings = pa.array([v if isinstance(v, str) else None for v in uniques], type=pa.string())
+    text = pc.utf8_trim_whitespace(strings)
+    present = _flags(pc.not_equal(text, ""))
+
+    millisecond = present & _flags(pc.match_substring(text, ".000"))
+    am = present & ~millisecond & _flags(pc.match_substring(text, "上午"))
+    pm = present & ~millisecond & ~am & _flags(pc.match_substring(text, "下午"))
+    masks = {"millisecond": millisecond, "am": am, "pm": pm, "other": present & ~(millisecond | am | pm)}
+
+    # Dropping the marker leaves two spaces; to_datetime only takes its fast path on single spaces
+    normalized = {
+        "millisecond": lambda s: pc.replace_substring(pc.replace_substring(s, ".000", ""), "-", "/"),
+        "am": lambda s: pc.replace_substring(pc.utf8_trim_whitespace(pc.replace_substring(s, "上午", "")), "  ", " "),
+        "pm": lambda s: pc.replace_substring(pc.utf8_trim_whitespace(pc.replace_substring(s, "下午", "")), "  ", " "),
+        "other": lambda s: s,
+    }
+
+    parsed_values = np.full(len(uniques), np.datetime64("NaT"), dtype="datetime64[ns]")
+    counts = {"empty": int(len(values) - rows_per_value[present].sum()), "unique": len(uniques), "total": len(values)}
+    for name in EVENT_TIME_CLASSES:
+        positions = np.flatnonzero(masks[name])
+        strings = normalized[name](text.filter(pa.array(masks[name]))).to_numpy(zero_copy_only=False)
+        parsed = pd.to_datetime(pd.Series(strings, dtype=object), format=EVENT_TIME_FORMAT, errors="coerce")
+        if name == "pm":
+            hours = parsed.dt.hour.to_numpy()
+            shift = np.where(hours == 12, 0, 12).astype("timedelta64[h]")
+            parsed = (parsed + shift).where(~(hours > 12))
+        parsed_values[positions] = parsed.to_numpy()
+        rows = rows_per_value[positions]
+        counts[name] = {"rows": int(rows.sum()), "invalid": int(rows[parsed.isna().to_numpy()].sum())}
+
+    if stats is not None:
+        stats.update(counts)
+    return broadcast_values(parsed_values, codes, values)
+
+
+def compose_timestamps(dates: pd.Series, times: pd.Series, fmt: str,
+                       stats: Optional[Dict[str, int]] = None) -> pd.Series:
+    """
+    Parse timestamps split into a date column and a time column, e.g. '2024-12-09' and '1345'.
+    Each distinct (date, time) pair is joined as 'date time' and parsed once.
+    Rows where either part is missing become NaT.
+    :param dates: Series of dates.
+    :param times: Series of times, aligned with dates.
+    :param fmt: to_datetime format of the joined string, e.g. '%Y-%m-%d %H%M'.
+    :param stats: Optional dictionary filled with the "unique" pair count, "total" rows and "invalid" rows.
+    :return: datetime64 Series aligned with dates.
+    """
+    date_codes, date_values = factorize_values(dates)
+    time_codes, time_values = factorize_values(times)
+    missing = (date_codes < 0) | (time_codes < 0)
+    codes = np.full(len(dates), -1, dtype=np.int64)
+    codes[~missing], pairs = pd.factorize(date_codes[~missing] * len(time_values) + time_codes[~missing])
+
+    # Strings are formatted over the distinct values, as astype(str) would format the whole column
+    date_strings = pd.Series(date_values).astype(str).to_numpy(dtype=object)
+    time_strings = pd.Series(time_values).astype(str).to_numpy(dtype=object)
+    joined = date_strings[pairs // max(len(time_values), 1)] + " " + time_strings[pairs % max(len(time_values), 1)]
+    parsed_values = pd.to_datetime(pd.Series(joined, dtype=object), format=fmt, errors="coerce").to_numpy()
+
+    result = broadcast_values(parsed_values, codes, dates)
+    if stats is not None:
+        stats.update({"unique": len(pairs), "total": len(dates), "invalid": int(result.isna().sum())})
+    return result
+
+
+def compose_hhmm_timestamps(dates: pd.Series, times: pd.Series, date_format: str = "%Y-%m-%d",
+                            stats: Optional[Dict] = None) -> pd.Series:
+    """
+    Build timestamps from a date column and an HHMM time column, e.g. '2024-12-09' and 1345.
+    Each distinct date is parsed once; numeric times, and strings of digits such as '0905', are
+    added to their date as time // 100 hours and time % 100 minutes with timedelta arrays, without
+    formatting any string. Other times are joined with their date and parsed by compose_timestamps
+    with '<date_format> %H%M'. Numeric times that are not whole numbers or not a valid HHMM become NaT,
+    as do rows where either part is missing.
+    :param dates: Series of dates (strings or datetimes).
+    :param times: Series of HHMM times, aligned with dates.
+    :param date_format: to_datetime format of the date strings.
+    :param stats: Optional dictionary filled with {"rows", "invalid"} counts per TRANSACTION_TIME_CLASSES
+                  format, plus the "empty" rows and the "unique" values parsed among the "total" rows.
+    :return: datetime64 Series aligned with dates.
+    """
+    date_codes, date_values = factorize_values(dates)
+    time_codes, time_values = factorize_values(times)
+    days = pd.to_datetime(pd.Series(date_values, dtype=object), format=date_format, errors="coerce")
+    day_values = days.dt.normalize().to_numpy(dtype="datetime64[ns]")
+
+    if np.issubdtype(time_values.dtype, np.number):
+        numeric = np.ones(len(time_values), dtype=bool)
+        hhmm = time_values.astype(np.float64)
+    else:
+        # Digit-only strings take the numeric path too, so '5' and 5 give the same time
+        values = [_hhmm_number(v) for v in time_values]
+        numeric = np.array([v is not None for v in values], dtype=bool)
+        hhmm = np.array([v for v in values if v is not None], dtype=np.float64)
+    valid = (hhmm == np.floor(hhmm)) & (hhmm >= 0) & (hhmm // 100 < 24) & (hhmm % 100 < 60)
+    minutes = (hhmm[valid] // 100 * 60 + hhmm[valid] % 100).astype(np.int64)
+    offsets = np.full(len(time_values), np.timedelta64("NaT"), dtype="timedelta64[ns]")
+    offsets[np.flatnonzero(numeric)[valid]] = minutes.astype("timedelta64[m]")
+
+    present = (date_codes >= 0) & (time_codes >= 0)
+    numeric_rows = present & numeric[np.maximum(time_codes, 0)]
+    string_rows = present & ~numeric_rows
+
+    result = np.full(len(dates), np.datetime64("NaT"), dtype="datetime64[ns]")
+    result[numeric_rows] = day_values[date_codes[numeric_rows]] + offsets[time_codes[numeric_rows]]
+    string_stats = {"unique": 0, "invalid": 0}
+    if string_rows.any():
+        parsed = compose_timestamps(dates[string_rows], times[string_rows], fmt=f"{date_format} %H%M",
+                                    stats=string_stats)
+        result[string_rows] = parsed.to_numpy()
+
+    if stats is not None:
+        stats.update({
+            "numeric": {"rows": int(numeric_rows.sum()), "invalid": int(np.isnat(result[numeric_rows]).sum())},
+            "string": {"rows": int(string_rows.sum()), "invalid": string_stats["invalid"]},
+            "empty": int((~present).sum()),
+            "unique": len(date_values) + string_stats["unique"],
+            "total": len(dates),
+        })
+    return pd.Series(result, index=dates.index, name=dates.name)
+
+
+def _hhmm_number(value) -> Optional[float]:
+    """
+    Return a time value as a number if it is numeric or a string of digits, otherwise None.
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return None
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if isinstance(value, str) and value.strip().isdigit() and value.strip().isascii():
+        return float(value.strip())
+    return None
+
+
+def factorize_values(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode a column as integer codes into its distinct values, missing values as -1.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    return codes, np.asarray(uniques)
+
+
+def broadcast_values(parsed_values: np.ndarray, codes: np.ndarray, like: pd.Series) -> pd.Series:
+    """
+    Map per-value results back to the rows through their codes; code -1 gives NaT.
+    """
+    result = parsed_values.take(np.maximum(codes, 0)) if len(parsed_values) else np.empty(len(codes), parsed_values.dtype)
+    result[codes < 0] = np.datetime64("NaT")
+    return pd.Series(result, index=like.index, name=like.name)
+
+
+def unique_ratio(stats: Optional[Dict]) -> Optional[float]:
+    """
+    Share of distinct values among the rows of a timestamp parse; parsing cost scales with it.
+    """
+    if not stats or not stats.get("total"):
+        return None
+    return stats["unique"] / stats["total"]
+
+
+def format_event_time_stats(stats: Dict, classes: Tuple[str, ...] = EVENT_TIME_CLASSES) -> str:
+    """
+    One-line summary of the per-format counts filled by normalize_event_times or compose_hhmm_timestamps.
+    """
+    parts = [f"{name} {stats[name]['rows']} 筆 (無效 {stats[name]['invalid']})" for name in classes
+             if stats[name]["rows"]]
+    return ", ".join(parts + [f"空值 {stats['empty']} 筆"])
+
+
+def _flags(mask) -> np.ndarray:
+    """
+    Convert an Arrow boolean array to a NumPy mask, treating nulls as False.
+    """
+    return mask.fill_null(False).to_numpy(zero_copy_only=False)
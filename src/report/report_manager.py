@@ -10,6 +10,7 @@ from src.business.tenant_indicators.visit_rate import VisitRateIndicator
 from src.business.tenant_indicators.pass_by import PassByIndicator
 from src.business.tenant_indicators.dwell_rate import DwellRateIndicator
 from src.business.tenant_indicators.bagging_rate import BaggingRateIndicator
+from src.business.base_tenant_indicator import BaseTenantIndicator
 
 class ReportManager:
     """
@@ -39,7 +40,7 @@ class ReportManager:
         Generate a daily report for all tenants, including pass-by, visit, dwell, and bagging metrics.
         """
         # Load tenant mapping
-        tenant_mapping = pd.read_excel(self.tenant_mapping_path).set_index("terminalId")["tenantName"].to_dict()
+        tenant_mapping = BaseTenantIndicator.load_tenant_mapping(self.tenant_mapping_path)
 
         # Prepare Excel writer
         output_file = self.output_dir / f"tenant_report_{date}.xlsx"
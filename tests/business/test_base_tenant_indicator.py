@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from src.business.base_tenant_indicator import BaseTenantIndicator
+from src.business.tenant_indicators.pass_by import PassByIndicator
+from src.business.tenant_indicators.visit_rate import VisitRateIndicator
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from tests.data_processing.sample_data import write_raw_ble_files
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.mapping_path = os.path.join(self.tmp_dir.name, "tenant_terminalId_mappingtable.xlsx")
+        self.thresholds_path = os.path.join(self.tmp_dir.name, "tenant_rssi_thresholds.xlsx")
+        pd.DataFrame({"terminalId": ["T1", "T2"], "tenantName": ["NIKE", "ADIDAS"]}).to_excel(self.mapping_path, index=False)
+        pd.DataFrame({
+            "terminalId": ["T1", "T2"],
+            "pass_by_rssi_threshold": [-70, -75],
+            "entry_rssi_threshold": [-60, -65],
+        }).to_excel(self.thresholds_path, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_workbooks_parsed_once_across_indicators(self):
+        with mock.patch("src.business.base_tenant_indicator.pd.read_excel", wraps=pd.read_excel) as read_excel:
+            for indicator in (PassByIndicator(), VisitRateIndicator(), PassByIndicator()):
+                indicator.set_tenant_mapping(self.mapping_path)
+                indicator.set_rssi_thresholds_from_file(self.thresholds_path)
+            self.assertEqual(read_excel.call_count, 2)
+
+        self.assertEqual(indicator.get_mapping()["T2"], "ADIDAS")
+        self.assertEqual(indicator._entry_rssi_threshold["T1"], -60)
+
+    def test_mappings_are_read_only(self):
+        mapping = BaseTenantIndicator.load_tenant_mapping(self.mapping_path)
+        with self.assertRaises(TypeError):
+            mapping["T3"] = "PUMA"
+
+    def test_cache_invalidated_when_file_changes(self):
+        BaseTenantIndicator.load_tenant_mapping(self.mapping_path)
+        pd.DataFrame({"terminalId": ["T1"], "tenantName": ["PUMA"]}).to_excel(self.mapping_path, index=False)
+        stat = os.stat(self.mapping_path)
+        os.utime(self.mapping_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(dict(BaseTenantIndicator.load_tenant_mapping(self.mapping_path)), {"T1": "PUMA"})
+
+
+class TestIdDictionaryIndicators(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp_dir.name, "raw")
+        os.makedirs(self.directory)
+        write_raw_ble_files(self.directory)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def pass_by(self, id_dictionary_path=None) -> PassByIndicator:
+        cleaner = BLECleaner(directory=self.directory)
+        if id_dictionary_path:
+            cleaner.enable_id_dictionary(id_dictionary_path)
+        cleaner.load_data(pattern=r"\.csv$")
+        cleaner.clean()
+        indicator = PassByIndicator()
+        indicator.set_cleaner("ble_cleaner", cleaner)
+        return indicator
+
+    def test_encoded_data_gives_same_counts(self):
+        plain = self.pass_by()
+        encoded = self.pass_by(os.path.join(self.tmp_dir.name, "ids"))
+
+        self.assertEqual(sorted(encoded.terminal_data["ble_cleaner"]), ["T1", "T2", "T3"])
+        pd.testing.assert_frame_equal(encoded.count(), plain.count())
+        pd.testing.assert_frame_equal(encoded.count(method="advanced"), plain.count(method="advanced"))
+
+        members = encoded.terminal_data["ble_cleaner"]["T1"]["memberId"]
+        self.assertEqual(set(encoded.decode_members(members)), set(plain.terminal_data["ble_cleaner"]["T1"]["memberId"]))
+
+    def test_missing_member_is_not_counted(self):
+        path = os.path.join(self.directory, "2024-12-09_T1.csv")
+        raw = pd.read_csv(path)
+        raw.loc[[0, 3], "UserId"] = None
+        raw.to_csv(path, index=False)
+
+        plain = self.pass_by()
+        encoded = self.pass_by(os.path.join(self.tmp_dir.name, "ids"))
+        pd.testing.assert_frame_equal(encoded.count(), plain.count())
+        members = encoded.terminal_data["ble_cleaner"]["T1"]["memberId"]
+        self.assertTrue(members.isna().any())
+        self.assertEqual(members.nunique(), plain.terminal_data["ble_cleaner"]["T1"]["memberId"].nunique())
+
+    def test_numeric_terminal_ids_keep_mapping_and_thresholds(self):
+        directory = os.path.join(self.tmp_dir.name, "numeric")
+        os.makedirs(directory)
+        write_raw_ble_files(directory, terminals=(299182, 299183))
+        mapping_path = os.path.join(self.tmp_dir.name, "mapping.xlsx")
+        thresholds_path = os.path.join(self.tmp_dir.name, "thresholds.xlsx")
+        pd.DataFrame({"terminalId": [299182, 299183], "tenantName": ["A", "B"]}).to_excel(mapping_path, index=False)
+        pd.DataFrame({
+            "terminalId": [299182, 299183],
+            "pass_by_rssi_threshold": [-43, -100],
+            "entry_rssi_threshold": [-43, -100],
+        }).to_excel(thresholds_path, index=False)
+
+        counts = []
+        for id_dictionary_path in (None, os.path.join(self.tmp_dir.name, "ids")):
+            cleaner = BLECleaner(directory=directory)
+            if id_dictionary_path:
+                cleaner.enable_id_dictionary(id_dictionary_path)
+            cleaner.load_data(pattern=r"\.csv$")
+            cleaner.clean()
+            indicator = PassByIndicator()
+            indicator.set_tenant_mapping(mapping_path)
+            indicator.set_rssi_thresholds_from_file(thresholds_path)
+            indicator.set_cleaner("ble_cleaner", cleaner)
+            self.assertEqual(sorted(indicator.terminal_data["ble_cleaner"]), [299182, 299183])
+            counts.append(indicator.count())
+
+        pd.testing.assert_frame_equal(counts[1], counts[0])
+        self.assertEqual(counts[1]["tenantName"].tolist(), ["A", "B"])
+        self.assertLess(counts[1]["passByCount"].iloc[0], counts[1]["passByCount"].iloc[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
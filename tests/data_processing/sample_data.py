@@ -0,0 +1,75 @@
+import os
+import json
+import pandas as pd
+
+
+def make_raw_ble_frame(rows_per_terminal: int = 6, terminals=("T1", "T2", "T3"), date: str = "2024/12/09") -> pd.DataFrame:
+    """
+    Build a small raw BLE export in the layout produced by the scanning terminals.
+    Event times mix the 上午/下午 and millisecond formats seen in real exports.
+    """
+    records = []
+    for t_idx, terminal_id in enumerate(terminals):
+        for i in range(rows_per_terminal):
+            member_id = f"M{i % 4}"
+            second = (t_idx * rows_per_terminal + i) % 60
+            if i % 3 == 0:
+                event_time = f"{date} 上午 10:15:{second:02}"
+            elif i % 3 == 1:
+                event_time = f"{date} 下午 03:20:{second:02}"
+            else:
+                event_time = f"{date.replace('/', '-')} 16:45:{second:02}.000"
+            address = "02011a020a0c0aff4c001005" if i % 5 != 4 else "0201060303aafe1116aafe20"
+            records.append({
+                "BeaconRecordId": len(records) + 1,
+                "ConglomeratedId": 1,
+                "StoreId": 100,
+                "POSCode": terminal_id,
+                "UserId": member_id,
+                "PLICd": "BLE",
+                "PLIEventCd": "SCAN",
+                "PLIEventTimestamp": event_time,
+                "Distance": 1.5,
+                "RawData": json.dumps({"AD3": address, "rssi": -40 - i - t_idx}),
+                "Source": "terminal",
+            })
+    return pd.DataFrame(records)
+
+
+def write_raw_ble_files(directory: str, date: str = "2024-12-09", terminals=("T1", "T2", "T3"), rows_per_terminal: int = 6) -> list:
+    """
+    Write one raw BLE CSV per terminal and return the file paths.
+    """
+    paths = []
+    for terminal_id in terminals:
+        df = make_raw_ble_frame(rows_per_terminal=rows_per_terminal, terminals=(terminal_id,), date=date.replace("-", "/"))
+        path = os.path.join(directory, f"{date}_{terminal_id}.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def make_processed_ble_frame(rows: int = 200, terminals=("T1", "T2", "T3"), date: str = "2024-12-09") -> pd.DataFrame:
+    """
+    Build a cleaned BLE frame in the layout saved to data/processed/ble.
+    About a third of the rows are non-Apple advertisements.
+    """
+    records = []
+    for i in range(rows):
+        hour, minute, second = 11 + (i // 60) % 10, i % 60, (i * 7) % 60
+        if i % 3 == 0:
+            address = "0201060303aafe1116aafe20"
+        elif i % 7 == 0:
+            address = "1a0201060aff4c000215aaaa"
+        else:
+            address = "02011a020a0c0aff4c001005"
+        records.append({
+            "id": i + 1,
+            "terminalId": terminals[i % len(terminals)],
+            "memberId": f"M{i % 17}",
+            "eventType": "SCAN",
+            "eventTime": f"{date} {hour:02}:{minute:02}:{second:02}",
+            "accessAddress": address,
+            "rssi": -40 - (i % 50),
+        })
+    return pd.DataFrame(records)
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from tests.data_processing.sample_data import make_processed_ble_frame
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+APPLE_DEVICES_CFG = os.path.join(REPO_ROOT, "src", "data_processing", "configs", "ble", "ble_get_apple_devices.json")
+
+
+class TestBaseCleaner(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        for terminal_id in ["T1", "T2"]:
+            df = make_processed_ble_frame(rows=150, terminals=(terminal_id,))
+            df.to_csv(os.path.join(self.directory, f"2024-12-09_{terminal_id}.csv"), index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_streaming_load_matches_full_load(self):
+        full = BLECleaner(directory=self.directory)
+        full.load_data(pattern=r"2024-12-09.*\.csv")
+        full.execute_steps(APPLE_DEVICES_CFG)
+
+        streamed = BLECleaner(directory=self.directory)
+        streamed.load_data(pattern=r"2024-12-09.*\.csv", chunksize=16, cfg=APPLE_DEVICES_CFG)
+
+        self.assertGreater(len(streamed.data), 0)
+        self.assertTrue((streamed.data["accessAddress"].str[14:20] == "ff4c00").all())
+        self.assertEqual(sorted(full.data["id"].tolist()), sorted(streamed.data["id"].tolist()))
+        self.assertTrue(streamed.data["eventTime"].is_monotonic_increasing)
+
+
+if __name__ == "__main__":
+    unittest.main()
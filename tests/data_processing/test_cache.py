@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.data_processing.cache import CleanedDataCache
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from tests.data_processing.sample_data import write_raw_ble_files
+
+
+class TestCleanedDataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp_dir.name, "ble")
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        os.makedirs(self.data_dir)
+        self.paths = write_raw_ble_files(self.data_dir)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_fingerprint_changes_with_inputs(self):
+        key = CleanedDataCache.fingerprint(self.paths, {"version": 1})
+        self.assertEqual(key, CleanedDataCache.fingerprint(list(reversed(self.paths)), {"version": 1}))
+        self.assertNotEqual(key, CleanedDataCache.fingerprint(self.paths, {"version": 2}))
+
+        with open(self.paths[0], "a") as f:
+            f.write("\n")
+        self.assertNotEqual(key, CleanedDataCache.fingerprint(self.paths, {"version": 1}))
+
+    def test_load_cleaned_reuses_cache(self):
+        cleaner = BLECleaner(directory=self.data_dir)
+        cleaner.enable_cache(self.cache_dir)
+        first = cleaner.load_cleaned(pattern=r"2024-12-09.*\.csv")
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        second_cleaner = BLECleaner(directory=self.data_dir)
+        second_cleaner.enable_cache(self.cache_dir)
+        second_cleaner.clean = None  # A cache hit must not run clean() again
+        second = second_cleaner.load_cleaned(pattern=r"2024-12-09.*\.csv")
+        pd.testing.assert_frame_equal(first.reset_index(drop=True), second.reset_index(drop=True))
+
+    def test_sheet_name_column_changes_key(self):
+        cleaner = BLECleaner(directory=self.data_dir)
+        self.assertNotEqual(CleanedDataCache.fingerprint(self.paths, cleaner.cache_config()),
+                            CleanedDataCache.fingerprint(self.paths, cleaner.cache_config(sheet_name_column="sheet")))
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            CleanedDataCache(self.cache_dir, fmt="orc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from src.data_processing.catalog import PartitionCatalog, date_in_name
+from src.data_processing.loader import DataManager
+
+
+class TestPartitionCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        for date in ["2024-12-09", "2024-12-10", "2024-12-11"]:
+            for terminal_id in ["T1", "T2"]:
+                df = pd.DataFrame({"terminalId": [terminal_id] * 2, "memberId": ["M1", "M2"], "rssi": [-50, -60]})
+                df.to_csv(os.path.join(self.directory, f"{date}_{terminal_id}.csv"), index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_index_is_persisted(self):
+        catalog = PartitionCatalog(self.directory)
+        self.assertEqual(catalog.dates(), ["2024-12-09", "2024-12-10", "2024-12-11"])
+        catalog.files(date_range=("2024-12-10", "2024-12-10"), terminal_ids=["T2"])
+
+        with open(catalog.index_path, "r", encoding="utf-8") as f:
+            entries = json.load(f)["files"]
+        self.assertEqual(entries["2024-12-10_T2.csv"]["terminals"], ["T2"])
+        # Contents are only read for the files a terminal lookup covered
+        self.assertNotIn("terminals", entries["2024-12-09_T2.csv"])
+
+    def test_lookup_stats_only_files_in_range(self):
+        catalog = PartitionCatalog.for_directory(self.directory)
+        with mock.patch("src.data_processing.catalog.os.stat", wraps=os.stat) as stat, \
+                mock.patch("src.data_processing.catalog.pd.read_csv", wraps=pd.read_csv) as read_csv:
+            files = PartitionCatalog.for_directory(self.directory).files(date_range=("2024-12-10", "2024-12-10"))
+        self.assertEqual(len(files), 2)
+        stat_paths = [call.args[0] for call in stat.call_args_list]
+        self.assertEqual(sorted(os.path.basename(p) for p in stat_paths if p != self.directory),
+                         ["2024-12-10_T1.csv", "2024-12-10_T2.csv"])
+        read_csv.assert_not_called()
+        self.assertIs(PartitionCatalog.for_directory(self.directory), catalog)
+
+    def test_files_pruned_by_date_and_terminal(self):
+        catalog = PartitionCatalog(self.directory)
+        files = catalog.files(date_range=("2024-12-10", "2024-12-11"), terminal_ids=["T1"])
+        self.assertEqual([os.path.basename(f) for f in files], ["2024-12-10_T1.csv", "2024-12-11_T1.csv"])
+
+    def test_refresh_picks_up_new_files(self):
+        catalog = PartitionCatalog(self.directory)
+        pd.DataFrame({"terminalId": ["T3"]}).to_csv(os.path.join(self.directory, "2024-12-12_T3.csv"), index=False)
+        catalog.refresh()
+        self.assertEqual(len(catalog.files(date_range=("2024-12-12", "2024-12-12"))), 1)
+
+    def test_new_and_deleted_files_seen_without_refresh(self):
+        catalog = PartitionCatalog.for_directory(self.directory)
+        self.assertEqual(len(catalog.files()), 6)
+        pd.DataFrame({"terminalId": ["T3"]}).to_csv(os.path.join(self.directory, "2024-12-12_T3.csv"), index=False)
+        os.remove(os.path.join(self.directory, "2024-12-09_T1.csv"))
+        self.assertEqual(catalog.dates(), ["2024-12-09", "2024-12-10", "2024-12-11", "2024-12-12"])
+        self.assertEqual(len(catalog.files(terminal_ids=["T3"])), 1)
+        self.assertEqual(len(catalog.files(date_range=("2024-12-09", "2024-12-09"))), 1)
+
+    def test_index_kept_outside_data_directory(self):
+        index_path = os.path.join(self.directory, "index", "catalog.json")
+        os.makedirs(os.path.dirname(index_path))
+        data_dir = os.path.join(self.directory, "data")
+        os.makedirs(data_dir)
+        for name in os.listdir(self.directory):
+            if name.endswith(".csv"):
+                os.replace(os.path.join(self.directory, name), os.path.join(data_dir, name))
+        os.chmod(data_dir, 0o555)
+        try:
+            manager = DataManager(directory=data_dir, catalog_path=index_path)
+            self.assertEqual(len(manager.load_files(date_range=("2024-12-09", "2024-12-09"))), 4)
+        finally:
+            os.chmod(data_dir, 0o755)
+        self.assertTrue(os.path.exists(index_path))
+        self.assertNotIn(PartitionCatalog.INDEX_FILE_NAME, os.listdir(data_dir))
+
+    def test_appended_rows_are_indexed(self):
+        catalog = PartitionCatalog.for_directory(self.directory)
+        self.assertEqual(catalog.files(terminal_ids=["T9"]), [])
+        path = os.path.join(self.directory, "2024-12-09_T1.csv")
+        with open(path, "a") as f:
+            f.write("T9,M3,-70\n")
+        files = PartitionCatalog.for_directory(self.directory).files(terminal_ids=["T9"])
+        self.assertEqual(files, [path])
+
+    def test_date_in_name(self):
+        self.assertEqual(date_in_name("ble_20241209.csv"), "2024-12-09")
+        self.assertEqual(date_in_name("export_12345678_2024-12-10.csv"), "2024-12-10")
+        self.assertIsNone(date_in_name("export_123456789.csv"))
+        self.assertIsNone(date_in_name("record_12345678.csv"))
+
+    def test_data_manager_date_range(self):
+        manager = DataManager(directory=self.directory)
+        data = manager.load_files(date_range=("2024-12-09", "2024-12-09"))
+        self.assertEqual(len(data), 4)
+        # The persisted index is never loaded as a data file
+        self.assertEqual(len(manager.load_files()), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
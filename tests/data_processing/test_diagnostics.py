@@ -0,0 +1,92 @@
+import io
+import os
+import tempfile
+import unittest
+import pandas as pd
+from contextlib import redirect_stdout
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.diagnostics import Diagnostics
+from src.data_processing.snapshot import EventSnapshot
+from tests.data_processing.sample_data import write_raw_ble_files
+
+
+class TestDiagnostics(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_levels_filter_messages(self):
+        diagnostics = Diagnostics(level="warning", echo=False)
+        diagnostics.debug("hidden")
+        diagnostics.info("hidden")
+        diagnostics.warning("shown")
+        self.assertEqual(diagnostics.recent(), [("warning", "shown")])
+        self.assertEqual(diagnostics.counters["messages.info"], 1)
+        self.assertFalse(diagnostics.enabled("info"))
+        with self.assertRaises(ValueError):
+            Diagnostics(level="verbose")
+
+    def test_samples_capped_and_rows_spilled(self):
+        spill_dir = os.path.join(self.directory, "spill")
+        diagnostics = Diagnostics(max_samples=5, spill_dir=spill_dir, echo=False)
+        for start in (0, 4):
+            diagnostics.record_rows("bad", pd.DataFrame({"x": range(start, start + 4)}), "Bad rows")
+
+        self.assertEqual(diagnostics.counters["bad"], 8)
+        self.assertEqual(diagnostics.samples["bad"]["x"].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(pd.read_csv(os.path.join(spill_dir, "bad.csv"))["x"].tolist(), list(range(8)))
+        self.assertEqual(diagnostics.summary(), {"counters": {"bad": 8, "messages.warning": 2}, "samples": {"bad": 5}})
+
+    def test_cleaner_records_invalid_event_times(self):
+        write_raw_ble_files(self.directory)
+        path = os.path.join(self.directory, "2024-12-09_T1.csv")
+        raw = pd.read_csv(path)
+        raw.loc[:2, "PLIEventTimestamp"] = "not a time"
+        raw.to_csv(path, index=False)
+
+        diagnostics = Diagnostics(level="error", max_samples=2)
+        cleaner = BLECleaner(directory=self.directory, diagnostics=diagnostics)
+        cleaner.load_data(pattern=r"\.csv$")
+        cleaner.clean()
+
+        self.assertEqual(diagnostics.counters["invalid_eventTime"], 3)
+        self.assertEqual(len(diagnostics.samples["invalid_eventTime"]), 2)
+        self.assertEqual(diagnostics.recent(), [])
+
+    def test_silent_run_prints_nothing(self):
+        write_raw_ble_files(self.directory)
+        diagnostics = Diagnostics(echo=False)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cleaner = BLECleaner(directory=self.directory, diagnostics=diagnostics)
+            cleaner.load_data(pattern=r"\.csv$")
+            cleaner.clean()
+            cleaner.sort("eventTime")
+        self.assertEqual(output.getvalue(), "")
+        self.assertTrue(any(message.startswith("Loaded ") for _, message in diagnostics.recent()))
+
+    def test_cache_catalog_and_snapshot_messages_use_the_sink(self):
+        write_raw_ble_files(self.directory)
+        with open(os.path.join(self.directory, "2024-12-10_T9.csv"), "wb") as f:
+            f.write(b"POSCode\n\xff\xfe\n")
+        diagnostics = Diagnostics(echo=False)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cleaner = BLECleaner(directory=self.directory, diagnostics=diagnostics)
+            cleaner.enable_cache(os.path.join(self.directory, "cache"))
+            cleaner.cache.save("mixed", pd.DataFrame({"value": [1, "a"]}))
+            cleaner.data_manager.resolve_files(terminal_ids=["T1"])
+            data = cleaner.load_cleaned(pattern=r"2024-12-09.*\.csv$")
+            EventSnapshot.write(data, os.path.join(self.directory, "snapshot"), diagnostics=diagnostics)
+        self.assertEqual(output.getvalue(), "")
+        messages = [message for _, message in diagnostics.recent()]
+        self.assertTrue(any(message.startswith("Could not write cache file") for message in messages))
+        self.assertTrue(any(message.startswith("Could not index contents") for message in messages))
+        self.assertTrue(any(message.startswith("Snapshot with") for message in messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
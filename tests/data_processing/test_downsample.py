@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner, downsample_detections
+from src.data_processing.diagnostics import Diagnostics
+from src.business.tenant_indicators.analytic_methods.dwell_rate_methods import DwellRateMethods
+from src.business.tenant_indicators.analytic_methods.pass_by_methods import PassByMethods
+
+
+def detections(rows: int = 400, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-12-09 10:00:00")
+    return pd.DataFrame({
+        "id": np.arange(1, rows + 1),
+        "terminalId": rng.choice(["T1", "T2"], rows),
+        "memberId": rng.choice(["M1", "M2", "M3"], rows),
+        "eventTime": start + pd.to_timedelta(np.sort(rng.integers(0, 60_000, rows)), unit="ms"),
+        "rssi": rng.integers(-90, -40, rows).astype(float),
+    })
+
+
+class TestDownsample(unittest.TestCase):
+    def test_matches_groupby_on_floored_times(self):
+        data = detections()
+        data.loc[5, "rssi"] = np.nan
+        result = downsample_detections(data, "5s")
+
+        expected = (data.assign(bucket=data["eventTime"].dt.floor("5s"))
+                    .groupby(["memberId", "terminalId", "bucket"])
+                    .agg(id=("id", "first"), eventTime=("eventTime", "min"), lastEventTime=("eventTime", "max"),
+                         rssi=("rssi", "max"), hits=("id", "size"))
+                    .sort_values("id"))
+        self.assertEqual(result["id"].tolist(), expected["id"].tolist())
+        np.testing.assert_array_equal(result["eventTime"].to_numpy(), expected["eventTime"].to_numpy())
+        np.testing.assert_array_equal(result["lastEventTime"].to_numpy(), expected["lastEventTime"].to_numpy())
+        np.testing.assert_array_equal(result["rssi"].to_numpy(), expected["rssi"].to_numpy())
+        self.assertEqual(result["hits"].tolist(), expected["hits"].tolist())
+        self.assertEqual(result["hits"].sum(), len(data))
+
+    def test_hits_add_up_when_downsampled_again(self):
+        data = detections()
+        twice = downsample_detections(downsample_detections(data, "1s"), "10s")
+        once = downsample_detections(data, "10s")
+        pd.testing.assert_frame_equal(twice, once)
+
+        thresholds = [{"T1": -60, "T2": -70}, {"T1": -50}]
+        twice = downsample_detections(downsample_detections(data, "1s", thresholds), "10s", thresholds)
+        pd.testing.assert_frame_equal(twice, downsample_detections(data, "10s", thresholds))
+
+    def test_dwell_counts_match_without_downsampling(self):
+        data = detections()
+        entry_thresholds = {"T1": -60, "T2": -70}
+
+        def dwell_counts(frame, rssi_thresholds=None):
+            terminal_data = {terminal: group for terminal, group in frame.groupby("terminalId")}
+            return DwellRateMethods.simple(terminal_data, {}, rssi_thresholds=rssi_thresholds,
+                                           dwell_time_thresholds=[10, 30, 50, 55])
+
+        expected = dwell_counts(data)
+        self.assertEqual(expected["dwellCount_55"].sum(), 6)
+        pd.testing.assert_frame_equal(dwell_counts(downsample_detections(data, "10s")), expected)
+
+        expected = dwell_counts(data, entry_thresholds)
+        downsampled = downsample_detections(data, "10s", [entry_thresholds])
+        self.assertLess(len(downsampled), len(data) / 4)
+        pd.testing.assert_frame_equal(dwell_counts(downsampled, entry_thresholds), expected)
+
+    def test_advanced_pass_by_counts_hits(self):
+        data = detections()
+        downsampled = downsample_detections(data, "10s", [{"T1": -75, "T2": -75}])
+
+        def pass_by(frame):
+            return PassByMethods.advanced({terminal: group for terminal, group in frame.groupby("terminalId")}, {})
+
+        self.assertLess(len(downsampled), len(data) / 4)
+        pd.testing.assert_frame_equal(pass_by(downsampled), pass_by(data))
+
+    def test_cleaner_reports_ratio(self):
+        cleaner = BLECleaner(diagnostics=Diagnostics(echo=False))
+        cleaner.data = detections()
+        cleaner.downsample(bucket="30s")
+        self.assertLessEqual(len(cleaner.data), 3 * 2 * 2)
+        self.assertTrue((cleaner.data["lastEventTime"] >= cleaner.data["eventTime"]).all())
+        self.assertAlmostEqual(cleaner.downsample_ratio, len(cleaner.data) / 400)
+        self.assertEqual(cleaner.diagnostics.counters["downsampled_rows"], 400 - len(cleaner.data))
+        with self.assertRaises(ValueError):
+            cleaner.downsample(bucket="0s")
+
+
+if __name__ == "__main__":
+    unittest.main()
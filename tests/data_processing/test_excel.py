@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.data_processing.cleaners.transaction_cleaner import TransactionCleaner
+from src.data_processing.loader import DataManager
+from src.data_processing.projection import TRANSACTION_PROJECTION
+
+
+def make_transaction_frame(rows: int, month: int) -> pd.DataFrame:
+    """
+    Build a small POS export in the layout of the monthly transaction workbooks.
+    """
+    return pd.DataFrame({
+        "店別": ["A01"] * rows,
+        "櫃位": [f"Tenant{i % 3}" for i in range(rows)],
+        "機號": [f"P{i % 4}" for i in range(rows)],
+        "序號": list(range(rows)),
+        "交易日期": [f"2024-{month:02}-{1 + i % 28:02}" for i in range(rows)],
+        "交易時間": [f"{10 + i % 10:02}{i % 60:02}" for i in range(rows)],
+        "金額": [100.0 + i for i in range(rows)],
+    })
+
+
+class TestExcelStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        self.file_path = os.path.join(self.directory, "transactions.xlsx")
+        with pd.ExcelWriter(self.file_path) as writer:
+            make_transaction_frame(7, month=11).to_excel(writer, sheet_name="2024-11", index=False)
+            make_transaction_frame(5, month=12).to_excel(writer, sheet_name="2024-12", index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_streamed_matches_full_read(self):
+        manager = DataManager(file_path=self.file_path)
+        full = manager.load_files(sheet_name_column="sheet", projection=TRANSACTION_PROJECTION)
+        streamed = manager.load_files(sheet_name_column="sheet", projection=TRANSACTION_PROJECTION, chunksize=3)
+
+        self.assertEqual(list(streamed.columns), ["櫃位", "機號", "交易日期", "交易時間", "sheet"])
+        self.assertEqual(len(streamed), 12)
+        for column in streamed.columns:
+            self.assertEqual(streamed[column].astype(str).tolist(), full[column].astype(str).tolist(), column)
+
+    def test_sidecar_is_reused_and_refreshed(self):
+        sidecar_dir = os.path.join(self.directory, "sidecars")
+        cleaner = TransactionCleaner(file_path=self.file_path)
+        cleaner.enable_excel_sidecars(sidecar_dir)
+
+        first = cleaner.load_cleaned()
+        self.assertEqual(len(os.listdir(sidecar_dir)), 1)
+        second = cleaner.load_cleaned()
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(len(os.listdir(sidecar_dir)), 1)
+
+        make_transaction_frame(4, month=10).to_excel(self.file_path, sheet_name="2024-10", index=False)
+        third = cleaner.load_cleaned()
+        self.assertEqual(len(third), 4)
+        self.assertEqual(len(os.listdir(sidecar_dir)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.id_dictionary import IdDictionary
+from tests.data_processing.sample_data import write_raw_ble_files
+
+
+def encode_in_process(path: str, values: list) -> dict:
+    dictionary = IdDictionary(path)
+    codes = dictionary.encode("memberId", pd.Series(values))
+    return dict(zip(values, codes.tolist()))
+
+
+class TestIdDictionary(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "ids")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_codes_stable_across_days(self):
+        first = IdDictionary(self.path).encode("memberId", pd.Series(["M1", "M2", "M1", None]))
+        np.testing.assert_array_equal(first, [0, 1, 0, -1])
+        self.assertEqual(first.dtype, np.int32)
+
+        reopened = IdDictionary(self.path)
+        second = reopened.encode("memberId", pd.Series(pd.Categorical(["M3", "M2"])))
+        np.testing.assert_array_equal(second, [2, 1])
+        self.assertEqual(reopened.decode("memberId", [2, 0, -1]).tolist(), ["M3", "M1", None])
+        self.assertEqual(reopened.lookup("memberId", "M2"), 1)
+        self.assertIsNone(reopened.lookup("memberId", "M9"))
+        self.assertEqual(reopened.size("terminalId"), 0)
+        with self.assertRaises(ValueError):
+            reopened.decode("memberId", [7])
+
+    def test_numeric_ids_share_codes(self):
+        dictionary = IdDictionary(self.path)
+        ints = dictionary.encode("memberId", pd.Series([1, 2]))
+        floats = dictionary.encode("memberId", pd.Series([1.0, np.nan, 2.0]))
+        categories = dictionary.encode("memberId", pd.Series(pd.Categorical([2.0, 1.0])))
+        np.testing.assert_array_equal(floats, [ints[0], -1, ints[1]])
+        np.testing.assert_array_equal(categories, [ints[1], ints[0]])
+        self.assertEqual(dictionary.size("memberId"), 2)
+        self.assertEqual(dictionary.lookup("memberId", 2.0), ints[1])
+        self.assertEqual(IdDictionary(self.path).decode("memberId", floats).tolist(), [1, None, 2])
+
+    def test_encode_frame_keeps_missing_ids_missing(self):
+        data = IdDictionary(self.path).encode_frame(pd.DataFrame({"memberId": ["a", None, "b", "a"]}))
+        self.assertEqual(data["memberId"].dtype, "Int32")
+        self.assertEqual(data["memberId"].nunique(), 2)
+        self.assertEqual(IdDictionary(self.path).decode("memberId", data["memberId"]).tolist(), ["a", None, "b", "a"])
+
+    def test_concurrent_growth(self):
+        batches = [[f"M{i}" for i in range(start, start + 200)] for start in range(0, 1000, 100)]
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(encode_in_process, [self.path] * len(batches), batches))
+
+        dictionary = IdDictionary(self.path)
+        self.assertEqual(dictionary.size("memberId"), 1100)
+        for result in results:
+            for member_id, code in result.items():
+                self.assertEqual(dictionary.lookup("memberId", member_id), code)
+
+    def test_cleaner_encodes_ids(self):
+        directory = os.path.join(self.tmp_dir.name, "raw")
+        os.makedirs(directory)
+        write_raw_ble_files(directory)
+        plain = BLECleaner(directory=directory)
+        plain.load_data(pattern=r"\.csv$")
+        plain.clean()
+
+        encoded = BLECleaner(directory=directory)
+        encoded.enable_id_dictionary(self.path)
+        encoded.load_data(pattern=r"\.csv$")
+        encoded.clean()
+
+        self.assertEqual(encoded.data["memberId"].dtype, "Int32")
+        self.assertEqual(encoded.data["terminalId"].dtype, "Int32")
+        decoded = encoded.id_dictionary.decode("memberId", encoded.data["memberId"])
+        self.assertEqual(decoded.tolist(), plain.data["memberId"].astype(str).tolist())
+        self.assertIn("id_dictionary", encoded.cache_config())
+
+
+if __name__ == "__main__":
+    unittest.main()
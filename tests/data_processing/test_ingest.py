@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from tests.data_processing.sample_data import make_raw_ble_frame, write_raw_ble_files
+
+
+class TestIncrementalIngest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.tmp_dir.name, "ble")
+        self.store_dir = os.path.join(self.tmp_dir.name, "store")
+        os.makedirs(self.data_dir)
+        write_raw_ble_files(self.data_dir, terminals=("T1", "T2"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_only_new_or_changed_files_are_cleaned(self):
+        cleaner = BLECleaner(directory=self.data_dir)
+        first = cleaner.ingest(self.store_dir)
+        self.assertEqual(first["terminalId"].nunique(), 2)
+
+        # Nothing changed: nothing is cleaned again
+        self.assertTrue(cleaner.ingest(self.store_dir).empty)
+
+        # A new file arrives and an existing one is rewritten with identical content
+        write_raw_ble_files(self.data_dir, terminals=("T3",))
+        os.utime(os.path.join(self.data_dir, "2024-12-09_T1.csv"))
+        refreshed = cleaner.ingest(self.store_dir)
+        self.assertEqual(refreshed["terminalId"].unique().tolist(), ["T3"])
+
+        # A changed file replaces its previous part
+        make_raw_ble_frame(rows_per_terminal=2, terminals=("T2",)).to_csv(
+            os.path.join(self.data_dir, "2024-12-09_T2.csv"), index=False)
+        self.assertEqual(len(cleaner.ingest(self.store_dir)), 2)
+
+        store = cleaner.load_store(self.store_dir)
+        self.assertEqual(store.groupby("terminalId", observed=True).size().to_dict(), {"T1": 6, "T2": 2, "T3": 6})
+        self.assertEqual(store["id"].tolist(), list(range(1, len(store) + 1)))
+
+    def test_config_change_reingests(self):
+        cleaner = BLECleaner(directory=self.data_dir)
+        cleaner.ingest(self.store_dir)
+        self.assertTrue(cleaner.ingest(self.store_dir).empty)
+
+        cleaner.cache_version += 1
+        self.assertEqual(len(cleaner.ingest(self.store_dir)), 12)
+        self.assertTrue(cleaner.ingest(self.store_dir).empty)
+
+    def test_file_growing_during_ingest_is_not_recorded(self):
+        cleaner = BLECleaner(directory=self.data_dir)
+        load_paths = cleaner.data_manager.load_paths
+
+        def load_then_append(file_paths, **kwargs):
+            data = load_paths(file_paths, **kwargs)
+            # The export keeps being written after it was read
+            make_raw_ble_frame(rows_per_terminal=1, terminals=("T1",)).to_csv(file_paths[0], mode="a", header=False,
+                                                                            index=False)
+            return data
+
+        cleaner.data_manager.load_paths = load_then_append
+        self.assertTrue(cleaner.ingest(self.store_dir, pattern="T1").empty)
+
+        cleaner.data_manager.load_paths = load_paths
+        self.assertEqual(len(cleaner.ingest(self.store_dir, pattern="T1")), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from src.data_processing.loader import DataManager
+
+
+class TestDataManager(unittest.TestCase):
+    def setUp(self):
+        """
+        Write a few small per-terminal CSV exports into a temporary directory.
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        for i in range(4):
+            df = pd.DataFrame({
+                "terminalId": [f"T{i}"] * 3,
+                "memberId": [f"M{i}{j}" for j in range(3)],
+                "rssi": [-40 - i, -50 - i, -60 - i],
+            })
+            df.to_csv(os.path.join(self.directory, f"2024-12-09_T{i}.csv"), index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parallel_load_matches_sequential(self):
+        manager = DataManager(directory=self.directory)
+        sequential = manager.load_files(pattern=r"2024-12-09.*\.csv")
+        threaded = manager.load_files(pattern=r"2024-12-09.*\.csv", workers=4, pool="thread")
+        pd.testing.assert_frame_equal(sequential, threaded)
+        self.assertEqual(list(threaded["terminalId"].unique()), ["T0", "T1", "T2", "T3"])
+
+    def test_load_timings_recorded(self):
+        manager = DataManager(directory=self.directory)
+        manager.load_files(workers=2)
+        self.assertEqual(len(manager.load_timings), 4)
+        self.assertTrue(all(t >= 0 for t in manager.load_timings.values()))
+
+    def test_compressed_csv_matches_plain(self):
+        plain = DataManager(file_path=os.path.join(self.directory, "2024-12-09_T0.csv")).load_files()
+        for codec in ("gz", "xz", "bz2"):
+            path = os.path.join(self.directory, f"2024-12-10_T0.csv.{codec}")
+            plain.to_csv(path, index=False)
+            manager = DataManager(file_path=path)
+            pd.testing.assert_frame_equal(manager.load_files(), plain)
+            pd.testing.assert_frame_equal(manager.load_files(chunksize=2), plain)
+            stats = manager.throughput[path]
+            self.assertEqual(stats["codec"], codec)
+            self.assertEqual(stats["decompressed_mb"] * 1024 ** 2, os.path.getsize(
+                os.path.join(self.directory, "2024-12-09_T0.csv")))
+
+    def test_unsupported_pool(self):
+        manager = DataManager(directory=self.directory)
+        with self.assertRaises(ValueError):
+            manager.load_files(workers=2, pool="fiber")
+
+
+if __name__ == "__main__":
+    unittest.main()
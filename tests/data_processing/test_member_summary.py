@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.diagnostics import Diagnostics
+from src.data_processing.member_summary import MemberSummary, single_terminal_mask
+from tests.data_processing.sample_data import make_processed_ble_frame
+
+
+def detections(date: str, pairs: list) -> pd.DataFrame:
+    return pd.DataFrame({
+        "memberId": [m for m, _ in pairs],
+        "terminalId": [t for _, t in pairs],
+        "eventTime": pd.to_datetime([f"{date} 10:00:00"] * len(pairs)),
+    })
+
+
+def cleaner_with(data: pd.DataFrame) -> BLECleaner:
+    cleaner = BLECleaner(diagnostics=Diagnostics(echo=False))
+    cleaner.data = data
+    return cleaner
+
+
+class TestMemberSummary(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "members.parquet")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_mask_matches_groupby_nunique(self):
+        data = make_processed_ble_frame(rows=120, terminals=("T1", "T2", "T3", "T4", "T5"))
+        data.loc[data["memberId"] == "M3", "terminalId"] = "T1"
+        data.loc[5, "memberId"] = None
+        data.loc[7, "terminalId"] = None
+        data["memberId"] = data["memberId"].astype("category")
+
+        counts = data.groupby("memberId", observed=True)["terminalId"].nunique()
+        expected = data["memberId"].isin(counts[counts == 1].index).to_numpy()
+        np.testing.assert_array_equal(single_terminal_mask(data["memberId"], data["terminalId"]), expected)
+        self.assertTrue(expected.any())
+
+    def test_summary_spans_days(self):
+        summary = MemberSummary(self.path)
+        first = cleaner_with(detections("2024-12-09", [("M1", "T1"), ("M2", "T1"), ("M2", "T2")]))
+        first.filter_invalid_member_ids(summary=summary)
+        self.assertEqual(first.data["memberId"].tolist(), ["M2", "M2"])
+        summary.save()
+
+        # M1 is on a single terminal on the second day, but was on another one the day before
+        second_day = detections("2024-12-10", [("M1", "T2"), ("M3", "T3")])
+        reloaded = MemberSummary(self.path)
+        second = cleaner_with(second_day.copy())
+        second.filter_invalid_member_ids(summary=reloaded)
+        self.assertEqual(second.data["memberId"].tolist(), ["M1"])
+        self.assertEqual(reloaded.dates(), ["2024-12-09", "2024-12-10"])
+
+        alone = cleaner_with(second_day.copy())
+        alone.filter_invalid_member_ids()
+        self.assertEqual(len(alone.data), 0)
+
+        daily = reloaded.daily_terminal_counts().set_index(["date", "memberId"])["terminals"]
+        self.assertEqual(daily[("2024-12-09", "M2")], 2)
+        self.assertEqual(reloaded.terminal_counts(("2024-12-10", "2024-12-10"))["M1"], 1)
+
+    def test_numeric_ids_read_as_floats_are_one_member(self):
+        summary = MemberSummary(self.path)
+        summary.update(detections("2024-12-09", [(123, 1), (456, 1), (456, 2)]))
+        # A day with a missing memberId: the IDs are read as floats
+        second_day = detections("2024-12-10", [(123.0, 2.0), (np.nan, 1.0)])
+        second = cleaner_with(second_day)
+        second.filter_invalid_member_ids(summary=summary)
+        self.assertEqual(summary.terminal_counts().to_dict(), {"123": 2, "456": 2})
+        self.assertEqual(len(second.data), 2)  # 123.0 was on two terminals; the missing member is never removed
+
+    def test_reloaded_day_replaces_summary(self):
+        summary = MemberSummary(self.path)
+        summary.update(detections("2024-12-09", [("M1", "T1"), ("M1", "T2")]))
+        summary.update(detections("2024-12-09", [("M1", "T1")]))
+        self.assertEqual(summary.terminal_counts()["M1"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.diagnostics import Diagnostics
+from src.data_processing.projection import BLE_PROJECTION
+from tests.data_processing.sample_data import write_raw_ble_files
+
+
+class TestParallelClean(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        write_raw_ble_files(self.directory, terminals=("T1", "T2", "T3", "T4"), rows_per_terminal=30)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def clean(self, workers: int, projection=None, split_files: bool = True) -> BLECleaner:
+        cleaner = BLECleaner(directory=self.directory, diagnostics=Diagnostics(echo=False))
+        cleaner.load_data(pattern=r"\.csv$", projection=projection)
+        if not split_files:
+            cleaner.run_lengths = None
+        cleaner.clean(workers=workers)
+        return cleaner
+
+    def test_parallel_matches_serial(self):
+        for projection in (None, BLE_PROJECTION):
+            serial = self.clean(workers=1, projection=projection)
+            for split_files in (True, False):
+                parallel = self.clean(workers=3, projection=projection, split_files=split_files)
+                pd.testing.assert_frame_equal(parallel.data, serial.data)
+                self.assertEqual(parallel.raw_data_split, serial.raw_data_split)
+                for name in ("millisecond", "am", "pm", "other", "empty", "total"):
+                    self.assertEqual(parallel.event_time_formats[name], serial.event_time_formats[name])
+
+    def test_partitions_are_balanced(self):
+        cleaner = BLECleaner(diagnostics=Diagnostics(echo=False))
+        cleaner.data = pd.DataFrame({"x": range(1000)})
+        for run_lengths in ([1000], [900, 100], [300, 300, 400], None):
+            cleaner.run_lengths = run_lengths
+            bounds = cleaner._partition_bounds(workers=4)
+            sizes = [stop - start for start, stop in bounds]
+            self.assertEqual(bounds[0][0], 0)
+            self.assertEqual(bounds[-1][1], 1000)
+            self.assertTrue(all(prev[1] == nxt[0] for prev, nxt in zip(bounds, bounds[1:])))
+            self.assertGreaterEqual(len(bounds), 4)
+            self.assertLessEqual(max(sizes), 250)
+            for cut in np.cumsum(run_lengths or [])[:-1]:
+                self.assertIn(cut, [start for start, _ in bounds])
+
+
+if __name__ == "__main__":
+    unittest.main()
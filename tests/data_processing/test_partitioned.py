@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import pyarrow.parquet as pq
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.partitioned import ScanStats, list_partition_files, read_partitioned
+from tests.data_processing.sample_data import make_processed_ble_frame
+
+
+class TestPartitionedOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        frames = [make_processed_ble_frame(rows=90, date=date) for date in ("2024-12-09", "2024-12-10")]
+        self.cleaner = BLECleaner(directory=self.directory)
+        self.cleaner.data = pd.concat(frames, ignore_index=True)
+        self.cleaner.data["eventTime"] = pd.to_datetime(self.cleaner.data["eventTime"])
+        self.cleaner.data["terminalId"] = self.cleaner.data["terminalId"].astype("category")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_parquet_partitions_keep_dtypes_and_statistics(self):
+        path = os.path.join(self.directory, "ble.parquet")
+        self.cleaner.save_to(path, partition_by=["terminalId"], row_group_size=10)
+
+        files = list_partition_files(path)
+        self.assertEqual(len(files), 6)
+        self.assertIn(os.path.join(path, "date=2024-12-09", "terminalId=T1", "part-0.parquet"), files)
+
+        metadata = pq.ParquetFile(files[0]).metadata
+        self.assertGreater(metadata.num_row_groups, 1)
+        column = metadata.schema.names.index("eventTime")
+        self.assertTrue(metadata.row_group(0).column(column).statistics.has_min_max)
+
+        one_day = read_partitioned(path, date_range=("2024-12-10", "2024-12-10"), partition_filters={"terminalId": ["T2"]})
+        self.assertEqual(len(one_day), 30)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(one_day["eventTime"]))
+        self.assertIsInstance(one_day["terminalId"].dtype, pd.CategoricalDtype)
+        self.assertEqual(set(one_day["terminalId"]), {"T2"})
+
+    def test_feather_round_trip(self):
+        path = os.path.join(self.directory, "ble.feather")
+        self.cleaner.save_to(path)
+        self.assertEqual(len(list_partition_files(path)), 2)
+
+        loaded = BLECleaner(directory=self.directory).load_partitioned(path)
+        expected = self.cleaner.data.sort_values("eventTime", kind="stable")
+        self.assertEqual(sorted(loaded["id"]), sorted(expected["id"]))
+
+    def test_time_window_skips_row_groups(self):
+        path = os.path.join(self.directory, "ble.parquet")
+        self.cleaner.save_to(path, row_group_size=10)
+
+        window = (pd.Timestamp("2024-12-10 11:15:00"), pd.Timestamp("2024-12-10 11:30:00"))
+        stats = ScanStats()
+        data = read_partitioned(path, time_range=window, terminal_ids=["T1"], stats=stats)
+
+        expected = self.cleaner.data[self.cleaner.data["eventTime"].between(*window)
+                                     & (self.cleaner.data["terminalId"] == "T1")]
+        self.assertGreater(len(expected), 0)
+        self.assertEqual(sorted(data["id"]), sorted(expected["id"]))
+        self.assertEqual(stats.files_skipped, 1)  # The other day's partition
+        self.assertGreater(stats.row_groups_skipped, 0)
+        self.assertLess(stats.row_groups_read, 9)
+        self.assertGreater(stats.bytes_skipped, stats.bytes_read)
+
+    def test_terminal_statistics_skip_row_groups(self):
+        path = os.path.join(self.directory, "ble.parquet")
+        self.cleaner.data = self.cleaner.data.sort_values("terminalId", kind="stable")
+        self.cleaner.data["eventTime"] = pd.Timestamp("2024-12-09 12:00:00")
+        self.cleaner.save_to(path, row_group_size=30)
+
+        stats = ScanStats()
+        data = read_partitioned(path, terminal_ids=["T3"], columns=["id", "rssi"], stats=stats)
+        self.assertEqual(len(data), 60)
+        self.assertEqual(list(data.columns), ["id", "rssi"])
+        self.assertEqual(stats.row_groups_read, 2)
+        self.assertEqual(stats.row_groups_skipped, 4)
+
+    def test_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            self.cleaner.save_to(os.path.join(self.directory, "ble.orc"))
+
+
+if __name__ == "__main__":
+    unittest.main()
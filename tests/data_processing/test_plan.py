@@ -0,0 +1,66 @@
+import os
+import json
+import unittest
+import pandas as pd
+from src.data_processing.plan import CleaningPlan, FilterStage, SortStage
+from src.data_processing.predicates import APPLE_MANUFACTURER_FILTER, ColumnFilter
+from tests.data_processing.sample_data import make_processed_ble_frame
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+APPLE_DEVICES_CFG = os.path.join(REPO_ROOT, "src", "data_processing", "configs", "ble", "ble_get_apple_devices.json")
+
+
+def read_steps(cfg: str) -> list:
+    with open(cfg, "r") as f:
+        return json.load(f)["cleaning_steps"]
+
+
+class TestCleaningPlan(unittest.TestCase):
+    def setUp(self):
+        self.data = make_processed_ble_frame(rows=300)
+        self.steps = read_steps(APPLE_DEVICES_CFG)
+
+    def test_filters_move_ahead_and_merge(self):
+        plan = CleaningPlan(self.steps)
+        self.assertEqual([type(s) for s in plan.stages], [FilterStage, SortStage])
+        self.assertEqual(len(plan.stages[0].filters), 2)
+
+        result = plan.execute(self.data)
+        expected = self.data.sort_values("eventTime")
+        expected = expected[expected["accessAddress"].str.startswith("02")]
+        expected = expected[expected["accessAddress"].str.contains("ff4c00")]
+
+        self.assertGreater(len(result), 0)
+        self.assertEqual(sorted(result["id"]), sorted(expected["id"]))
+        self.assertTrue(result["eventTime"].is_monotonic_increasing)
+        self.assertEqual(plan.rows, [300, len(expected), len(expected)])
+
+    def test_redundant_filters_dropped(self):
+        steps = self.steps + [{"operation": "filter", "params": {"column": "accessAddress", "condition": "02011a",
+                                                                  "operation": "startswith"}}]
+        plan = CleaningPlan(steps, applied=[APPLE_MANUFACTURER_FILTER])
+        self.assertEqual(plan.filters(), [ColumnFilter("accessAddress", "02011a", "startswith")])
+        reasons = [reason for _, reason in plan.dropped]
+        self.assertIn("already applied while loading", reasons)
+        self.assertTrue(any(reason.startswith("implied by") for reason in reasons))
+
+    def test_explain_lists_rows_per_stage(self):
+        plan = CleaningPlan(self.steps)
+        self.assertNotIn("rows:", plan.explain())
+        plan.execute(self.data)
+        explanation = plan.explain()
+        self.assertIn("rows: 300", explanation)
+        self.assertIn("startswith '02' AND accessAddress contains 'ff4c00'", explanation)
+
+    def test_unsupported_operation(self):
+        with self.assertRaises(ValueError):
+            CleaningPlan([{"operation": "dedupe", "params": {}}])
+
+    def test_query_filter(self):
+        plan = CleaningPlan([{"operation": "filter", "params": {"column": "rssi", "condition": "> -60"}}])
+        result = plan.execute(self.data)
+        pd.testing.assert_frame_equal(result, self.data[self.data["rssi"] > -60])
+
+
+if __name__ == "__main__":
+    unittest.main()
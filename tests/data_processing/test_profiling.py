@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.diagnostics import Diagnostics
+from src.data_processing.profiling import DistinctSketch, ProfileAccumulator
+from tests.data_processing.sample_data import make_processed_ble_frame, write_raw_ble_files
+
+
+def without_id(row: dict) -> dict:
+    return {key: value for key, value in row.items() if key != "id"}
+
+
+class TestProfiling(unittest.TestCase):
+    def test_chunks_match_whole_frame(self):
+        data = make_processed_ble_frame(rows=150)
+        data.loc[[3, 40], "rssi"] = np.nan
+        data.loc[10, "memberId"] = None
+        profile = BLECleaner.profile_accumulator()
+        for start in range(0, len(data), 40):
+            profile.update(data.iloc[start:start + 40])
+        result = profile.result()
+
+        self.assertEqual(result["total_rows"], len(data))
+        self.assertEqual(result["unique_member_ids"], data["memberId"].nunique())
+        self.assertTrue(result["distinct_is_exact"])
+        self.assertEqual(result["max_rssi_row"], data.loc[data["rssi"].idxmax()].to_dict())
+        self.assertEqual(result["min_rssi_row"], data.loc[data["rssi"].idxmin()].to_dict())
+        self.assertEqual(result["null_counts"], data.isna().sum().to_dict())
+
+    def test_merge_matches_single_pass(self):
+        data = make_processed_ble_frame(rows=90)
+        single = ProfileAccumulator("memberId", "rssi").update(data).result()
+        merged = ProfileAccumulator("memberId", "rssi").update(data.iloc[:30])
+        merged.merge(ProfileAccumulator("memberId", "rssi").update(data.iloc[30:]))
+        self.assertEqual(merged.result(), single)
+
+    def test_sketch_estimate_past_exact_limit(self):
+        values = pd.Series([f"M{i}" for i in range(200_000)])
+        sketch, other = DistinctSketch(exact_limit=1000), DistinctSketch(exact_limit=1000)
+        sketch.update(values[:120_000])
+        other.update(values[80_000:])
+        sketch.merge(other)
+        self.assertIsNone(sketch.exact)
+        self.assertAlmostEqual(sketch.count() / 200_000, 1.0, delta=0.03)
+
+    def test_profile_files_matches_clean_then_profile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            write_raw_ble_files(directory, terminals=("T1", "T2", "T3"), rows_per_terminal=25)
+            cleaner = BLECleaner(directory=directory, diagnostics=Diagnostics(echo=False))
+            expected = cleaner.load_cleaned(pattern=r"\.csv$")
+            expected = BLECleaner.profile_accumulator().update(expected.drop(columns=["id"])).result()
+
+            for workers in (1, 2):
+                streamed = BLECleaner(directory=directory, diagnostics=Diagnostics(echo=False))
+                result = streamed.profile_files(pattern=r"\.csv$", chunksize=7, workers=workers)
+                self.assertIsNone(streamed.data)
+                self.assertEqual(result, expected)
+
+            profile = cleaner.profile()
+            self.assertEqual(without_id(profile["max_rssi_row"]), expected["max_rssi_row"])
+            self.assertEqual(profile["unique_member_ids"], expected["unique_member_ids"])
+
+
+if __name__ == "__main__":
+    unittest.main()
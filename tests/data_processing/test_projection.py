@@ -0,0 +1,91 @@
+import os
+import json
+import tempfile
+import unittest
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.loader import DataManager
+from src.data_processing.predicates import apple_manufacturer
+from src.data_processing.projection import BLE_PROJECTION, extract_json_fields
+from tests.data_processing.sample_data import make_raw_ble_frame, write_raw_ble_files
+
+
+class TestColumnProjection(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        write_raw_ble_files(self.directory)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def clean(self, directory, projection=None):
+        cleaner = BLECleaner(directory=directory)
+        cleaner.load_data(pattern=r"\.csv$", projection=projection)
+        return cleaner.clean()
+
+    def test_projected_clean_matches_full_read(self):
+        full = self.clean(self.directory)
+        projected = self.clean(self.directory, projection=BLE_PROJECTION)
+
+        self.assertGreater(len(projected), 0)
+        self.assertEqual(list(projected.columns), list(full.columns))
+        for column in full.columns:
+            self.assertEqual(projected[column].astype(object).tolist(), full[column].astype(object).tolist(), column)
+
+    def test_only_projected_columns_are_read(self):
+        data = DataManager(directory=self.directory).load_files(projection=BLE_PROJECTION)
+        self.assertEqual(list(data.columns), ["POSCode", "UserId", "PLIEventCd", "PLIEventTimestamp", "accessAddress", "rssi"])
+
+    def test_read_filters_see_extracted_fields(self):
+        # The filter steps of configs/ble/ble_get_apple_devices.json, run while reading raw exports
+        cfg = os.path.join(self.directory, "apple.json")
+        with open(cfg, "w") as f:
+            json.dump({"cleaning_steps": [
+                {"operation": "filter", "params": {"column": "accessAddress", "condition": "02", "operation": "startswith"}},
+                {"operation": "filter", "params": {"column": "accessAddress", "condition": "ff4c00", "operation": "contains"}},
+            ]}, f)
+        cleaner = BLECleaner(directory=self.directory)
+        data = cleaner.load_data(pattern=r"\.csv$", cfg=cfg, projection=BLE_PROJECTION)
+        self.assertGreater(len(data), 0)
+        self.assertTrue(apple_manufacturer(data).all())
+
+    def test_headerless_layout(self):
+        headerless_dir = os.path.join(self.directory, "headerless")
+        os.makedirs(headerless_dir)
+        make_raw_ble_frame().to_csv(os.path.join(headerless_dir, "2024-12-09.csv"), index=False, header=False)
+
+        data = DataManager(directory=headerless_dir).load_files(projection=BLE_PROJECTION, chunksize=5)
+        self.assertEqual(len(data), len(make_raw_ble_frame()))
+        self.assertIn("accessAddress", data.columns)
+        self.assertNotIn("RawData", data.columns)
+
+    def test_fast_path_matches_json_loads(self):
+        values = pd.Series([
+            '{"AD3": "02011a", "rssi": -40}', '{"rssi":-5,"AD3":"x","mac":"aa"}', '{"AD3":"a","AD3":"b","rssi":1}',
+            '{"AD3": null, "rssi": -40.5}', '{"AD3":"a\\u0041","rssi":3}', '{"k":"AD3","rssi":true}',
+            '{"AD3":"z","rssi":01}', '{"x":{"AD3":"n"},"AD3":"o"}', '{}', None, 7,
+        ])
+        stats = {}
+        extracted = extract_json_fields(values, {"AD3": "accessAddress", "rssi": "rssi"}, stats=stats)
+
+        def parse(raw_data):
+            try:
+                parsed = json.loads(raw_data)
+                return parsed.get("AD3"), parsed.get("rssi")
+            except (json.JSONDecodeError, TypeError):
+                return None, None
+
+        expected = pd.DataFrame(index=values.index)
+        expected["accessAddress"], expected["rssi"] = zip(*values.map(parse))
+        pd.testing.assert_frame_equal(extracted, expected)
+        self.assertEqual(stats, {"fast": 4, "slow": 7})
+
+    def test_invalid_json_yields_none(self):
+        values = pd.Series(['{"AD3": "abc", "rssi": -50}', "not json", None])
+        extracted = extract_json_fields(values, {"AD3": "accessAddress", "rssi": "rssi"})
+        self.assertEqual(extracted["accessAddress"].tolist(), ["abc", None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
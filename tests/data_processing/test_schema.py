@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_processing.schema import BLE_SCHEMA, apply_schema, concat_frames
+from tests.data_processing.sample_data import make_processed_ble_frame
+
+
+class TestSchema(unittest.TestCase):
+    def test_apply_ble_schema(self):
+        data, memory = apply_schema(make_processed_ble_frame(rows=100), BLE_SCHEMA)
+        self.assertIsInstance(data["terminalId"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(data["memberId"].dtype, pd.CategoricalDtype)
+        self.assertEqual(data["rssi"].dtype, np.int8)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(data["eventTime"]))
+        self.assertLess(memory["memberId"][1], memory["memberId"][0])
+
+    def test_rssi_with_missing_values_stays_float(self):
+        data, _ = apply_schema(pd.DataFrame({"rssi": [-50.0, np.nan]}), BLE_SCHEMA)
+        self.assertEqual(data["rssi"].dtype, np.float32)
+
+    def test_fractional_rssi_stays_float(self):
+        data, _ = apply_schema(pd.DataFrame({"rssi": [-50.7, -60.0]}), BLE_SCHEMA)
+        self.assertEqual(data["rssi"].dtype, np.float32)
+        self.assertAlmostEqual(float(data["rssi"][0]), -50.7, places=4)
+
+    def test_numeric_ids_keep_their_type(self):
+        data, _ = apply_schema(pd.DataFrame({"terminalId": [101, 102, 101]}), BLE_SCHEMA)
+        self.assertEqual(list(data["terminalId"].cat.categories), [101, 102])
+
+    def test_concat_keeps_categories(self):
+        first, _ = apply_schema(pd.DataFrame({"terminalId": ["T1", "T2"]}), BLE_SCHEMA)
+        second, _ = apply_schema(pd.DataFrame({"terminalId": ["T3"]}), BLE_SCHEMA)
+        combined = concat_frames([first, second])
+        self.assertIsInstance(combined["terminalId"].dtype, pd.CategoricalDtype)
+        self.assertEqual(combined["terminalId"].tolist(), ["T1", "T2", "T3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.data_processing.schema import BLE_SCHEMA, apply_schema
+from src.data_processing.snapshot import EventSnapshot
+from src.business.tenant_indicators.analytic_methods.pass_by_methods import PassByMethods
+from tests.data_processing.sample_data import make_processed_ble_frame
+
+
+class TestEventSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data, _ = apply_schema(make_processed_ble_frame(rows=300), BLE_SCHEMA)
+        self.snapshot = EventSnapshot.write(self.data, self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_arrays_are_memory_mapped_and_sorted(self):
+        snapshot = EventSnapshot(self.tmp_dir.name)
+        self.assertIsInstance(snapshot.time, np.memmap)
+        self.assertEqual(snapshot.num_rows, len(self.data))
+        for terminal_id in snapshot.terminals:
+            times = snapshot.time[snapshot.terminal_slice(terminal_id)]
+            self.assertTrue(np.all(times[1:] >= times[:-1]))
+
+    def test_pass_by_matches_dataframe_path(self):
+        interval = (datetime(2024, 12, 9, 12, 0), datetime(2024, 12, 9, 16, 30))
+        thresholds = {"T1": -60, "T2": -70}
+        mapping = {"T1": "A", "T2": "B", "T3": "C"}
+        grouped = {t: g.reset_index(drop=True) for t, g in self.data.groupby("terminalId", observed=True)}
+
+        expected = PassByMethods.simple(grouped, mapping, thresholds, interval)
+        actual = PassByMethods.simple(self.snapshot.terminal_data(), mapping, thresholds, interval)
+        pd.testing.assert_frame_equal(expected, actual)
+
+        for row in expected.itertuples():
+            count = self.snapshot.unique_members(row.terminalId, thresholds.get(row.terminalId), interval)
+            self.assertEqual(count, row.passByCount)
+
+    def test_rows_with_missing_ids_are_dropped(self):
+        data = self.data.copy()
+        data.loc[[0, 1], "terminalId"] = None
+        data.loc[[2, 3], "memberId"] = None
+        snapshot = EventSnapshot.write(data, self.tmp_dir.name)
+        self.assertEqual(snapshot.num_rows, len(data) - 4)
+        for terminal_id, group in data.groupby("terminalId", observed=True):
+            self.assertEqual(snapshot.unique_members(terminal_id), group["memberId"].nunique())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_processing.cleaners.ble_cleaner import BLECleaner
+from src.data_processing.sorting import merge_sorted_runs
+from tests.data_processing.sample_data import make_processed_ble_frame
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SORTING_CFG = os.path.join(REPO_ROOT, "src", "data_processing", "configs", "ble", "ble_sorting.json")
+
+
+class TestMergeSortedRuns(unittest.TestCase):
+    def test_matches_stable_sort(self):
+        rng = np.random.default_rng(0)
+        runs = [np.sort(rng.integers(0, 100, size=n)) for n in (30, 0, 45, 12)]
+        runs[2][5], runs[2][20] = runs[2][20] + 1, runs[2][5]  # One run out of order
+        values = np.concatenate(runs)
+
+        order, reordered = merge_sorted_runs(values, [len(r) for r in runs])
+        np.testing.assert_array_equal(order, np.argsort(values, kind="stable"))
+        self.assertGreater(reordered, 0)
+
+    def test_missing_values_last(self):
+        values = pd.to_datetime(pd.Series(["2024-12-09 10:00", None, "2024-12-09 09:00", "2024-12-09 11:00"])).to_numpy()
+        order, reordered = merge_sorted_runs(values, [2, 2])
+        self.assertEqual(order.tolist(), [2, 0, 3, 1])
+        self.assertEqual(reordered, 0)
+
+    def test_lengths_must_cover_values(self):
+        with self.assertRaises(ValueError):
+            merge_sorted_runs(np.arange(5), [2, 2])
+
+
+class TestCleanerSort(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        for terminal_id in ["T1", "T2", "T3"]:
+            df = make_processed_ble_frame(rows=120, terminals=(terminal_id,)).sort_values("eventTime", kind="stable")
+            if terminal_id == "T3":
+                df = df.iloc[::-1]
+            df.to_csv(os.path.join(self.directory, f"2024-12-09_{terminal_id}.csv"), index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sort_merges_per_file_runs(self):
+        cleaner = BLECleaner(directory=self.directory)
+        cleaner.load_data(pattern=r"\.csv$", cfg=SORTING_CFG)
+
+        expected = BLECleaner(directory=self.directory)
+        expected.load_data(pattern=r"\.csv$")
+        expected.data = expected.data.sort_values("eventTime", kind="stable")
+
+        pd.testing.assert_frame_equal(cleaner.data, expected.data)
+        self.assertEqual(cleaner.rows_reordered, cleaner.data_manager.file_lengths[2])  # Only the reversed file
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_processing.timestamps import (compose_hhmm_timestamps, compose_timestamps, normalize_event_times,
+                                            unique_ratio)
+
+
+def convert_row(value):
+    """
+    Row-by-row conversion the vectorized normalizer replaces.
+    """
+    if not isinstance(value, str) or value.strip() == "":
+        return None
+    value = value.strip()
+    try:
+        if ".000" in value:
+            return value.replace(".000", "").replace("-", "/")
+        if "上午" in value:
+            return value.replace("上午", "").strip()
+        if "下午" in value:
+            try:
+                date_part, time_part = value.replace("下午", "").strip().split("  ")
+            except ValueError:
+                date_part, time_part = value.replace("下午", "").strip().split(" ")
+            hour, minute, second = map(int, time_part.split(":"))
+            if hour != 12:
+                hour += 12
+            return f"{date_part} {hour}:{minute:02}:{second:02}"
+        return value
+    except (ValueError, IndexError):
+        return None
+
+
+class TestNormalizeEventTimes(unittest.TestCase):
+    def setUp(self):
+        self.values = pd.Series([
+            "2024/12/09 上午 10:15:00", "2024/12/09 下午 03:20:05", "2024-12-09 16:45:07.000",
+            "2024/12/09 下午 12:01:00", "2024/12/09 下午  11:59:59", "2024/12/09 下午 13:00:00",
+            " 2024/12/09 08:00:00 ", "2024-12-09 08:00:00", "2024/12/09 上午 12:30:00", "2024/13/09 下午 01:00:00",
+            "", "   ", None, np.nan, 42, "garbage",
+        ], index=[5, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19])
+
+    def test_matches_row_by_row_conversion(self):
+        expected = pd.to_datetime(self.values.map(convert_row), format="%Y/%m/%d %H:%M:%S", errors="coerce")
+        result = normalize_event_times(self.values)
+        pd.testing.assert_series_equal(result, expected)
+
+    def test_counts_per_format(self):
+        stats = {}
+        normalize_event_times(self.values, stats=stats)
+        self.assertEqual(stats["millisecond"], {"rows": 1, "invalid": 0})
+        self.assertEqual(stats["am"], {"rows": 2, "invalid": 0})
+        self.assertEqual(stats["pm"], {"rows": 5, "invalid": 2})
+        self.assertEqual(stats["other"], {"rows": 3, "invalid": 2})
+        self.assertEqual(stats["empty"], 5)
+
+    def test_repeated_values_parsed_once(self):
+        values = pd.concat([self.values] * 50)
+        stats = {}
+        result = normalize_event_times(values, stats=stats)
+        self.assertEqual(stats["total"], 800)
+        self.assertEqual(stats["unique"], 14)  # None and NaN are both missing
+        self.assertAlmostEqual(unique_ratio(stats), 14 / 800)
+        self.assertEqual(stats["pm"], {"rows": 250, "invalid": 100})
+        pd.testing.assert_series_equal(result, pd.concat([normalize_event_times(self.values)] * 50))
+
+    def test_empty_series(self):
+        result = normalize_event_times(pd.Series([], dtype=object))
+        self.assertEqual(len(result), 0)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result))
+
+
+class TestComposeTimestamps(unittest.TestCase):
+    def test_matches_string_concatenation(self):
+        dates = pd.Series(["2024-12-09", "2024-12-09", None, "2024-12-10", "bad", "2024-12-09"] * 3)
+        for times in (pd.Series([1345, 930, 1200, 11, 1000, 1345] * 3), pd.Series([1345, np.nan, 1200, 11, 1000, 1345] * 3),
+                      pd.Series(["1345", "0930", "1200", None, "1000", "1345"] * 3)):
+            stats = {}
+            result = compose_timestamps(dates, times, fmt="%Y-%m-%d %H%M", stats=stats)
+            expected = pd.to_datetime(dates.astype(str) + " " + times.astype(str), format="%Y-%m-%d %H%M", errors="coerce")
+            pd.testing.assert_series_equal(result, expected)
+            self.assertEqual(stats["total"], 18)
+            self.assertEqual(stats["invalid"], int(expected.isna().sum()))
+            self.assertLessEqual(stats["unique"], 5)
+
+
+class TestComposeHhmmTimestamps(unittest.TestCase):
+    def test_numeric_times_match_string_concatenation(self):
+        dates = pd.Series(["2024-12-09", "2024-12-10", None, "2024-12-09", "bad"] * 4)
+        times = pd.Series([1345, 930, 1000, 2359, 1200] * 4)
+        stats = {}
+        result = compose_hhmm_timestamps(dates, times, stats=stats)
+        expected = pd.to_datetime(dates.astype(str) + " " + times.astype(str), format="%Y-%m-%d %H%M", errors="coerce")
+        pd.testing.assert_series_equal(result, expected, check_names=False)
+        self.assertEqual(stats["numeric"], {"rows": 16, "invalid": 4})
+        self.assertEqual(stats["string"], {"rows": 0, "invalid": 0})
+        self.assertEqual((stats["empty"], stats["total"]), (4, 20))
+
+    def test_mixed_times_fall_back_to_strings(self):
+        dates = pd.Series([pd.Timestamp("2024-12-09"), "2024-12-09", "2024-12-10", "2024-12-10", "2024-12-10", "2024-12-10"])
+        times = pd.Series([1345.0, "0905", 2460, 12.5, np.nan, "noon"], dtype=object)
+        stats = {}
+        result = compose_hhmm_timestamps(dates, times, stats=stats)
+        expected = pd.to_datetime(["2024-12-09 13:45", "2024-12-09 09:05", None, None, None, None])
+        np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+        self.assertEqual(stats["numeric"], {"rows": 4, "invalid": 2})
+        self.assertEqual(stats["string"], {"rows": 1, "invalid": 1})
+        self.assertEqual(stats["empty"], 1)
+
+    def test_digit_strings_match_numbers(self):
+        dates = pd.Series(["2024-12-09"] * 4)
+        numbers = compose_hhmm_timestamps(dates, pd.Series([5, 905, 105, 1345]))
+        strings = compose_hhmm_timestamps(dates, pd.Series(["5", "905", " 105", "1345"]))
+        pd.testing.assert_series_equal(numbers, strings)
+        self.assertEqual(strings[0], pd.Timestamp("2024-12-09 00:05"))
+
+
+if __name__ == "__main__":
+    unittest.main()